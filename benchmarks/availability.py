@@ -0,0 +1,42 @@
+"""
+Availability search latency versus the number of rooms and reservations.
+
+Compares the previous implementation of AvailableRoomsView.get_available_rooms
+(Python loop over every conflicting reservation) with the anti-join query in
+reservations.availability.
+
+Usage:
+python -m benchmarks.availability
+"""
+from datetime import timedelta
+
+from benchmarks.common import BASE_DATE, measure, print_table, rolled_back, seed
+from reservations.availability import get_available_rooms
+from reservations.models import Reservation
+from rooms.models import Room
+
+SIZES = [(50, 500), (200, 5000), (1000, 20000), (5000, 100000)]
+
+
+def legacy_available_rooms(start_date, end_date, room_standard):
+    conflicting_reservations = Reservation.objects.filter(start_date__lte=end_date, end_date__gte=start_date)
+    all_rooms = Room.objects.all().filter(room_standard=room_standard, is_available=True)
+    occupied_rooms = [reservation.room for reservation in conflicting_reservations]
+    return [room for room in all_rooms if room not in occupied_rooms]
+
+
+def main():
+    start_date = (BASE_DATE + timedelta(days=180)).date()
+    end_date = start_date + timedelta(days=3)
+    rows = []
+    for rooms, reservations in SIZES:
+        with rolled_back():
+            standard = seed(rooms, reservations)[0]
+            engine = measure(lambda: list(get_available_rooms(start_date, end_date, standard.uuid)))
+            legacy = measure(lambda: legacy_available_rooms(start_date, end_date, standard.uuid), repeat=3)
+            rows.append((rooms, reservations, f'{legacy[0]:.2f}', f'{engine[0]:.2f}', f'{engine[1]:.2f}'))
+    print_table(('rooms', 'reservations', 'legacy ms', 'engine ms', 'engine p99 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Availability search latency with and without the versioned result cache.
+
+Replays a stream of searches drawn from a skewed set of popular date ranges,
+interleaved with reservation writes that invalidate the searched standard,
+and reports the hit rate and the latency of each mode.
+
+Usage:
+python -m benchmarks.availability_cache
+"""
+import itertools
+import random
+import time
+from datetime import timedelta
+from statistics import median
+
+from benchmarks.common import BASE_DATE, print_table, rolled_back, seed
+from clients.models import Client
+from reservations.availability import availability_cache, get_available_rooms
+from reservations.models import Reservation
+from rooms.models import Room
+from rooms.serializers import RoomSerializer
+
+SEARCHES = 2000
+RANGES = 50
+WRITE_RATIOS = [0.0, 0.01, 0.05]
+WRITE_DAYS = itertools.count(1000)
+
+
+def search(standard, start_date, end_date):
+    return RoomSerializer(get_available_rooms(start_date, end_date, standard.uuid), many=True).data
+
+
+def cached_search(standard, start_date, end_date):
+    return availability_cache.get_or_set(standard.uuid, f'{start_date}:{end_date}', lambda: search(standard, start_date, end_date))
+
+
+def replay(func, standard, write_ratio, seed_value=0):
+    rng = random.Random(seed_value)
+    first_day = (BASE_DATE + timedelta(days=400)).date()
+    ranges = [(first_day + timedelta(days=offset), first_day + timedelta(days=offset + 3)) for offset in range(RANGES)]
+    rooms = list(Room.objects.filter(room_standard=standard))
+    client = Client.objects.first()
+    timings = []
+    for _ in range(SEARCHES):
+        if rng.random() < write_ratio:
+            # The reservation signals bump the version of the standard.
+            start = BASE_DATE + timedelta(days=next(WRITE_DAYS))
+            Reservation.objects.create(client=client, room=rng.choice(rooms), start_date=start, end_date=start + timedelta(hours=20))
+        start_date, end_date = ranges[min(int(rng.paretovariate(1.2)) - 1, RANGES - 1)]
+        started = time.perf_counter()
+        func(standard, start_date, end_date)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    rows = []
+    with rolled_back():
+        standard = seed(1000, 20000)[0]
+        for write_ratio in WRITE_RATIOS:
+            uncached = replay(search, standard, write_ratio)
+            availability_cache.hits = availability_cache.shared_hits = availability_cache.misses = 0
+            availability_cache.local.clear()
+            cached = replay(cached_search, standard, write_ratio)
+            rows.append((
+                write_ratio, f"{availability_cache.stats()['hit_rate']:.2%}",
+                f'{uncached[0]:.2f}', f'{uncached[1]:.2f}',
+                f'{cached[0]:.3f}', f'{cached[1]:.2f}',
+            ))
+    print_table(('write ratio', 'hit rate', 'uncached p50 ms', 'uncached p99 ms', 'cached p50 ms', 'cached p99 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
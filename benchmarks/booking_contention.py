@@ -0,0 +1,99 @@
+"""
+Booking throughput and latency under contention.
+
+Worker processes book random one-night stays concurrently, each through its
+own database connection, using either the per-room lock of the booking
+service or a table lock on the reservations table. With a small pool of hot
+rooms most attempts collide; with a large pool they mostly do not, which is
+where a table lock needlessly serializes everyone.
+
+Usage:
+python -m benchmarks.booking_contention
+"""
+import multiprocessing
+import random
+import time
+from datetime import timedelta
+
+from benchmarks.common import BASE_DATE, print_table, scratch_database, seed
+from django.db import connection, transaction
+from clients.models import Client
+from reservations.booking import RoomAlreadyBooked, book_room
+from reservations.models import Reservation
+from reservations.serializers import ReservationSerializer
+from rooms.models import Room
+
+WORKERS = [1, 4, 16, 32]
+ATTEMPTS_PER_THREAD = 50
+POOLS = [('hot', 4), ('spread', 400)]
+DAYS = 30
+
+
+def book_with_table_lock(serializer):
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {Reservation._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+        data = serializer.validated_data
+        if Reservation.objects.filter(room=data['room'], start_date__lt=data['end_date'], end_date__gt=data['start_date']).exists():
+            raise RoomAlreadyBooked()
+        return serializer.save()
+
+
+def worker(args):
+    strategy, rooms, client, seed_value = args
+    rng = random.Random(seed_value)
+    latencies, booked = [], 0
+    try:
+        for _ in range(ATTEMPTS_PER_THREAD):
+            start = BASE_DATE + timedelta(days=1000 + rng.randrange(DAYS))
+            serializer = ReservationSerializer(data={
+                'client': client, 'room': rng.choice(rooms),
+                'start_date': start, 'end_date': start + timedelta(hours=20),
+            })
+            serializer.is_valid(raise_exception=True)
+            started = time.perf_counter()
+            try:
+                strategy(serializer)
+                booked += 1
+            except RoomAlreadyBooked:
+                pass
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        connection.close()
+    return latencies, booked
+
+
+def run(strategy, rooms, client, workers):
+    Reservation.objects.filter(start_date__gte=BASE_DATE + timedelta(days=1000)).delete()
+    # The forked workers must not share the parent's connection.
+    connection.close()
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        started = time.perf_counter()
+        results = pool.map(worker, [(strategy, rooms, client, number) for number in range(workers)])
+        elapsed = time.perf_counter() - started
+    latencies = sorted(latency for worker_latencies, _ in results for latency in worker_latencies)
+    booked = sum(worker_booked for _, worker_booked in results)
+    return len(latencies) / elapsed, booked, latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def main():
+    rows = []
+    with scratch_database():
+        seed(400, 400)
+        client = str(Client.objects.first().pk)
+        all_rooms = [str(pk) for pk in Room.objects.order_by('room_number').values_list('pk', flat=True)]
+        for pool, size in POOLS:
+            rooms = all_rooms[:size]
+            for workers in WORKERS:
+                room_lock = run(book_room, rooms, client, workers)
+                table_lock = run(book_with_table_lock, rooms, client, workers)
+                rows.append((
+                    pool, workers,
+                    f'{room_lock[0]:.0f}', room_lock[1], f'{room_lock[2]:.1f}',
+                    f'{table_lock[0]:.0f}', table_lock[1], f'{table_lock[2]:.1f}',
+                ))
+    print_table(('rooms', 'workers', 'room lock att/s', 'booked', 'p99 ms', 'table lock att/s', 'booked', 'p99 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Reservation import throughput: one request per row versus the bulk endpoint.
+
+Usage:
+python -m benchmarks.bulk_reservations
+"""
+import time
+from datetime import timedelta
+
+from benchmarks.common import BASE_DATE, print_table, rolled_back, seed
+from django.contrib.auth.models import Group
+from rest_framework.test import APIRequestFactory, force_authenticate
+from clients.models import Client
+from employees.models import Employee
+from reservations.views import BulkReservationView, ReservationListView
+from rooms.models import Room
+
+BATCH_SIZES = [10, 100, 1000]
+
+
+def build_rows(rooms, client, count, first_day):
+    rows = []
+    for number in range(count):
+        start = BASE_DATE + timedelta(days=first_day + number // len(rooms))
+        rows.append({
+            'client': str(client.uuid),
+            'room': str(rooms[number % len(rooms)].uuid),
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(hours=20)).isoformat(),
+        })
+    return rows
+
+
+def post(view, user, data):
+    request = APIRequestFactory().post('/reservations', data, format='json')
+    force_authenticate(request, user=user)
+    response = view(request)
+    assert response.status_code == 201, response.data
+    return response
+
+
+def main():
+    rows_per_second = []
+    with rolled_back():
+        seed(200, 2000)
+        user = Employee.objects.create_user(username='benchmark', password='benchmark')
+        user.groups.add(Group.objects.get_or_create(name='IT')[0])
+        rooms = list(Room.objects.order_by('room_number'))
+        client = Client.objects.first()
+        single_view, bulk_view = ReservationListView.as_view(), BulkReservationView.as_view()
+
+        first_day = 1000
+        for size in BATCH_SIZES:
+            rows = build_rows(rooms, client, size, first_day)
+            first_day += size // len(rooms) + 1
+            started = time.perf_counter()
+            for row in rows:
+                post(single_view, user, row)
+            single = size / (time.perf_counter() - started)
+
+            rows = build_rows(rooms, client, size, first_day)
+            first_day += size // len(rooms) + 1
+            started = time.perf_counter()
+            post(bulk_view, user, {'reservations': rows})
+            bulk = size / (time.perf_counter() - started)
+            rows_per_second.append((size, f'{single:.0f}', f'{bulk:.0f}', f'{bulk / single:.1f}x'))
+    print_table(('rows', 'single rows/s', 'bulk rows/s', 'speed-up'), rows_per_second)
+
+
+if __name__ == '__main__':
+    main()
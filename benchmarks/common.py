@@ -0,0 +1,136 @@
+"""
+Shared helpers for the benchmark scripts.
+
+The benchmarks run against the database configured in the project settings.
+All fixtures are created inside a transaction that is rolled back at the end,
+so they can be pointed at a development database without leaving data behind.
+Benchmarks whose fixtures must be visible to several connections run in a
+throwaway test database instead.
+"""
+import os
+import random
+import statistics
+import time
+import warnings
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hotel_reservation_system.settings")
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from clients.models import Client  # noqa: E402
+from reservations.models import Reservation, RoomOccupancy  # noqa: E402
+from rooms.models import Room, RoomStandard  # noqa: E402
+
+warnings.filterwarnings('ignore', message='DateTimeField .* received a naive datetime')
+
+BASE_DATE = timezone.make_aware(datetime(2030, 1, 1, 12, 0))
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Run the block in a transaction that is always rolled back.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+@contextmanager
+def scratch_database():
+    """
+    Run the block against a freshly migrated test database that is dropped afterwards.
+
+    Connections opened by other threads during the block use it as well.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed(rooms, reservations, standards=4, horizon_days=365, seed_value=0):
+    """
+    Create room standards, rooms, clients and random reservations.
+
+    parameters:
+     - rooms: The number of rooms to create (int).
+     - reservations: The number of reservations to create (int).
+     - standards: The number of room standards the rooms are spread over (int).
+     - horizon_days: The number of days the reservations are spread over (int).
+
+    return: List of created RoomStandard objects.
+    """
+    rng = random.Random(seed_value)
+    room_standards = RoomStandard.objects.bulk_create(
+        RoomStandard(name=f'Standard {i}', price_per_night='100.00') for i in range(standards)
+    )
+    room_objects = Room.objects.bulk_create(
+        Room(room_number=str(i), location='Benchmark', room_standard=room_standards[i % standards])
+        for i in range(rooms)
+    )
+    clients = Client.objects.bulk_create(
+        Client(name=f'Client {i}', email=f'client{i}@example.com') for i in range(max(1, reservations // 10))
+    )
+    # Each room gets its stays in consecutive, non-overlapping segments of the horizon.
+    per_room = -(-reservations // rooms)
+    segment_days = max(1, horizon_days // per_room)
+    batch = []
+    for i in range(reservations):
+        offset = rng.randrange(segment_days)
+        start = BASE_DATE + timedelta(days=(i // rooms) * segment_days + offset)
+        nights = rng.randint(1, max(1, min(7, segment_days - offset)))
+        batch.append(Reservation(
+            room=room_objects[i % rooms],
+            client=rng.choice(clients),
+            start_date=start,
+            end_date=start + timedelta(days=nights, hours=-1),
+        ))
+    Reservation.objects.bulk_create(batch, batch_size=5000)
+    RoomOccupancy.objects.bulk_create(
+        (row for reservation in batch for row in reservation.occupancy_rows()), batch_size=5000
+    )
+    analyze()
+    return room_standards
+
+
+def analyze():
+    """
+    Refresh planner statistics so freshly seeded tables are planned like production ones.
+    """
+    with connection.cursor() as cursor:
+        for model in (RoomStandard, Room, Client, Reservation, RoomOccupancy):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+
+def measure(func, repeat=20):
+    """
+    Call func repeatedly and return (median, p99) latency in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def print_table(header, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print('  '.join(str(value).rjust(width) for value, width in zip(row, widths)))
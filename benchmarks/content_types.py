@@ -0,0 +1,35 @@
+"""
+Response formats: payload size and encode/decode throughput of JSON versus MessagePack.
+
+Usage:
+python -m benchmarks.content_types
+"""
+from benchmarks.common import measure, print_table, rolled_back, seed
+import io
+
+from benchmarks.json_renderers import payloads
+from utils.parsers import FastJSONParser, MessagePackParser
+from utils.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+
+FORMATS = [('json', FastJSONRenderer, FastJSONParser), ('msgpack', MessagePackRenderer, MessagePackParser)]
+
+
+def main():
+    if msgpack is None:
+        print('msgpack is not installed.')
+        return
+    rows = []
+    with rolled_back():
+        seed(1000, 10000)
+        for name, data in payloads():
+            for format_name, renderer_class, parser_class in FORMATS:
+                body = renderer_class().render(data)
+                encode, _ = measure(lambda: renderer_class().render(data), repeat=50)
+                decode, _ = measure(lambda: parser_class().parse(io.BytesIO(body)), repeat=50)
+                megabytes = len(body) / 2 ** 20
+                rows.append((name, format_name, f'{len(body) / 1024:.0f}', f'{megabytes / encode * 1000:.0f}', f'{megabytes / decode * 1000:.0f}'))
+    print_table(('payload', 'format', 'KiB', 'encode MiB/s', 'decode MiB/s'), rows)
+
+
+if __name__ == '__main__':
+    main()
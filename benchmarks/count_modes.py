@@ -0,0 +1,36 @@
+"""
+First page latency of page-number pagination for every count mode.
+
+Usage:
+python -m benchmarks.count_modes
+"""
+from benchmarks.common import measure, print_table, rolled_back, seed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from reservations.models import Reservation
+from utils.paginators import COUNT_MODES, SmallResultsSetPagination
+
+SIZES = [10000, 100000]
+
+
+def fetch(count_mode):
+    request = Request(APIRequestFactory().get('/reservations', {'count': count_mode}))
+    paginator = SmallResultsSetPagination()
+    paginator.paginate_queryset(Reservation.objects.order_by('start_date'), request)
+    return paginator.count if count_mode != 'exact' else paginator.page.paginator.count
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        with rolled_back():
+            seed(1000, size)
+            for count_mode in COUNT_MODES:
+                median, p99 = measure(lambda: fetch(count_mode))
+                rows.append((size, count_mode, fetch(count_mode), f'{median:.2f}', f'{p99:.2f}'))
+    print_table(('reservations', 'count mode', 'count', 'median ms', 'p99 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Reservation export: streaming with a server-side cursor versus serializing 100-row pages.
+
+Usage:
+python -m benchmarks.export
+"""
+from benchmarks.common import print_table, rolled_back, seed
+import time
+import tracemalloc
+
+from reservations.export import export_csv, export_ndjson
+from reservations.models import Reservation
+from reservations.serializers import ReservationSerializer
+
+SIZES = [10000, 50000]
+PAGE_SIZE = 100
+
+
+def paged(reservations):
+    for offset in range(0, reservations.count(), PAGE_SIZE):
+        yield ReservationSerializer(reservations[offset:offset + PAGE_SIZE], many=True).data
+
+
+def run(chunks):
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in chunks:
+        pass
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    rows = []
+    for size in SIZES:
+        with rolled_back():
+            seed(1000, size)
+            reservations = Reservation.objects.order_by('start_date', 'uuid')
+            for name, export in (('pages', paged), ('csv', export_csv), ('ndjson', export_ndjson)):
+                elapsed, peak = run(export(reservations))
+                rows.append((size, name, f'{size / elapsed:,.0f}', f'{peak / 2 ** 20:.1f}'))
+    print_table(('reservations', 'export', 'rows/s', 'peak MiB'), rows)
+
+
+if __name__ == '__main__':
+    main()
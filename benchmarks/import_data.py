@@ -0,0 +1,68 @@
+"""
+Import throughput of the COPY importer versus bulk_create, for clients and reservations.
+
+Usage:
+python -m benchmarks.import_data
+"""
+import time
+from datetime import timedelta
+
+from benchmarks.common import BASE_DATE, print_table, rolled_back, seed
+from clients.models import Client
+from reservations.bulk import create_reservations
+from reservations.importer import ClientImporter, ReservationImporter
+from rooms.models import Room
+
+ROWS = 20000
+BATCH_SIZE = 5000
+
+
+def client_rows(prefix):
+    return [{'name': f'Imported {number}', 'email': f'{prefix}{number}@example.com'} for number in range(ROWS)]
+
+
+def reservation_rows(rooms, client, first_day):
+    rows = []
+    for number in range(ROWS):
+        start = BASE_DATE + timedelta(days=first_day + number // len(rooms))
+        rows.append({
+            'client': client.email,
+            'room': str(rooms[number % len(rooms)].uuid),
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(hours=20)).isoformat(),
+        })
+    return rows
+
+
+def rate(load, rows):
+    started = time.perf_counter()
+    for offset in range(0, len(rows), BATCH_SIZE):
+        load(rows[offset:offset + BATCH_SIZE])
+    return len(rows) / (time.perf_counter() - started)
+
+
+def main():
+    results = []
+    with rolled_back():
+        seed(500, 1000)
+        rooms = list(Room.objects.order_by('room_number'))
+        client = Client.objects.first()
+
+        baseline = rate(lambda rows: Client.objects.bulk_create(Client(**row) for row in rows), client_rows('bulk'))
+        importer = ClientImporter()
+        copied = rate(importer.import_batch, client_rows('copy'))
+        results.append(('clients', f'{baseline:,.0f}', f'{copied:,.0f}'))
+
+        def bulk_create(rows):
+            for row in rows:
+                row['client'] = client.uuid
+            create_reservations(rows)
+        baseline = rate(bulk_create, reservation_rows(rooms, client, 1000))
+        importer = ReservationImporter()
+        copied = rate(importer.import_batch, reservation_rows(rooms, client, 2000))
+        results.append(('reservations', f'{baseline:,.0f}', f'{copied:,.0f}'))
+    print_table(('model', 'bulk_create rows/s', 'COPY importer rows/s'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Availability checks through the in-process interval index versus SQL.
+
+Measures a single-room overlap check and a full standard search with both
+the "sql" and the "index" availability backends.
+
+Usage:
+python -m benchmarks.interval_index
+"""
+from datetime import timedelta
+
+from django.test.utils import override_settings
+
+from benchmarks.common import BASE_DATE, measure, print_table, rolled_back, seed
+from reservations.availability import conflicting_reservations, get_available_rooms
+from reservations.interval_index import interval_index
+from rooms.models import Room
+
+SIZES = [(200, 5000), (1000, 20000), (5000, 100000)]
+
+
+def main():
+    start_date = (BASE_DATE + timedelta(days=180)).date()
+    end_date = start_date + timedelta(days=3)
+    rows = []
+    for rooms, reservations in SIZES:
+        with rolled_back():
+            standard = seed(rooms, reservations)[0]
+            room = Room.objects.filter(room_standard=standard).first()
+            interval_index.rebuild()
+
+            sql_check = measure(lambda: conflicting_reservations(start_date, end_date).filter(room=room).exists(), repeat=200)
+            index_check = measure(lambda: interval_index.is_free(room.pk, start_date, end_date), repeat=200)
+            with override_settings(AVAILABILITY_BACKEND='sql'):
+                sql_search = measure(lambda: list(get_available_rooms(start_date, end_date, standard.uuid)))
+            with override_settings(AVAILABILITY_BACKEND='index'):
+                index_search = measure(lambda: list(get_available_rooms(start_date, end_date, standard.uuid)))
+            rows.append((
+                rooms, reservations,
+                f'{sql_check[0]:.3f}', f'{index_check[0]:.4f}',
+                f'{sql_search[0]:.2f}', f'{index_search[0]:.2f}',
+            ))
+    print_table(('rooms', 'reservations', 'sql check ms', 'index check ms', 'sql search ms', 'index search ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
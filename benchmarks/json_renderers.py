@@ -0,0 +1,61 @@
+"""
+JSON rendering and parsing: DRF's stdlib json renderer/parser versus the orjson-backed ones.
+
+Usage:
+python -m benchmarks.json_renderers
+"""
+from benchmarks.common import measure, print_table, rolled_back, seed
+import io
+from datetime import timedelta
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from clients.models import Client
+from clients.serializers import ClientSerializer
+from reservations.models import Reservation
+from reservations.serializers import ReservationSerializer
+from rooms.models import Room
+from rooms.serializers import RoomSerializer
+from utils.parsers import FastJSONParser
+from utils.renderers import FastJSONRenderer, orjson
+
+
+def payloads():
+    reservations = Reservation.objects.order_by('start_date', 'uuid')
+    rooms = Room.objects.order_by('room_number', 'uuid')
+    bulk = [
+        {'room': str(reservation.room_id), 'client': str(reservation.client_id),
+         'start_date': reservation.start_date + timedelta(days=400), 'end_date': reservation.end_date + timedelta(days=400)}
+        for reservation in reservations[:1000]
+    ]
+    return [
+        ('reservation page (100)', {'count': 100, 'results': ReservationSerializer(reservations[:100], many=True).data}),
+        ('reservation page (1000)', {'count': 1000, 'results': ReservationSerializer(reservations[:1000], many=True).data}),
+        ('room page (100)', {'count': 100, 'results': RoomSerializer(rooms[:100], many=True).data}),
+        ('client page (100)', {'count': 100, 'results': ClientSerializer(Client.objects.order_by('name')[:100], many=True).data}),
+        ('bulk request (1000)', {'reservations': bulk}),
+    ]
+
+
+def main():
+    if orjson is None:
+        print('orjson is not installed; FastJSONRenderer falls back to the stdlib json module.')
+    rows = []
+    with rolled_back():
+        seed(1000, 10000)
+        for name, data in payloads():
+            body = JSONRenderer().render(data)
+            assert FastJSONRenderer().render(data) == body, name
+            for operation, stdlib, fast in (
+                ('render', lambda: JSONRenderer().render(data), lambda: FastJSONRenderer().render(data)),
+                ('parse', lambda: JSONParser().parse(io.BytesIO(body)), lambda: FastJSONParser().parse(io.BytesIO(body))),
+            ):
+                stdlib_median, _ = measure(stdlib, repeat=50)
+                fast_median, _ = measure(fast, repeat=50)
+                rows.append((name, operation, f'{len(body) / 1024:.0f}', f'{stdlib_median:.2f}', f'{fast_median:.2f}', f'{stdlib_median / fast_median:.1f}x'))
+    print_table(('payload', 'operation', 'KiB', 'stdlib ms', 'fast ms', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
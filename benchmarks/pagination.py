@@ -0,0 +1,50 @@
+"""
+Deep page latency: page-number (COUNT + OFFSET) versus keyset cursor pagination.
+
+Usage:
+python -m benchmarks.pagination
+"""
+from benchmarks.common import measure, print_table, rolled_back, seed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from reservations.models import Reservation
+from utils.paginators import KeysetPagination, SmallResultsSetPagination
+
+PAGE_SIZE = 10
+PAGES = [1, 100, 1000, 5000]
+
+
+def fetch(pagination_class, params):
+    request = Request(APIRequestFactory().get('/reservations', params))
+    paginator = pagination_class()
+    # Page-number pagination runs its COUNT(*) while paginating, so the response itself is not built.
+    return paginator.paginate_queryset(Reservation.objects.order_by('start_date'), request)
+
+
+def cursor_before(page):
+    """
+    Build the cursor pointing just before the given page.
+    """
+    if page == 1:
+        return {}
+    paginator = KeysetPagination()
+    paginator.field = Reservation._meta.get_field('start_date')
+    row = Reservation.objects.order_by('start_date', 'uuid')[(page - 1) * PAGE_SIZE - 1]
+    return {'cursor': paginator.encode_cursor(row)}
+
+
+def main():
+    rows = []
+    with rolled_back():
+        seed(1000, 100000)
+        for page in PAGES:
+            offset = measure(lambda: fetch(SmallResultsSetPagination, {'page': page, 'page_size': PAGE_SIZE}))
+            params = {'page_size': PAGE_SIZE, **cursor_before(page)}
+            keyset = measure(lambda: fetch(KeysetPagination, params))
+            rows.append((page, f'{offset[0]:.2f}', f'{offset[1]:.2f}', f'{keyset[0]:.2f}', f'{keyset[1]:.2f}'))
+    print_table(('page', 'page-number ms', 'p99 ms', 'keyset ms', 'p99 ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
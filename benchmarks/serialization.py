@@ -0,0 +1,54 @@
+"""
+List serialization: ModelSerializer over model instances versus ValuesSerializer over values() rows.
+
+Both paths fetch and serialize the same 100-row page of every model, and
+their JSON output is checked to be identical.
+
+Usage:
+python -m benchmarks.serialization
+"""
+from benchmarks.common import measure, print_table, rolled_back, seed
+
+from rest_framework.renderers import JSONRenderer
+
+from clients.models import Client
+from clients.serializers import ClientSerializer
+from reservations.models import Reservation
+from reservations.serializers import ReservationSerializer
+from rooms.models import Room, RoomStandard
+from rooms.serializers import RoomSerializer, RoomStandardSerializer
+from utils.serializers import ValuesSerializer
+
+PAGE_SIZE = 100
+CASES = [
+    ('room standard', RoomStandard.objects.order_by('name', 'uuid'), RoomStandardSerializer, ['uuid', 'name', 'price_per_night']),
+    ('room', Room.objects.order_by('room_number', 'uuid'), RoomSerializer, None),
+    ('client', Client.objects.order_by('name', 'uuid'), ClientSerializer, None),
+    ('reservation', Reservation.objects.order_by('start_date', 'uuid'), ReservationSerializer, None),
+]
+
+
+def main():
+    rows = []
+    with rolled_back():
+        seed(1000, 10000, standards=PAGE_SIZE)
+        for name, queryset, serializer_class, fields in CASES:
+            values_serializer = ValuesSerializer.for_serializer(serializer_class, fields)
+            page = queryset.all()[:PAGE_SIZE]
+
+            def model_path():
+                return JSONRenderer().render(serializer_class(page.all(), many=True, fields=fields).data)
+
+            def values_path():
+                return JSONRenderer().render(values_serializer.serialize(values_serializer.values(page.all())))
+
+            assert model_path() == values_path(), name
+            model_median, model_p99 = measure(model_path, repeat=50)
+            values_median, values_p99 = measure(values_path, repeat=50)
+            rows.append((name, 'model', f'{model_median:.2f}', f'{model_p99:.2f}', ''))
+            rows.append((name, 'values', f'{values_median:.2f}', f'{values_p99:.2f}', f'{model_median / values_median:.1f}x'))
+    print_table(('model', 'serializer', 'median ms', 'p99 ms', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
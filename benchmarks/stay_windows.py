@@ -0,0 +1,44 @@
+"""
+Flexible-dates search: one pass over the reservations versus probing every start date.
+
+Usage:
+python -m benchmarks.stay_windows
+"""
+from datetime import timedelta
+
+from benchmarks.common import BASE_DATE, measure, print_table, rolled_back, seed
+from reservations.availability import get_available_rooms
+from reservations.windows import find_stay_windows
+
+SIZES = [(200, 5000), (1000, 20000)]
+NIGHTS = 3
+HORIZON_DAYS = 60
+
+
+def brute_force(standard, start_date, end_date, limit):
+    windows = []
+    day = start_date
+    while len(windows) < limit and day + timedelta(days=NIGHTS) <= end_date:
+        rooms = list(get_available_rooms(day, day + timedelta(days=NIGHTS), standard.uuid))
+        if rooms:
+            windows.append((day, rooms))
+        day += timedelta(days=1)
+    return windows
+
+
+def main():
+    start_date = (BASE_DATE + timedelta(days=30)).date()
+    end_date = start_date + timedelta(days=HORIZON_DAYS)
+    rows = []
+    for rooms, reservations in SIZES:
+        with rolled_back():
+            standard = seed(rooms, reservations)[0]
+            for limit in (1, 10, HORIZON_DAYS):
+                probing = measure(lambda: brute_force(standard, start_date, end_date, limit))
+                one_pass = measure(lambda: find_stay_windows(standard.uuid, NIGHTS, start_date, end_date, limit))
+                rows.append((rooms, reservations, limit, f'{probing[0]:.2f}', f'{one_pass[0]:.2f}'))
+    print_table(('rooms', 'reservations', 'limit', 'probing ms', 'one pass ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["name", "uuid"], name="clients_name_uuid"),
+        ),
+    ]
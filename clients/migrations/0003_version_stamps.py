@@ -0,0 +1,26 @@
+# Generated by Django 5.0.2 on 2026-10-18 00:24
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0002_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="client",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_default=django.db.models.functions.datetime.Now()
+            ),
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="version",
+            field=models.PositiveIntegerField(db_default=1, default=1, editable=False),
+        ),
+    ]
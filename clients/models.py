@@ -1,10 +1,16 @@
 import uuid
 from django.db import models
+from utils.models import VersionedModel
 
-class Client(models.Model):
+class Client(VersionedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', 'uuid'], name='clients_name_uuid'),
+        ]
+
     def __str__(self):
         return self.name
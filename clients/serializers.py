@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import Client
+from utils.models import VERSION_FIELDS
+from utils.serializers import SparseFieldsSerializerMixin
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Client
-        fields = '__all__'
+        exclude = VERSION_FIELDS
@@ -4,6 +4,8 @@ from clients.models import Client
 from employees.models import Employee
 from django.contrib.auth.models import Group
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 class ClientListViewTests(APITestCase):
     def setUp(self):
@@ -38,6 +40,40 @@ class ClientListViewTests(APITestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_list_clients_sparse_fields(self):
+        Client.objects.create(name='Sparse Client', email='sparse@example.com')
+        headers = {'Authorization': f'Token {self.token}'}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'name'}, headers=headers)
+        self.assertEqual(response.data['results'], [{'name': 'Sparse Client'}])
+        select = next(query['sql'] for query in queries if 'FROM "clients_client"' in query['sql'] and 'COUNT(' not in query['sql'])
+        self.assertNotIn('email', select)
+
+    def test_list_clients_etag(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        self.assertNotIn('ETag', self.client.get(self.url, headers=headers))
+        etag = self.client.get(self.url, headers={**headers, 'If-None-Match': '""'})['ETag']
+        response = self.client.get(self.url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Client.objects.create(name='New Client', email='new@example.com')
+        response = self.client.get(self.url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_clients_unknown_field(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(self.url, {'fields': 'name,phone'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_client_retry_is_replayed(self):
+        data = {'name': 'New Client', 'email': 'newclient@example.com'}
+        headers = {'Authorization': f'Token {self.token}', 'Idempotency-Key': 'client-retry'}
+        first = self.client.post(self.url, data, headers=headers, format='json')
+        retry = self.client.post(self.url, data, headers=headers, format='json')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry.headers['Idempotent-Replayed'], 'true')
+        self.assertEqual(Client.objects.count(), 1)
+
 class ClientDetailViewTests(APITestCase):
     def setUp(self):
         group = Group.objects.create(name='IT')
@@ -72,6 +108,33 @@ class ClientDetailViewTests(APITestCase):
         response = self.client.patch(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_conditional_get(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(self.url, headers=headers)
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len([query for query in queries if 'FROM "clients_client"' in query['sql']]), 1)
+
+        self.client.patch(self.url, {'name': 'Updated Client'}, headers=headers, format='json')
+        response = self.client.get(self.url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('version', response.data)
+        self.assertTrue(response['ETag'].startswith('"2-'))
+
+    def test_update_client_if_match(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        etag = self.client.get(self.url, {'fields': 'name'}, headers=headers)['ETag']
+        response = self.client.patch(self.url, {'name': 'First'}, headers={**headers, 'If-Match': etag}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(self.url, {'name': 'Second'}, headers={**headers, 'If-Match': etag}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.client_obj.refresh_from_db()
+        self.assertEqual(self.client_obj.name, 'First')
+
     def test_delete_client_authenticated(self):
         headers = {'Authorization': f'Token {self.token}'}
         response = self.client.delete(self.url, headers=headers)
@@ -1,10 +1,14 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from .models import Client
 from .serializers import ClientSerializer
 from utils.permissions import HasGroupPermission
-from utils.paginators import SmallResultsSetPagination
+from utils.idempotency import idempotent
+from utils.conditional import collection_etag, lock_if_match, not_modified, object_etag, precondition_failed
+from utils.paginators import SmallResultsSetPagination, get_paginator
+from utils.serializers import parse_fields, prune_queryset, ValuesSerializer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
@@ -21,6 +25,10 @@ class ClientListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
         ],
     )
     def get(self, request):
@@ -30,14 +38,30 @@ class ClientListView(APIView):
         Example:
         http://localhost:8000/clients?page=2&page_size=20
         """
-        clients = Client.objects.all().order_by('name')
+        fields = parse_fields(request, self.serializer_class)
+        clients = prune_queryset(Client.objects.all().order_by('name'), fields)
+        paginator = get_paginator(request, self.pagination_class)
+        etag = collection_etag(request, clients, paginator, self)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields)
+        if values_serializer:
+            clients = values_serializer.values(clients)
         
-        paginator = self.pagination_class()
-        paginated_clients = paginator.paginate_queryset(clients, request)
+        paginated_clients = paginator.paginate_queryset(clients, request, view=self)
         
-        serializer = self.serializer_class(paginated_clients, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        if values_serializer:
+            data = values_serializer.serialize(paginated_clients)
+        else:
+            data = self.serializer_class(paginated_clients, many=True, fields=fields).data
+        response = paginator.get_paginated_response(data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
 
+    @idempotent
     def post(self, request):
         """
         Create a new client.
@@ -60,20 +84,26 @@ class ClientDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
 
-    def get_object(self, uuid):
+    def get_object(self, uuid, fields=None):
         """
         Retrieve a client object by its UUID.
 
         parameters:
          - uuid: The UUID of the client to retrieve (string).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: Client object if found, None otherwise.
         """
         try:
-            return Client.objects.get(uuid=uuid)
+            return prune_queryset(Client.objects.all(), fields).get(uuid=uuid)
         except Client.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of a client by UUID.
@@ -81,15 +111,21 @@ class ClientDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the client to retrieve (string).
         """
-        client = self.get_object(uuid)
+        fields = parse_fields(request, self.serializer_class)
+        client = self.get_object(uuid, fields=fields)
         if client:
-            serializer = self.serializer_class(client)
-            return Response(serializer.data)
+            etag = object_etag(request, client)
+            not_modified_response = not_modified(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+            serializer = self.serializer_class(client, fields=fields)
+            return Response(serializer.data, headers={'ETag': etag})
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def patch(self, request, uuid):
         """
         Update a client instance partially.
+        With an If-Match header holding its ETag, the update fails with 412 if it changed since it was fetched.
 
         Possible parameters in the request:
         - name: The name of the client (string).
@@ -97,11 +133,15 @@ class ClientDetailView(APIView):
         """
         client = self.get_object(uuid)
         if client:
-            serializer = self.serializer_class(client, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                client = lock_if_match(request, client)
+                if client is None:
+                    return precondition_failed()
+                serializer = self.serializer_class(client, data=request.data, partial=True)
+                if serializer.is_valid():
+                    serializer.save()
+                    return Response(serializer.data, headers={'ETag': object_etag(request, client)})
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def delete(self, request, uuid):
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from .models import Employee
+from utils.serializers import SparseFieldsSerializerMixin
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = ['uuid', 'username', 'email', 'first_name', 'last_name', 'position', 'department', 'hire_date', 'date_of_termination', 'groups']
@@ -7,7 +7,8 @@ from utils.permissions import HasGroupPermission
 from rest_framework.permissions import AllowAny
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from utils.paginators import SmallResultsSetPagination
+from utils.paginators import SmallResultsSetPagination, get_paginator
+from utils.serializers import parse_fields, prune_queryset, ValuesSerializer
 from knox.views import LoginView as KnoxLoginView
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 from django.contrib.auth import login
@@ -51,6 +52,10 @@ class EmployeeListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
         ],
     )
     def get(self, request):
@@ -60,12 +65,18 @@ class EmployeeListView(APIView):
         Example:
         http://localhost:8000/employees?page=2&page_size=20
         """
-        employees = Employee.objects.all().order_by('username')
-
-        paginator = self.pagination_class()
-        paginated_employees = paginator.paginate_queryset(employees, request)
-
-        serializer = self.serializer_class(paginated_employees, many=True)
+        fields = parse_fields(request, self.serializer_class)
+        employees = prune_queryset(Employee.objects.all().order_by('username'), fields)
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields)
+        if values_serializer:
+            employees = values_serializer.values(employees)
+
+        paginator = get_paginator(request, self.pagination_class)
+        paginated_employees = paginator.paginate_queryset(employees, request, view=self)
+
+        if values_serializer:
+            return paginator.get_paginated_response(values_serializer.serialize(paginated_employees))
+        serializer = self.serializer_class(paginated_employees, many=True, fields=fields)
         return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
@@ -90,20 +101,26 @@ class EmployeeDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
 
-    def get_object(self, uuid):
+    def get_object(self, uuid, fields=None):
         """
         Retrieve an employee object by its UUID.
 
         parameters:
          - uuid: The UUID of the employee to retrieve (string).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: Employee object if found, None otherwise.
         """
         try:
-            return Employee.objects.get(uuid=uuid)
+            return prune_queryset(Employee.objects.all(), fields).get(uuid=uuid)
         except Employee.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of an employee by UUID.
@@ -111,9 +128,10 @@ class EmployeeDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the employee to retrieve (string).
         """
-        employee = self.get_object(uuid)
+        fields = parse_fields(request, self.serializer_class)
+        employee = self.get_object(uuid, fields=fields)
         if employee:
-            serializer = self.serializer_class(employee)
+            serializer = self.serializer_class(employee, fields=fields)
             return Response(serializer.data)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
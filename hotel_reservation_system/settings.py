@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import importlib.util
 from dotenv import load_dotenv
 from datetime import timedelta
 from rest_framework.settings import api_settings
@@ -26,6 +27,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "knox",
     "drf_spectacular",
     "clients",
@@ -55,8 +57,21 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'utils.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+if importlib.util.find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('utils.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('utils.parsers.MessagePackParser')
+
 REST_KNOX = {
     'SECURE_HASH_ALGORITHM':'cryptography.hazmat.primitives.hashes.SHA512',
     'AUTH_TOKEN_CHARACTER_LENGTH': 64, # By default, it is set to 64 characters (this shouldn't need changing).
@@ -67,6 +82,34 @@ REST_KNOX = {
     'EXPIRY_DATETIME_FORMAT': api_settings.DATETIME_FORMAT,
 }
 
+# Where AvailableRoomsView looks up occupied rooms:
+# "sql" - anti-join query on the reservations table,
+# "index" - in-process interval index kept up to date by reservation signals,
+# "calendar" - per-day occupancy table maintained with every reservation write.
+AVAILABILITY_BACKEND = os.getenv("AVAILABILITY_BACKEND") or "sql"
+
+# Number of availability results kept in the in-process LRU tier (0 disables it)
+# and seconds they are kept in the shared Django cache.
+AVAILABILITY_CACHE_SIZE = int(os.getenv("AVAILABILITY_CACHE_SIZE") or 1024)
+AVAILABILITY_CACHE_TIMEOUT = int(os.getenv("AVAILABILITY_CACHE_TIMEOUT") or 300)
+
+# Seconds the room standard price catalog used for quotes is kept in the cache.
+ROOM_CATALOG_CACHE_TIMEOUT = int(os.getenv("ROOM_CATALOG_CACHE_TIMEOUT") or 3600)
+
+# Seconds a response stored for an Idempotency-Key is replayed, seconds a key
+# stays claimed by a request that never finished, and seconds a retry waits
+# for the response of the request still holding its key. The claim timeout
+# must exceed the slowest idempotent request, or a retry can run it twice.
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL") or 86400)
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT") or 60)
+IDEMPOTENCY_WAIT_TIMEOUT = int(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT") or 10)
+
+# Seconds a tentative room hold lasts, and seconds between runs of the
+# background sweeper removing expired holds (0 disables the thread, e.g. when
+# the sweep_holds command runs from cron instead).
+HOLD_TTL = int(os.getenv("HOLD_TTL") or 600)
+HOLD_SWEEP_INTERVAL = int(os.getenv("HOLD_SWEEP_INTERVAL") or 30)
+
 SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
     "SCHEMA_COERCE_PATH_PK_SUFFIX": False,
@@ -111,6 +154,17 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND") or "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
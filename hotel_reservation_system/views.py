@@ -5,6 +5,7 @@ from django.conf import settings
 import time
 import psutil
 import requests
+from reservations.availability import availability_cache
 
 @require_GET
 def health_check(request):
@@ -33,7 +34,10 @@ def health_check(request):
         health_status['memory_usage'] = memory_usage
         return JsonResponse(health_status, status=500)
 
-    # 4. Monitoring in-flight messages
+    # 4. Availability cache efficiency of this process
+    health_status['availability_cache'] = availability_cache.stats()
+
+    # 5. Monitoring in-flight messages
     '''
     if settings.MESSAGE_QUEUE_URL:
         try:
@@ -44,7 +48,7 @@ def health_check(request):
             return JsonResponse({'status': 'Message queue service error'}, status=500)
     '''
 
-    # 5. Checking the status of other API dependencies
+    # 6. Checking the status of other API dependencies
     # Here you can put code to check the status of other external API dependencies
 
     return JsonResponse(health_status)
\ No newline at end of file
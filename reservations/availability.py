@@ -0,0 +1,132 @@
+from django.conf import settings
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Count, Exists, OuterRef, Q
+from .models import Reservation, RoomOccupancy, occupied_dates, to_datetime
+from .interval_index import interval_index
+from .holds import HoldSweeper, hold_store
+from rooms.models import Room, RoomStandard
+from utils.cache import VersionedCache
+
+availability_cache = VersionedCache(
+    'availability',
+    maxsize=settings.AVAILABILITY_CACHE_SIZE,
+    timeout=settings.AVAILABILITY_CACHE_TIMEOUT,
+)
+
+
+def conflicting_reservations(start_date, end_date):
+    """
+    Build a queryset of reservations overlapping the given date range.
+
+    Both the reservations and the searched range are half-open [start, end)
+    intervals, so a stay ending when the range starts does not conflict. The
+    lookup on the generated period column is served by the GiST index of the
+    no-overlapping-stays exclusion constraint. The redundant start_date bound
+    lets a partitioned reservations table skip the partitions after the range.
+
+    parameters:
+     - start_date: The start of the searched range (date or datetime).
+     - end_date: The end of the searched range (date or datetime).
+
+    return: Reservation queryset (not evaluated).
+    """
+    start, end = to_datetime(start_date), to_datetime(end_date)
+    if end <= start:
+        return Reservation.objects.none()
+    return Reservation.objects.filter(period__overlap=DateTimeTZRange(start, end), start_date__lt=end)
+
+
+def get_available_rooms(start_date, end_date, room_standard):
+    """
+    Find the rooms of a standard that are free for the given date range.
+
+    With the default "sql" backend the rooms are filtered by standard first
+    and the occupied ones are removed with a correlated NOT EXISTS, so the
+    whole search is a single anti-join query. The "index" backend loads the
+    candidate rooms only and checks them against the in-process interval index.
+    The "calendar" backend replaces the range scan with indexed lookups of the
+    searched days in the occupancy calendar. Rooms with an active hold
+    overlapping the range are treated as occupied by every backend.
+
+    parameters:
+     - start_date: The start of the searched range (date or datetime).
+     - end_date: The end of the searched range (date or datetime).
+     - room_standard: The UUID of the room standard (UUID or string).
+
+    return: Room objects ordered by room number (queryset or list).
+    """
+    held_rooms = hold_store.held_rooms(room_standard, to_datetime(start_date), to_datetime(end_date))
+    if settings.AVAILABILITY_BACKEND == 'index':
+        return [room for room in get_available_rooms_from_index(start_date, end_date, room_standard) if room.pk not in held_rooms]
+
+    if settings.AVAILABILITY_BACKEND == 'calendar':
+        occupied = RoomOccupancy.objects.filter(room=OuterRef('pk'), date__in=occupied_dates(start_date, end_date))
+    else:
+        occupied = conflicting_reservations(start_date, end_date).filter(room=OuterRef('pk'))
+    return (
+        Room.objects
+        .filter(room_standard=room_standard, is_available=True)
+        .filter(~Exists(occupied))
+        .exclude(pk__in=held_rooms)
+        .order_by('room_number')
+    )
+
+
+def get_available_rooms_from_index(start_date, end_date, room_standard):
+    """
+    Find the rooms of a standard that are free using the in-process interval index.
+
+    return: List of Room objects ordered by room number.
+    """
+    interval_index.ensure_built()
+    rooms = list(Room.objects.filter(room_standard=room_standard, is_available=True).order_by('room_number'))
+    free_rooms = interval_index.free_rooms([room.pk for room in rooms], start_date, end_date)
+    return [room for room in rooms if room.pk in free_rooms]
+
+
+def warm_up():
+    """
+    Build the in-memory structures of the configured backend and start the hold sweeper at process startup.
+    """
+    if settings.AVAILABILITY_BACKEND == 'index':
+        interval_index.rebuild()
+    if settings.HOLD_SWEEP_INTERVAL > 0:
+        HoldSweeper(sweep_holds, settings.HOLD_SWEEP_INTERVAL).start()
+
+
+def sweep_holds():
+    """
+    Remove expired holds and invalidate the cached availability of the affected room standards.
+
+    return: Set of the room standard UUIDs whose holds expired.
+    """
+    swept = hold_store.sweep()
+    availability_cache.bump(*swept)
+    return swept
+
+
+def get_inventory(start_date, end_date):
+    """
+    Count the free rooms of every room standard for the given date range.
+
+    The counts come from a single grouped query: rooms are joined to their
+    standard and counted only if they are available and not among the rooms
+    of the conflicting reservations.
+
+    return: Values queryset with uuid, name, price_per_night and available_rooms
+    of every room standard, ordered by name.
+    """
+    occupied_rooms = conflicting_reservations(start_date, end_date).values('room')
+    return (
+        RoomStandard.objects
+        .annotate(available_rooms=Count('room', filter=Q(room__is_available=True) & ~Q(room__in=occupied_rooms)))
+        .order_by('name')
+        .values('uuid', 'name', 'price_per_night', 'available_rooms')
+    )
+
+
+def invalidate(*room_standards):
+    """
+    Invalidate the cached availability of the given room standards.
+    """
+    availability_cache.invalidate(*room_standards)
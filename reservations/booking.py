@@ -0,0 +1,136 @@
+import random
+import time
+from django.db import IntegrityError, OperationalError, connection, transaction
+from .availability import conflicting_reservations, invalidate
+from .holds import hold_store
+from .models import is_overlap_violation, to_datetime
+from rooms.models import Room
+
+# SQLSTATE codes of errors that are safe to retry: serialization_failure, deadlock_detected.
+RETRYABLE_ERRORS = {'40001', '40P01'}
+MAX_ATTEMPTS = 3
+
+
+class RoomAlreadyBooked(Exception):
+    """
+    Raised when the requested room is already booked for an overlapping period.
+    """
+
+
+def is_retryable(error):
+    """
+    Check whether an OperationalError was a serialization failure or a deadlock.
+    """
+    return getattr(error.__cause__, 'pgcode', None) in RETRYABLE_ERRORS
+
+
+def book_room(serializer, hold=None):
+    """
+    Save a validated reservation serializer while holding the row lock of its room.
+
+    Only the Room row of the reservation is locked (SELECT ... FOR UPDATE), so
+    bookings of the same room are serialized while bookings of other rooms
+    proceed in parallel. Under the lock the overlap check sees every committed
+    booking of the room, so a losing concurrent request gets a clean conflict
+    instead of racing to the exclusion constraint. Active holds on the room
+    count as bookings too, except the hold being confirmed. Serialization failures and
+    deadlocks are retried with a short jittered backoff when the booking runs
+    in its own transaction.
+
+    parameters:
+     - serializer: A validated ReservationSerializer, for a new or an existing reservation.
+     - hold: The UUID of the hold this booking confirms, if any.
+
+    return: The saved Reservation.
+    """
+    return with_retries(_book_room, serializer, hold)
+
+
+def with_retries(function, *args):
+    """
+    Call a function running its own transaction, retrying serialization failures and deadlocks.
+
+    Inside an outer transaction the function is called once, since only the
+    whole outer transaction could be retried.
+
+    return: The return value of the function.
+    """
+    attempts = 1 if connection.in_atomic_block else MAX_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        try:
+            return function(*args)
+        except OperationalError as error:
+            if attempt == attempts or not is_retryable(error):
+                raise
+            time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+
+def _book_room(serializer, hold):
+    instance = serializer.instance
+    data = serializer.validated_data
+    room = data.get('room', getattr(instance, 'room', None))
+    start_date = data.get('start_date', getattr(instance, 'start_date', None))
+    end_date = data.get('end_date', getattr(instance, 'end_date', None))
+    try:
+        with transaction.atomic():
+            list(Room.objects.select_for_update().filter(pk=room.pk).values_list('pk', flat=True))
+            conflicts = conflicting_reservations(start_date, end_date).filter(room=room)
+            if instance is not None:
+                conflicts = conflicts.exclude(pk=instance.pk)
+            held_rooms = hold_store.held_rooms(room.room_standard_id, to_datetime(start_date), to_datetime(end_date), exclude=hold)
+            if conflicts.exists() or room.pk in held_rooms:
+                raise RoomAlreadyBooked()
+            return serializer.save()
+    except IntegrityError as error:
+        if not is_overlap_violation(error):
+            raise
+        raise RoomAlreadyBooked() from error
+
+
+def hold_room(room, start_date, end_date):
+    """
+    Hold a room for a tentative booking without writing a reservation.
+
+    The room row is locked as for a booking, so a hold and a booking of the
+    same room cannot both pass their checks.
+
+    return: The hold dictionary.
+    """
+    start, end = to_datetime(start_date), to_datetime(end_date)
+    with transaction.atomic():
+        list(Room.objects.select_for_update().filter(pk=room.pk).values_list('pk', flat=True))
+        if conflicting_reservations(start, end).filter(room=room).exists():
+            raise RoomAlreadyBooked()
+        with hold_store.locked(room.room_standard_id):
+            if room.pk in hold_store.held_rooms(room.room_standard_id, start, end):
+                raise RoomAlreadyBooked()
+            hold = hold_store.add(room, start, end)
+        invalidate(room.room_standard_id)
+    return hold
+
+
+def confirm_hold(serializer, hold):
+    """
+    Turn a hold into a reservation and release it.
+
+    parameters:
+     - serializer: A validated ReservationSerializer for the held room and dates.
+     - hold: The hold dictionary.
+
+    return: The saved Reservation.
+    """
+    reservation = book_room(serializer, hold=hold['uuid'])
+    hold_store.release(hold['uuid'])
+    return reservation
+
+
+def release_hold(hold_id):
+    """
+    Release a hold before it expires.
+
+    return: The released hold dictionary, or None if it was not active.
+    """
+    hold = hold_store.release(hold_id)
+    if hold:
+        invalidate(hold['room_standard'])
+    return hold
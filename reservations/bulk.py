@@ -0,0 +1,113 @@
+from collections import defaultdict
+from itertools import chain
+from django.conf import settings
+from django.db import transaction
+from .availability import conflicting_reservations, invalidate
+from .holds import hold_store
+from .interval_index import RoomIntervals, interval_index
+from .models import Reservation, RoomOccupancy, ROOM_ALREADY_BOOKED, to_datetime
+from clients.models import Client
+from rooms.models import Room
+
+BATCH_CONFLICT = 'The room is booked by another row of the batch for the requested period.'
+
+
+def lock_rooms(room_ids):
+    """
+    Lock the rows of rooms (SELECT ... FOR UPDATE) until the end of the transaction.
+
+    The rooms are locked in primary key order, so concurrent batches sharing
+    rooms cannot deadlock. Holding the locks from the overlap check to the
+    insert keeps concurrent bookings of the same rooms out, so a losing batch
+    gets its conflicts reported instead of failing on the constraint.
+    """
+    list(Room.objects.select_for_update().filter(pk__in=set(room_ids)).order_by('pk').values_list('pk', flat=True))
+
+
+def check_reservations(rows):
+    """
+    Check a batch of reservation rows against the database and against each other.
+
+    Clients and rooms are resolved with one query each, and the existing
+    reservations of the batch's rooms within the batch's overall date span
+    are loaded with a single overlap query. Every row is then checked against
+    the existing reservations of its room and against the rows accepted
+    before it. Rooms on hold count as booked.
+
+    parameters:
+     - rows: List of row dictionaries with client, room, start_date and end_date.
+
+    return: Dictionary mapping row positions to their errors (empty when the batch is valid).
+    """
+    errors = defaultdict(dict)
+    clients = set(Client.objects.filter(uuid__in={row['client'] for row in rows}).values_list('uuid', flat=True))
+    rooms = dict(Room.objects.filter(uuid__in={row['room'] for row in rows}).values_list('uuid', 'room_standard'))
+    for position, row in enumerate(rows):
+        if row['client'] not in clients:
+            errors[position]['client'] = [f'Invalid pk "{row["client"]}" - object does not exist.']
+        if row['room'] not in rooms:
+            errors[position]['room'] = [f'Invalid pk "{row["room"]}" - object does not exist.']
+
+    candidates = [
+        (position, row['room'], to_datetime(row['start_date']), to_datetime(row['end_date']))
+        for position, row in enumerate(rows) if position not in errors
+    ]
+    if not candidates:
+        return dict(errors)
+
+    existing = defaultdict(list)
+    booked = (
+        conflicting_reservations(min(start for _, _, start, _ in candidates), max(end for _, _, _, end in candidates))
+        .filter(room__in={room_id for _, room_id, _, _ in candidates})
+        .values_list('room_id', 'start_date', 'end_date', 'uuid')
+    )
+    for room_id, start, end, reservation_id in booked:
+        existing[room_id].append((start, end, reservation_id))
+    existing = {room_id: RoomIntervals(entries) for room_id, entries in existing.items()}
+
+    accepted = defaultdict(RoomIntervals)
+    for position, room_id, start, end in candidates:
+        if room_id in existing and existing[room_id].overlaps(start, end) or room_id in hold_store.held_rooms(rooms[room_id], start, end):
+            errors[position]['non_field_errors'] = [ROOM_ALREADY_BOOKED]
+        elif accepted[room_id].overlaps(start, end):
+            errors[position]['non_field_errors'] = [BATCH_CONFLICT]
+        else:
+            accepted[room_id].add(start, end, position)
+    return dict(errors)
+
+
+def create_reservations(rows):
+    """
+    Insert a checked batch of reservations in one transaction.
+
+    The reservations and their occupancy calendar rows are inserted with
+    bulk_create, which bypasses Reservation.save() and the model signals, so
+    the availability cache and the interval index are updated here instead.
+    Callers lock the batch's rooms with lock_rooms before check_reservations,
+    in the same transaction, so no overlapping reservation can be booked
+    between the check and the insert.
+
+    return: List of the created reservations.
+    """
+    with transaction.atomic():
+        reservations = Reservation.objects.bulk_create([
+            Reservation(client_id=row['client'], room_id=row['room'], start_date=row['start_date'], end_date=row['end_date'])
+            for row in rows
+        ])
+        RoomOccupancy.objects.bulk_create(chain.from_iterable(reservation.occupancy_rows() for reservation in reservations))
+        reservations_created(reservations)
+    return reservations
+
+
+def reservations_created(reservations):
+    """
+    Invalidate the cached availability and schedule the indexing of reservations inserted without save().
+    """
+    invalidate(*Room.objects.filter(uuid__in={reservation.room_id for reservation in reservations}).values_list('room_standard', flat=True).distinct())
+    if settings.AVAILABILITY_BACKEND == 'index' and interval_index.built:
+        transaction.on_commit(lambda: index_reservations(reservations))
+
+
+def index_reservations(reservations):
+    for reservation in reservations:
+        interval_index.add(reservation)
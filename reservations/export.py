@@ -0,0 +1,104 @@
+import csv
+import json
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+
+EXPORT_FIELDS = {
+    'uuid': 'uuid',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'room': 'room_id',
+    'room_number': 'room__room_number',
+    'room_standard': 'room__room_standard__name',
+    'client': 'client_id',
+    'client_name': 'client__name',
+    'client_email': 'client__email',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportRenderer(BaseRenderer):
+    """
+    Renderer letting clients negotiate an export format with the Accept header.
+
+    The export itself is a streaming response that bypasses renderers; only
+    the error responses of the export view are rendered, as a JSON object.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, default=str).encode() + b'\n'
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class Echo:
+    """
+    File-like object returning what is written to it, so csv.writer can format single lines.
+    """
+    def write(self, value):
+        return value
+
+
+def export_rows(reservations, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Iterate over the export rows of a reservation queryset with a server-side cursor.
+
+    The room, room standard and client columns are joined in the same query
+    and the rows are fetched chunk_size at a time, so memory use does not grow
+    with the number of exported reservations.
+
+    return: Generator of dictionaries keyed by the export field names.
+    """
+    date_field = serializers.DateTimeField()
+    names = list(EXPORT_FIELDS)
+    for values in reservations.values_list(*EXPORT_FIELDS.values()).iterator(chunk_size=chunk_size):
+        row = dict(zip(names, values))
+        row['uuid'], row['room'], row['client'] = str(row['uuid']), str(row['room']), str(row['client'])
+        row['start_date'] = date_field.to_representation(row['start_date'])
+        row['end_date'] = date_field.to_representation(row['end_date'])
+        yield row
+
+
+def _batched(lines, chunk_size):
+    # Joining lines into larger chunks avoids a socket write per reservation.
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def export_csv(reservations, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream reservations as CSV, starting with a header line.
+
+    return: Generator of CSV text chunks.
+    """
+    writer = csv.writer(Echo())
+    lines = (writer.writerow(row.values()) for row in export_rows(reservations, chunk_size))
+    yield writer.writerow(EXPORT_FIELDS)
+    yield from _batched(lines, chunk_size)
+
+
+def export_ndjson(reservations, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream reservations as newline-delimited JSON, one object per line.
+
+    return: Generator of NDJSON text chunks.
+    """
+    lines = (json.dumps(row) + '\n' for row in export_rows(reservations, chunk_size))
+    yield from _batched(lines, chunk_size)
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rooms.models import RoomStandard
+
+LOCK_TIMEOUT = 5
+
+logger = logging.getLogger(__name__)
+
+
+class HoldStore:
+    """
+    Tentative room holds kept in the Django cache instead of the reservations table.
+
+    The holds of a room standard are stored together under one key, so the
+    availability search reads them with a single cache lookup; a second key
+    per hold points back to its standard. Writes to a standard's holds are
+    serialized with a cache lock. Expired holds are ignored by every read and
+    removed by the sweeper, never by the requests themselves.
+    """
+
+    def __init__(self, namespace='holds'):
+        self.namespace = namespace
+
+    def _standard_key(self, room_standard):
+        return f'{self.namespace}:standard:{room_standard}'
+
+    def _hold_key(self, hold_id):
+        return f'{self.namespace}:hold:{hold_id}'
+
+    @contextmanager
+    def locked(self, room_standard):
+        """
+        Serialize changes to the holds of a room standard across processes sharing the cache.
+        """
+        key = f'{self.namespace}:lock:{room_standard}'
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while not cache.add(key, True, timeout=LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'Could not lock the holds of room standard {room_standard}.')
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            cache.delete(key)
+
+    def holds(self, room_standard):
+        """
+        Return the active holds of a room standard.
+
+        return: Dictionary mapping hold UUIDs to hold dictionaries.
+        """
+        now = timezone.now()
+        return {
+            hold_id: hold for hold_id, hold in cache.get(self._standard_key(room_standard), {}).items()
+            if hold['expires_at'] > now
+        }
+
+    def held_rooms(self, room_standard, start, end, exclude=None):
+        """
+        Find the rooms of a standard with an active hold overlapping the [start, end) range.
+
+        return: Set of room UUIDs.
+        """
+        return {
+            hold['room'] for hold_id, hold in self.holds(room_standard).items()
+            if hold_id != exclude and hold['start_date'] < end and hold['end_date'] > start
+        }
+
+    def add(self, room, start, end):
+        """
+        Store a new hold; the caller must hold the lock of the room's standard.
+
+        return: The hold dictionary.
+        """
+        hold = {
+            'uuid': uuid.uuid4(),
+            'room': room.pk,
+            'room_standard': room.room_standard_id,
+            'start_date': start,
+            'end_date': end,
+            'expires_at': timezone.now() + timedelta(seconds=settings.HOLD_TTL),
+        }
+        holds = self.holds(room.room_standard_id)
+        holds[hold['uuid']] = hold
+        cache.set(self._standard_key(room.room_standard_id), holds, timeout=settings.HOLD_TTL)
+        cache.set(self._hold_key(hold['uuid']), room.room_standard_id, timeout=settings.HOLD_TTL)
+        return hold
+
+    def get(self, hold_id):
+        """
+        Return an active hold, or None if it does not exist or has expired.
+        """
+        room_standard = cache.get(self._hold_key(hold_id))
+        if room_standard is None:
+            return None
+        return self.holds(room_standard).get(hold_id)
+
+    def release(self, hold_id):
+        """
+        Remove a hold.
+
+        return: The released hold dictionary, or None if it was not active.
+        """
+        room_standard = cache.get(self._hold_key(hold_id))
+        if room_standard is None:
+            return None
+        with self.locked(room_standard):
+            holds = self.holds(room_standard)
+            hold = holds.pop(hold_id, None)
+            cache.set(self._standard_key(room_standard), holds, timeout=settings.HOLD_TTL)
+        cache.delete(self._hold_key(hold_id))
+        return hold
+
+    def sweep(self):
+        """
+        Remove the expired holds of every room standard.
+
+        return: Set of the room standard UUIDs whose holds changed.
+        """
+        keys = {self._standard_key(room_standard): room_standard for room_standard in RoomStandard.objects.values_list('uuid', flat=True)}
+        swept = set()
+        now = timezone.now()
+        for key, stored in cache.get_many(keys).items():
+            if all(hold['expires_at'] > now for hold in stored.values()):
+                continue
+            with self.locked(keys[key]):
+                cache.set(key, self.holds(keys[key]), timeout=settings.HOLD_TTL)
+            swept.add(keys[key])
+        return swept
+
+
+class HoldSweeper(threading.Thread):
+    """
+    Daemon thread calling a sweep function at a fixed interval.
+    """
+
+    def __init__(self, sweep, interval):
+        super().__init__(name='hold-sweeper', daemon=True)
+        self.sweep = sweep
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception('Sweeping expired holds failed; retrying at the next interval.')
+
+    def stop(self):
+        self.stopped.set()
+
+
+hold_store = HoldStore()
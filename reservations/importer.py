@@ -0,0 +1,258 @@
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .availability import invalidate
+from .bulk import check_reservations, lock_rooms, reservations_created
+from .models import Reservation, RoomOccupancy
+from clients.models import Client
+from rooms.models import Room, RoomStandard
+from utils.pgcopy import copy_rows
+
+NOT_FOUND = 'Object does not exist.'
+AMBIGUOUS = 'More than one object matches this value; use its UUID instead.'
+DUPLICATE_EMAIL = 'A client with this email already exists.'
+REJECTED_BY_DATABASE = 'The row was rejected by a database constraint.'
+
+
+def parse_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+class ModelImporter(ABC):
+    """
+    Validate batches of imported rows of a model and load them with COPY.
+
+    Every row is cleaned field by field with the model fields, then the whole
+    batch is checked against the database with one query per lookup, and
+    the valid rows are loaded with a single COPY. Subclasses list the imported
+    model fields and implement the batch checks and the load.
+    """
+    model = None
+    fields = []
+
+    def clean(self, row):
+        """
+        Convert the raw values of a row with the model fields.
+
+        return: Dictionary of the cleaned values, with a new UUID unless the row has one.
+        """
+        record, errors = {}, {}
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            value = row.get(name)
+            if isinstance(value, str):
+                value = value.strip()
+            try:
+                if field.is_relation:
+                    if value in (None, ''):
+                        raise ValidationError(field.error_messages['null'])
+                    record[name] = value
+                elif value in (None, '') and field.has_default():
+                    record[name] = field.get_default()
+                else:
+                    record[name] = field.clean(value, None)
+            except ValidationError as error:
+                errors[name] = error.messages
+        record['uuid'] = parse_uuid(row['uuid']) if row.get('uuid') else uuid.uuid4()
+        if record['uuid'] is None:
+            errors['uuid'] = [f'"{row["uuid"]}" is not a valid UUID.']
+        if errors:
+            raise ValidationError(errors)
+        return record
+
+    def check(self, records):
+        """
+        Check a batch of cleaned records against the database and against each other.
+
+        return: Dictionary mapping record positions to their errors.
+        """
+        return {}
+
+    @abstractmethod
+    def load(self, records):
+        """
+        Load a batch of checked records.
+
+        return: Dictionary mapping the positions of the records rejected by the database to their errors.
+        """
+
+    def import_batch(self, rows):
+        """
+        Validate and load a batch of raw rows in one transaction.
+
+        return: Tuple of the number of imported rows and a dictionary mapping
+        the positions of the rejected rows to their errors.
+        """
+        records, errors = {}, {}
+        for position, row in enumerate(rows):
+            try:
+                records[position] = self.clean(row)
+            except ValidationError as error:
+                errors[position] = error.message_dict
+        positions = list(records)
+        with transaction.atomic():
+            for index, record_errors in self.check([records[position] for position in positions]).items():
+                errors[positions[index]] = record_errors
+            positions = [position for position in positions if position not in errors]
+            for index, record_errors in self.load([records[position] for position in positions]).items():
+                errors[positions[index]] = record_errors
+        return len(rows) - len(errors), errors
+
+    def rejected_by_database(self, records, inserted):
+        return {
+            index: {'non_field_errors': [REJECTED_BY_DATABASE]}
+            for index, record in enumerate(records) if record['uuid'] not in inserted
+        }
+
+
+class ClientImporter(ModelImporter):
+    """
+    Import clients from rows with name and email (and optionally uuid).
+    """
+    model = Client
+    fields = ['name', 'email']
+
+    def __init__(self):
+        # Emails of the clients inserted by the previous batches.
+        self.emails = set()
+
+    def check(self, records):
+        errors = {}
+        existing = set(Client.objects.filter(email__in={record['email'] for record in records}).values_list('email', flat=True))
+        seen = set()
+        for index, record in enumerate(records):
+            if record['email'] in existing or record['email'] in self.emails or record['email'] in seen:
+                errors[index] = {'email': [DUPLICATE_EMAIL]}
+            else:
+                seen.add(record['email'])
+        return errors
+
+    def load(self, records):
+        inserted = copy_rows(Client, ['uuid', 'name', 'email'], (
+            (record['uuid'], record['name'], record['email']) for record in records
+        ), returning='uuid')
+        self.emails.update(record['email'] for record in records if record['uuid'] in inserted)
+        return self.rejected_by_database(records, inserted)
+
+
+class RoomImporter(ModelImporter):
+    """
+    Import rooms from rows with room_number, location, room_standard (UUID or name)
+    and optionally is_available and uuid.
+    """
+    model = Room
+    fields = ['room_number', 'location', 'is_available', 'room_standard']
+
+    def __init__(self):
+        # Room standards are few, so they are all looked up once by UUID and by name.
+        self.standards = {}
+        for standard_id, name in RoomStandard.objects.values_list('uuid', 'name'):
+            self.standards[str(standard_id)] = standard_id
+            self.standards[name] = None if name in self.standards else standard_id
+
+    def check(self, records):
+        errors = {}
+        for index, record in enumerate(records):
+            value = str(record['room_standard'])
+            if value not in self.standards:
+                errors[index] = {'room_standard': [NOT_FOUND]}
+            elif self.standards[value] is None:
+                errors[index] = {'room_standard': [AMBIGUOUS]}
+            else:
+                record['room_standard'] = self.standards[value]
+        return errors
+
+    def load(self, records):
+        inserted = copy_rows(Room, ['uuid', 'room_number', 'location', 'is_available', 'room_standard_id'], (
+            (record['uuid'], record['room_number'], record['location'], record['is_available'], record['room_standard'])
+            for record in records
+        ), returning='uuid')
+        invalidate(*{record['room_standard'] for record in records})
+        return self.rejected_by_database(records, inserted)
+
+
+class ReservationImporter(ModelImporter):
+    """
+    Import reservations from rows with client (UUID or email), room (UUID or
+    room number), start_date and end_date (and optionally uuid).
+    """
+    model = Reservation
+    fields = ['client', 'room', 'start_date', 'end_date']
+
+    def clean(self, row):
+        record = super().clean(row)
+        for name in ('start_date', 'end_date'):
+            if timezone.is_naive(record[name]):
+                record[name] = timezone.make_aware(record[name])
+        if record['end_date'] <= record['start_date']:
+            raise ValidationError({'end_date': ['End date must be after start date.']})
+        return record
+
+    def check(self, records):
+        errors = defaultdict(dict)
+        clients = self.lookup(Client, 'email', {record['client'] for record in records})
+        rooms = self.lookup(Room, 'room_number', {record['room'] for record in records})
+        for index, record in enumerate(records):
+            for name, matches in (('client', clients), ('room', rooms)):
+                value = record[name]
+                if value not in matches:
+                    errors[index][name] = [NOT_FOUND]
+                elif matches[value] is None:
+                    errors[index][name] = [AMBIGUOUS]
+                else:
+                    record[name] = matches[value]
+
+        valid = [index for index in range(len(records)) if index not in errors]
+        # Held until the batch is loaded; see lock_rooms.
+        lock_rooms(records[index]['room'] for index in valid)
+        for position, row_errors in check_reservations([records[index] for index in valid]).items():
+            errors[valid[position]] = row_errors
+        return dict(errors)
+
+    def lookup(self, model, field, values):
+        """
+        Resolve UUIDs or values of a lookup field to primary keys with one query.
+
+        return: Dictionary mapping the given values to primary keys, or to None when several objects match.
+        """
+        uuids = {value: parse_uuid(value) for value in values}
+        matches, found = {}, set()
+        lookups = Q(uuid__in={pk for pk in uuids.values() if pk}) | Q(**{f'{field}__in': values})
+        for pk, key in model.objects.filter(lookups).values_list('uuid', field):
+            found.add(pk)
+            if key in values:
+                matches[key] = None if key in matches else pk
+        for value, pk in uuids.items():
+            if pk in found:
+                matches[value] = pk
+        return matches
+
+    def load(self, records):
+        inserted = copy_rows(Reservation, ['uuid', 'client_id', 'room_id', 'start_date', 'end_date'], (
+            (record['uuid'], record['client'], record['room'], record['start_date'], record['end_date'])
+            for record in records
+        ), returning='uuid')
+        reservations = [
+            Reservation(uuid=record['uuid'], client_id=record['client'], room_id=record['room'], start_date=record['start_date'], end_date=record['end_date'])
+            for record in records if record['uuid'] in inserted
+        ]
+        copy_rows(RoomOccupancy, ['room_id', 'reservation_id', 'date'], (
+            (occupancy.room_id, occupancy.reservation_id, occupancy.date)
+            for reservation in reservations for occupancy in reservation.occupancy_rows()
+        ))
+        reservations_created(reservations)
+        return self.rejected_by_database(records, inserted)
+
+
+IMPORTERS = {
+    'clients': ClientImporter,
+    'rooms': RoomImporter,
+    'reservations': ReservationImporter,
+}
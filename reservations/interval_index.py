@@ -0,0 +1,172 @@
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from .models import Reservation, to_datetime
+
+
+class RoomIntervals:
+    """
+    Reservations of a single room kept sorted by start date.
+
+    Next to the sorted entries a prefix maximum of the end dates is kept, so an
+    overlap check is a single bisect: among the reservations starting before
+    the end of the range, the latest end decides whether any of them overlaps.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = sorted(entries)
+        self._reindex()
+
+    def add(self, start, end, reservation_id):
+        insort(self.entries, (start, end, reservation_id))
+        self._reindex()
+
+    def remove(self, start, end, reservation_id):
+        self.entries.remove((start, end, reservation_id))
+        self._reindex()
+
+    def _reindex(self):
+        self.starts = [entry[0] for entry in self.entries]
+        self.max_ends = []
+        latest = None
+        for _, end, _ in self.entries:
+            latest = end if latest is None or end > latest else latest
+            self.max_ends.append(latest)
+
+    def overlaps(self, start, end):
+        position = bisect_left(self.starts, end)
+        return position > 0 and self.max_ends[position - 1] > start
+
+
+class IntervalIndex:
+    """
+    In-process index of reservation intervals per room.
+
+    The index is loaded from the database on first use and kept up to date by
+    the reservation signals. It only sees writes made through this process, so
+    it should be rebuilt or verified when other processes write reservations.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rooms = defaultdict(RoomIntervals)
+        self._reservations = {}
+        # Changes made while a rebuild reads the database, one journal per running rebuild.
+        self._journals = []
+        self.built = False
+
+    def rebuild(self):
+        """
+        Reload the whole index from the database.
+
+        The database is read without holding the lock, so the changes indexed
+        meanwhile are journaled and replayed onto the new index before it
+        replaces the current one. Replaying is safe whether or not the read
+        already saw a change, since every change sets or removes the whole
+        interval of a reservation.
+
+        return: The number of indexed reservations (int).
+        """
+        journal = []
+        with self._lock:
+            self._journals.append(journal)
+        try:
+            rows = Reservation.objects.values_list('uuid', 'room_id', 'start_date', 'end_date').order_by('room_id', 'start_date')
+            rooms = defaultdict(RoomIntervals)
+            reservations = {}
+            for reservation_id, room_id, start, end in rows.iterator(chunk_size=5000):
+                rooms[room_id].entries.append((start, end, reservation_id))
+                reservations[reservation_id] = (room_id, start, end)
+            for intervals in rooms.values():
+                intervals.entries.sort()
+                intervals._reindex()
+        except BaseException:
+            with self._lock:
+                self._journals.remove(journal)
+            raise
+        with self._lock:
+            self._journals.remove(journal)
+            for reservation_id, interval in journal:
+                self._apply(rooms, reservations, reservation_id, interval)
+            self._rooms = rooms
+            self._reservations = reservations
+            self.built = True
+        return len(reservations)
+
+    def ensure_built(self):
+        if not self.built:
+            self.rebuild()
+
+    def add(self, reservation):
+        """
+        Index a reservation, replacing its previous interval if it was moved.
+        """
+        self._change(reservation.pk, (reservation.room_id, to_datetime(reservation.start_date), to_datetime(reservation.end_date)))
+
+    def discard(self, reservation_id):
+        """
+        Remove a reservation from the index if it is indexed.
+        """
+        self._change(reservation_id, None)
+
+    def _change(self, reservation_id, interval):
+        with self._lock:
+            self._apply(self._rooms, self._reservations, reservation_id, interval)
+            for journal in self._journals:
+                journal.append((reservation_id, interval))
+
+    @staticmethod
+    def _apply(rooms, reservations, reservation_id, interval):
+        """
+        Set the (room_id, start, end) interval of a reservation, or remove it when interval is None.
+        """
+        previous = reservations.pop(reservation_id, None)
+        if previous:
+            room_id, start, end = previous
+            rooms[room_id].remove(start, end, reservation_id)
+        if interval:
+            room_id, start, end = interval
+            rooms[room_id].add(start, end, reservation_id)
+            reservations[reservation_id] = interval
+
+    def is_free(self, room_id, start_date, end_date):
+        """
+        Check whether a room has no reservation overlapping the given range.
+        """
+        return bool(self.free_rooms([room_id], start_date, end_date))
+
+    def free_rooms(self, room_ids, start_date, end_date):
+        """
+        Filter the given rooms down to those with no reservation overlapping the range.
+
+        return: Set of room UUIDs.
+        """
+        start, end = to_datetime(start_date), to_datetime(end_date)
+        with self._lock:
+            return {
+                room_id for room_id in room_ids
+                if room_id not in self._rooms or not self._rooms[room_id].overlaps(start, end)
+            }
+
+    def verify(self):
+        """
+        Compare the index with the database.
+
+        return: Dictionary with the UUIDs of reservations missing from the index,
+        indexed but no longer in the database, and indexed with stale values.
+        """
+        database = {
+            reservation_id: (room_id, start, end)
+            for reservation_id, room_id, start, end in
+            Reservation.objects.values_list('uuid', 'room_id', 'start_date', 'end_date').iterator(chunk_size=5000)
+        }
+        with self._lock:
+            indexed = dict(self._reservations)
+        return {
+            'missing': sorted(str(key) for key in database.keys() - indexed.keys()),
+            'unexpected': sorted(str(key) for key in indexed.keys() - database.keys()),
+            'stale': sorted(str(key) for key in database.keys() & indexed.keys() if database[key] != indexed[key]),
+        }
+
+
+interval_index = IntervalIndex()
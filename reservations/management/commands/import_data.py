@@ -0,0 +1,65 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from reservations.importer import IMPORTERS
+
+
+def read_rows(file, file_format):
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise CommandError(f'Expected a JSON object per line, got: {line.strip()[:100]}')
+            yield row
+
+
+class Command(BaseCommand):
+    help = (
+        "Import clients, rooms or reservations from a CSV or NDJSON file. Rows are validated in batches "
+        "and loaded with PostgreSQL COPY; invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=list(IMPORTERS), help='Kind of the imported rows.')
+        parser.add_argument('path', help='Path of the file to import, or "-" for the standard input.')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='File format, guessed from the file extension by default.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Number of rows validated and loaded per transaction.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else None)
+        if file_format is None:
+            raise CommandError('Cannot guess the file format from the file name; pass --format.')
+
+        importer = IMPORTERS[options['model']]()
+        started = time.perf_counter()
+        imported = rejected = 0
+        file = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            rows = read_rows(file, file_format)
+            while batch := list(islice(rows, options['batch_size'])):
+                batch_started = time.perf_counter()
+                count, errors = importer.import_batch(batch)
+                for position, row_errors in sorted(errors.items()):
+                    self.stderr.write(f'Row {imported + rejected + position + 1}: {json.dumps(row_errors)}')
+                imported += count
+                rejected += len(errors)
+                rate = len(batch) / (time.perf_counter() - batch_started)
+                self.stdout.write(f'Processed {imported + rejected} rows ({rate:,.0f} rows/s)')
+        except (csv.Error, json.JSONDecodeError) as error:
+            raise CommandError(f'Cannot read the file after row {imported + rejected}: {error}')
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        elapsed = time.perf_counter() - started
+        rate = (imported + rejected) / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} {options["model"]} and rejected {rejected} in {elapsed:.1f}s ({rate:,.0f} rows/s)'
+        ))
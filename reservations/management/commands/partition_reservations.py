@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from reservations.partitions import archive_partitions, convert_to_partitioned, ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain the monthly partitions of the reservations table: create the partitions of the coming months "
+        "and optionally detach old ones. Run it with --convert once to partition an existing table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true', help='Convert the reservations table to a partitioned table first.')
+        parser.add_argument('--months-ahead', type=int, default=3, help='Number of months after the current one to create partitions for.')
+        parser.add_argument('--archive-older-than', type=int, help='Detach the partitions of months ending this many months before the current one.')
+        parser.add_argument('--drop', action='store_true', help='Drop the detached partitions instead of keeping them as archive tables.')
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        if options['convert']:
+            if is_partitioned():
+                raise CommandError('The reservations table is already partitioned.')
+            copied = convert_to_partitioned(today, options['months_ahead'])
+            self.stdout.write(f'Copied {copied} reservations into the partitioned table')
+        elif not is_partitioned():
+            raise CommandError('The reservations table is not partitioned; run the command with --convert first.')
+
+        for name in ensure_partitions(today, options['months_ahead']):
+            self.stdout.write(f'Created partition {name}')
+
+        if options['archive_older_than'] is not None:
+            for name in archive_partitions(today, options['archive_older_than'], drop=options['drop']):
+                self.stdout.write(f'{"Dropped" if options["drop"] else "Archived"} partition {name}')
+
+        self.stdout.write(self.style.SUCCESS('Reservation partitions are up to date'))
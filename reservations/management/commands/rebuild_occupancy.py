@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from reservations.models import Reservation, RoomOccupancy
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the room occupancy calendar from existing reservations."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Number of reservations rebuilt per transaction.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        started = time.perf_counter()
+        processed = 0
+        last_uuid = None
+
+        while True:
+            reservations = Reservation.objects.order_by('uuid').only('uuid', 'room', 'start_date', 'end_date')
+            if last_uuid is not None:
+                reservations = reservations.filter(uuid__gt=last_uuid)
+            chunk = list(reservations[:chunk_size])
+            if not chunk:
+                break
+
+            with transaction.atomic():
+                RoomOccupancy.objects.filter(reservation__in=chunk).delete()
+                RoomOccupancy.objects.bulk_create(
+                    [row for reservation in chunk for row in reservation.occupancy_rows()],
+                    batch_size=5000,
+                )
+
+            processed += len(chunk)
+            last_uuid = chunk[-1].uuid
+            self.stdout.write(f'Rebuilt occupancy of {processed} reservations')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Occupancy calendar rebuilt for {processed} reservations in {elapsed:.1f}s'))
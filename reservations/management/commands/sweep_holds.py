@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from reservations.availability import sweep_holds
+
+
+class Command(BaseCommand):
+    help = "Remove expired room holds, for deployments running the sweep from cron instead of the background thread."
+
+    def handle(self, *args, **options):
+        swept = sweep_holds()
+        self.stdout.write(self.style.SUCCESS(f'Removed expired holds of {len(swept)} room standards'))
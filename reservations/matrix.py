@@ -0,0 +1,59 @@
+import base64
+from itertools import groupby
+from .availability import conflicting_reservations
+from .models import occupied_day_span
+from rooms.models import Room
+
+ENCODINGS = ['string', 'bits', 'rle']
+
+
+def occupancy_matrix(start_date, end_date, room_standard=None):
+    """
+    Compute the rooms x nights occupancy matrix for a date window.
+
+    Every room row is a Python integer used as a bit array (bit i set means
+    night i is occupied), so each reservation fills its whole span with one
+    shift-and-or instead of touching individual cells. The reservations of the
+    window are fetched with a single query.
+
+    parameters:
+     - start_date: The first night of the window (date).
+     - end_date: The day after the last night of the window (date).
+     - room_standard: Optional UUID of the room standard to limit the rooms to.
+
+    return: Tuple of (list of room dictionaries, number of nights); each room
+    dictionary holds the uuid, room_number, is_available and the bit array.
+    """
+    nights = (end_date - start_date).days
+    rooms = Room.objects.order_by('room_number')
+    reservations = conflicting_reservations(start_date, end_date)
+    if room_standard:
+        rooms = rooms.filter(room_standard=room_standard)
+        reservations = reservations.filter(room__room_standard=room_standard)
+
+    matrix = {
+        uuid: {'uuid': uuid, 'room_number': room_number, 'is_available': is_available, 'occupancy': 0}
+        for uuid, room_number, is_available in rooms.values_list('uuid', 'room_number', 'is_available')
+    }
+    for room_id, start, end in reservations.values_list('room_id', 'start_date', 'end_date'):
+        first_day, last_day = occupied_day_span(start, end)
+        first = max((first_day - start_date).days, 0)
+        last = min((last_day - start_date).days, nights - 1)
+        matrix[room_id]['occupancy'] |= ((1 << (last - first + 1)) - 1) << first
+    return list(matrix.values()), nights
+
+
+def encode_occupancy(bit_array, nights, encoding):
+    """
+    Encode an occupancy bit array for the response.
+
+    - string: one "0"/"1" character per night.
+    - bits: base64 of the bit-packed nights, least significant bit of the first byte is the first night.
+    - rle: list of [state, number of nights] runs.
+    """
+    if encoding == 'bits':
+        return base64.b64encode(bit_array.to_bytes((nights + 7) // 8, 'little')).decode('ascii')
+    flags = format(bit_array, f'0{nights}b')[::-1]
+    if encoding == 'rle':
+        return [[int(state), len(list(run))] for state, run in groupby(flags)]
+    return flags
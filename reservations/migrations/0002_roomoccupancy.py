@@ -0,0 +1,61 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0001_initial"),
+        ("rooms", "0002_alter_amenity_options_alter_room_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "reservation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="reservations.reservation",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Room Occupancy",
+                "verbose_name_plural": "Room Occupancy",
+                "indexes": [
+                    models.Index(
+                        fields=["date", "room"], name="reservations_occupancy_date"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="roomoccupancy",
+            constraint=models.UniqueConstraint(
+                fields=("reservation", "date"), name="reservations_occupancy_unique_day"
+            ),
+        ),
+    ]
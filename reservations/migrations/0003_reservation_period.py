@@ -0,0 +1,64 @@
+# Generated by Django 5.0.2 on 2026-10-17 22:55
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.operations
+import django.contrib.postgres.fields.ranges
+import reservations.models
+from django.db import IntegrityError, migrations, models
+
+
+def check_overlapping_stays(apps, schema_editor):
+    """
+    Refuse to add the constraint while reservations of a room overlap, listing the offending pairs.
+
+    The constraint would fail on the first overlap with a bare exclusion error;
+    overlapping stays are double bookings to resolve by hand, not by the migration.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT a.room_id, a.uuid, a.start_date, a.end_date, b.uuid, b.start_date, b.end_date'
+            ' FROM reservations_reservation a JOIN reservations_reservation b'
+            ' ON a.room_id = b.room_id AND a.uuid < b.uuid AND a.period && b.period'
+            ' ORDER BY a.room_id, a.start_date LIMIT 21'
+        )
+        pairs = cursor.fetchall()
+    if pairs:
+        lines = [f'room {room}: {first} ({first_start} - {first_end}) overlaps {second} ({second_start} - {second_end})'
+                 for room, first, first_start, first_end, second, second_start, second_end in pairs[:20]]
+        if len(pairs) > 20:
+            lines.append('...')
+        raise IntegrityError('Overlapping reservations must be resolved before adding the no-overlapping-stays constraint:\n' + '\n'.join(lines))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("reservations", "0002_roomoccupancy"),
+        ("rooms", "0002_alter_amenity_options_alter_room_options_and_more"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.BtreeGistExtension(),
+        migrations.AddField(
+            model_name="reservation",
+            name="period",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=reservations.models.TsTzRange(
+                    "start_date",
+                    "end_date",
+                    django.contrib.postgres.fields.ranges.RangeBoundary(),
+                ),
+                output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField(),
+            ),
+        ),
+        migrations.RunPython(check_overlapping_stays, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="reservation",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                expressions=[("period", "&&"), ("room", "=")],
+                name="reservations_no_overlapping_stays",
+            ),
+        ),
+    ]
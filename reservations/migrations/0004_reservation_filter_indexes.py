@@ -0,0 +1,54 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("reservations", "0003_reservation_period"),
+        ("rooms", "0002_alter_amenity_options_alter_room_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="reservation",
+            name="client",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="clients.client",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="reservation",
+            name="room",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="rooms.room",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["room", "start_date"], name="reservations_room_start"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["client", "start_date"], name="reservations_client_start"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(fields=["start_date"], name="reservations_start_date"),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(fields=["end_date"], name="reservations_end_date"),
+        ),
+    ]
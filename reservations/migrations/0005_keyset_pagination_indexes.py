@@ -0,0 +1,25 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0002_keyset_pagination_indexes"),
+        ("reservations", "0004_reservation_filter_indexes"),
+        ("rooms", "0003_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="reservation",
+            name="reservations_start_date",
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["start_date", "uuid"], name="reservations_start_uuid"
+            ),
+        ),
+    ]
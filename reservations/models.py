@@ -1,15 +1,148 @@
 import uuid
-from django.db import models
+from datetime import timedelta
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.db import models, transaction
+from django.utils import timezone
 from clients.models import Client
 from rooms.models import Room
+from utils.models import VersionedModel
 
-class Reservation(models.Model):
+OVERLAP_CONSTRAINT = 'reservations_no_overlapping_stays'
+ROOM_ALREADY_BOOKED = 'The room is already booked for the requested period.'
+
+class TsTzRange(models.Func):
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+class Reservation(VersionedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    client = models.ForeignKey(Client, on_delete=models.CASCADE)
-    room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    # The composite indexes below lead with client and room, so the single-column FK indexes are not needed.
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, db_index=False)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, db_index=False)
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
+    period = models.GeneratedField(
+        expression=TsTzRange('start_date', 'end_date', RangeBoundary()),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
 
     class Meta:
         verbose_name = "Reservation"
         verbose_name_plural = "Reservations"
+        indexes = [
+            models.Index(fields=['room', 'start_date'], name='reservations_room_start'),
+            models.Index(fields=['client', 'start_date'], name='reservations_client_start'),
+            models.Index(fields=['start_date', 'uuid'], name='reservations_start_uuid'),
+            models.Index(fields=['end_date'], name='reservations_end_date'),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=OVERLAP_CONSTRAINT,
+                expressions=[('period', RangeOperators.OVERLAPS), ('room', RangeOperators.EQUAL)],
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored room, so the signals notice a move to another room without a query.
+        instance._loaded_room_id = instance.__dict__.get('room_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save the reservation and its occupancy calendar rows in one transaction.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_occupancy()
+        self._loaded_room_id = self.room_id
+
+    def sync_occupancy(self):
+        """
+        Replace the occupancy calendar rows of this reservation.
+        """
+        RoomOccupancy.objects.filter(reservation=self).delete()
+        RoomOccupancy.objects.bulk_create(self.occupancy_rows())
+
+    def occupancy_rows(self):
+        """
+        Build (unsaved) occupancy calendar rows for every day this reservation touches.
+        """
+        return [
+            RoomOccupancy(room_id=self.room_id, reservation_id=self.pk, date=date)
+            for date in occupied_dates(self.start_date, self.end_date)
+        ]
+
+class RoomOccupancy(models.Model):
+    """
+    Per-room, per-day occupancy calendar materialized from reservations.
+
+    A reservation occupies every calendar day (in the default time zone) that
+    intersects its [start_date, end_date) interval, so checking the days of a
+    searched range is equivalent to the reservation overlap check.
+    """
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='occupancy')
+    reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE, related_name='occupancy')
+    date = models.DateField()
+
+    class Meta:
+        verbose_name = "Room Occupancy"
+        verbose_name_plural = "Room Occupancy"
+        indexes = [
+            models.Index(fields=['date', 'room'], name='reservations_occupancy_date'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['reservation', 'date'], name='reservations_occupancy_unique_day'),
+        ]
+
+def to_datetime(value):
+    """
+    Convert a date, datetime or string to the aware datetime the database compares with.
+    """
+    return Reservation._meta.get_field('start_date').get_prep_value(value)
+
+def day_bounds(day):
+    """
+    Return the first and last instant of a calendar day in the default time zone.
+
+    The bounds are meant for an inclusive range lookup, which compares the raw
+    column and so can use a plain index on it.
+    """
+    start = to_datetime(day)
+    return start, to_datetime(day + timedelta(days=1)) - timedelta(microseconds=1)
+
+def occupied_day_span(start_date, end_date):
+    """
+    Find the first and last calendar day intersecting the [start_date, end_date) interval.
+
+    return: Tuple of dates, or None for an empty interval.
+    """
+    tz = timezone.get_default_timezone()
+    start, end = to_datetime(start_date), to_datetime(end_date)
+    if end <= start:
+        return None
+    return timezone.localtime(start, tz).date(), timezone.localtime(end - timedelta(microseconds=1), tz).date()
+
+def occupied_dates(start_date, end_date):
+    """
+    List the calendar days intersecting the [start_date, end_date) interval.
+    """
+    span = occupied_day_span(start_date, end_date)
+    if span is None:
+        return []
+    first_day, last_day = span
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+def is_overlap_violation(error):
+    """
+    Check whether an IntegrityError was raised by the no-overlapping-stays constraint.
+
+    On a partitioned reservations table every partition has its own copy of
+    the constraint, named after the partition.
+    """
+    diag = getattr(error.__cause__, 'diag', None)
+    name = getattr(diag, 'constraint_name', None) or ''
+    return name == OVERLAP_CONSTRAINT or name.startswith(f'{OVERLAP_CONSTRAINT}_')
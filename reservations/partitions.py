@@ -0,0 +1,268 @@
+import re
+from datetime import date, datetime, timezone
+from django.db import connection, transaction
+from .models import OVERLAP_CONSTRAINT, Reservation
+from rooms.models import Room
+
+TABLE = Reservation._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_y(\d{{4}})m(\d{{2}})$')
+
+
+def month_start(day, months=0):
+    """
+    Return the first day of the month of the given date, shifted by a number of months.
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month, archived=False):
+    prefix = f'{TABLE}_archive' if archived else TABLE
+    return f'{prefix}_y{month.year}m{month.month:02d}'
+
+
+def _bound(month):
+    # Partitions are split on UTC month boundaries, the time zone the column is compared in.
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat()
+
+
+def _add_overlap_constraint(cursor, table, suffix):
+    # Exclusion constraints cannot span partitions, so every partition gets its own.
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {OVERLAP_CONSTRAINT}_{suffix} '
+        f'EXCLUDE USING gist (period WITH &&, room_id WITH =)'
+    )
+
+
+def _add_overlap_trigger(cursor):
+    """
+    Check every write to the reservations table against the stays of its room in all partitions.
+
+    The partition-local constraints miss stays overlapping across partitions,
+    so a row trigger locks the room (SELECT ... FOR UPDATE) and looks for an
+    overlapping stay of it in the whole table. Writes of the same room are
+    serialized by the lock, and every statement of the trigger takes a fresh
+    snapshot, so the check sees the stays committed while it waited. The
+    error carries the constraint name, as the constraint's own would. Being
+    in the database, the check covers every write: Reservation.save(), the
+    admin, bulk_create and COPY imports alike.
+    """
+    cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION {OVERLAP_CONSTRAINT}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM 1 FROM {Room._meta.db_table} WHERE {Room._meta.pk.column} = NEW.room_id FOR UPDATE;
+            IF EXISTS (
+                SELECT 1 FROM {TABLE} WHERE room_id = NEW.room_id AND uuid <> NEW.uuid
+                AND period && tstzrange(NEW.start_date, NEW.end_date)
+            ) THEN
+                RAISE EXCEPTION USING ERRCODE = 'exclusion_violation', CONSTRAINT = '{OVERLAP_CONSTRAINT}',
+                    MESSAGE = 'conflicting key value violates exclusion constraint "{OVERLAP_CONSTRAINT}"';
+            END IF;
+            RETURN NEW;
+        END
+        $$
+    """)
+    cursor.execute(
+        f'CREATE TRIGGER {OVERLAP_CONSTRAINT} BEFORE INSERT OR UPDATE OF room_id, start_date, end_date ON {TABLE} '
+        f'FOR EACH ROW EXECUTE FUNCTION {OVERLAP_CONSTRAINT}()'
+    )
+
+
+def _create_month_partition(cursor, month):
+    name = partition_name(month)
+    cursor.execute(
+        f"CREATE TABLE {name} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(month_start(month, 1))}')"
+    )
+    _add_overlap_constraint(cursor, name, name.removeprefix(f'{TABLE}_'))
+    return name
+
+
+def _columns(cursor, table):
+    """
+    List the stored (non-generated) columns of a table.
+    """
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = %s AND is_generated = 'NEVER' "
+        "ORDER BY ordinal_position",
+        [table],
+    )
+    return ', '.join(row[0] for row in cursor.fetchall())
+
+
+def is_partitioned():
+    """
+    Check whether the reservations table is range partitioned.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def list_partitions():
+    """
+    List the monthly partitions of the reservations table.
+
+    return: Dictionary mapping the first day of every partitioned month to the partition name.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_partition(month):
+    """
+    Create the partition of a month, moving its rows out of the default partition.
+
+    Rows outside every monthly partition land in the default partition, and
+    Postgres refuses to create a partition for a range the default partition
+    still holds rows of, so the default partition is detached while they move.
+    When it holds no row of the month, the partition is simply created.
+
+    return: The name of the created partition.
+    """
+    bounds = [_bound(month), _bound(month_start(month, 1))]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE start_date >= %s AND start_date < %s)', bounds)
+        if not cursor.fetchone()[0]:
+            return _create_month_partition(cursor, month)
+        columns = _columns(cursor, TABLE)
+        cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}')
+        name = _create_month_partition(cursor, month)
+        cursor.execute(
+            f'WITH moved AS ('
+            f'DELETE FROM {DEFAULT_PARTITION} WHERE start_date >= %s AND start_date < %s RETURNING {columns}'
+            f') INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM moved',
+            bounds,
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    return name
+
+
+def ensure_partitions(today, months_ahead):
+    """
+    Create the missing partitions from the current month up to months_ahead months after it.
+
+    return: List of the created partition names.
+    """
+    existing = list_partitions()
+    months = [month_start(today, offset) for offset in range(months_ahead + 1)]
+    return [create_partition(month) for month in months if month not in existing]
+
+
+def archive_partitions(today, older_than, drop=False):
+    """
+    Detach the partitions of months ending more than older_than months before the current month.
+
+    Detached partitions are renamed with an "archive" prefix and kept as plain
+    tables, or dropped when drop is set. Their rows are no longer visible
+    through the Reservation model. Partitions are keyed by start_date, so a
+    partition still holding a stay that ends after the cutoff is kept until
+    that stay is over.
+
+    return: List of the detached partition names.
+    """
+    cutoff = month_start(today, -older_than)
+    detached = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for month, name in sorted(list_partitions().items()):
+            if month_start(month, 1) > cutoff:
+                continue
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {name} WHERE end_date > %s)', [_bound(cutoff)])
+            if cursor.fetchone()[0]:
+                continue
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            else:
+                cursor.execute(f'ALTER TABLE {name} RENAME TO {partition_name(month, archived=True)}')
+            detached.append(name)
+    return detached
+
+
+def convert_to_partitioned(today, months_ahead):
+    """
+    Replace the reservations table with a table range partitioned by start_date month.
+
+    The rows are copied into monthly partitions covering every stored
+    reservation up to months_ahead months after the current month, plus a
+    default partition for anything outside them. Postgres requires the
+    partition key in every unique constraint of a partitioned table, so:
+     - The primary key becomes (uuid, start_date); uuid stays unique through its UUID4 default.
+     - The no-overlapping-stays constraint is created per partition, so it
+       no longer rejects stays overlapping across a month boundary; a row
+       trigger checks those under the lock of the room instead.
+     - Foreign keys referencing reservations (the occupancy calendar) are
+       dropped; Django still cascades deletes itself.
+
+    return: The number of copied reservations (int).
+    """
+    old_table = f'{TABLE}_unpartitioned'
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Django foreign keys are deferred, and Postgres refuses to alter a table with pending checks.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(
+            "SELECT conname, conrelid::regclass::text FROM pg_constraint "
+            "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+            [TABLE],
+        )
+        for name, table in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('f', 'c')",
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            "SELECT index_class.relname, pg_get_indexdef(index_class.oid) FROM pg_index "
+            "JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid "
+            "WHERE pg_index.indrelid = to_regclass(%s) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = index_class.oid)",
+            [TABLE],
+        )
+        indexes = cursor.fetchall()
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old_table}')
+        for name, _ in indexes:
+            cursor.execute(f'ALTER INDEX {name} RENAME TO {name}_unpartitioned')
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING GENERATED) '
+            f'PARTITION BY RANGE (start_date)'
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (uuid, start_date)')
+        for name, definition in constraints:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+        for name, definition in indexes:
+            cursor.execute(re.sub(rf'\b{old_table}\b', TABLE, definition))
+
+        _add_overlap_trigger(cursor)
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT')
+        _add_overlap_constraint(cursor, DEFAULT_PARTITION, 'default')
+        cursor.execute(f'SELECT min(start_date) FROM {old_table}')
+        first = cursor.fetchone()[0]
+        month = month_start(min(first.date(), today) if first else today)
+        while month <= month_start(today, months_ahead):
+            _create_month_partition(cursor, month)
+            month = month_start(month, 1)
+
+        columns = _columns(cursor, old_table)
+        cursor.execute(f'INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {old_table}')
+        copied = cursor.rowcount
+        cursor.execute(f'DROP TABLE {old_table}')
+    return copied
@@ -1,12 +1,135 @@
 from rest_framework import serializers
 from .models import Reservation
+from clients.models import Client
+from rooms.models import Room
+from .matrix import ENCODINGS
+from clients.serializers import ClientSerializer
+from rooms.serializers import RoomSerializer
+from utils.models import VERSION_FIELDS
+from utils.serializers import ExpandableSerializerMixin, SparseFieldsSerializerMixin
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(SparseFieldsSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Reservation
-        fields = '__all__'
+        exclude = ['period', *VERSION_FIELDS]
+        expandable_fields = {'room': (RoomSerializer, {}), 'client': (ClientSerializer, {})}
 
-class AvailableRoomsSerializer(serializers.Serializer):
+    def validate(self, data):
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date <= start_date:
+            raise serializers.ValidationError({'end_date': 'End date must be after start date.'})
+        return data
+
+class ReservationFilterSerializer(serializers.Serializer):
+    room = serializers.UUIDField(required=False)
+    client = serializers.UUIDField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    arriving = serializers.DateField(required=False)
+    departing = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if 'start_date' in data and 'end_date' in data and data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError({'end_date': 'End date must be after start date.'})
+        return data
+
+class ReservationExportSerializer(ReservationFilterSerializer):
+    output = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+
+class DateRangeSerializer(serializers.Serializer):
     start_date = serializers.DateField()
     end_date = serializers.DateField()
-    room_standard = serializers.UUIDField()
\ No newline at end of file
+
+    def validate(self, data):
+        if data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError({'end_date': 'End date must be after start date.'})
+        return data
+
+class BulkReservationRowSerializer(serializers.Serializer):
+    client = serializers.UUIDField()
+    room = serializers.UUIDField()
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+
+    def validate(self, data):
+        if data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError({'end_date': 'End date must be after start date.'})
+        return data
+
+class BulkReservationSerializer(serializers.Serializer):
+    MAX_ROWS = 1000
+
+    reservations = serializers.ListField(child=BulkReservationRowSerializer(), allow_empty=False, max_length=MAX_ROWS)
+
+class HoldRequestSerializer(serializers.Serializer):
+    room = serializers.PrimaryKeyRelatedField(queryset=Room.objects.all())
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+
+    def validate(self, data):
+        if data['end_date'] <= data['start_date']:
+            raise serializers.ValidationError({'end_date': 'End date must be after start date.'})
+        return data
+
+class HoldSerializer(serializers.Serializer):
+    uuid = serializers.UUIDField()
+    room = serializers.UUIDField()
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+    expires_at = serializers.DateTimeField()
+
+class HoldConfirmSerializer(serializers.Serializer):
+    client = serializers.PrimaryKeyRelatedField(queryset=Client.objects.all())
+
+class AvailableRoomsSerializer(DateRangeSerializer):
+    room_standard = serializers.UUIDField()
+
+class OccupancyMatrixSerializer(DateRangeSerializer):
+    MAX_NIGHTS = 366
+
+    room_standard = serializers.UUIDField(required=False)
+    encoding = serializers.ChoiceField(choices=ENCODINGS, default='string')
+
+    def validate(self, data):
+        data = super().validate(data)
+        if (data['end_date'] - data['start_date']).days > self.MAX_NIGHTS:
+            raise serializers.ValidationError({'end_date': f'The window cannot be longer than {self.MAX_NIGHTS} nights.'})
+        return data
+
+class StayWindowSearchSerializer(DateRangeSerializer):
+    MAX_NIGHTS = 366
+    MAX_LIMIT = 100
+
+    room_standard = serializers.UUIDField()
+    nights = serializers.IntegerField(min_value=1, max_value=MAX_NIGHTS)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_LIMIT, default=1)
+
+    def validate(self, data):
+        data = super().validate(data)
+        if (data['end_date'] - data['start_date']).days > self.MAX_NIGHTS:
+            raise serializers.ValidationError({'end_date': f'The horizon cannot be longer than {self.MAX_NIGHTS} nights.'})
+        return data
+
+class QuoteItemSerializer(DateRangeSerializer):
+    room_standard = serializers.UUIDField()
+
+class QuoteRequestSerializer(serializers.Serializer):
+    MAX_QUOTES = 500
+
+    quotes = serializers.ListField(child=QuoteItemSerializer(), allow_empty=False, max_length=MAX_QUOTES)
+
+class QuoteSerializer(serializers.Serializer):
+    room_standard = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    nights = serializers.IntegerField()
+    price_per_night = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    total = serializers.DecimalField(max_digits=None, decimal_places=2, allow_null=True)
+    error = serializers.CharField(required=False)
+
+class RoomStandardInventorySerializer(serializers.Serializer):
+    uuid = serializers.UUIDField()
+    name = serializers.CharField()
+    price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2)
+    available_rooms = serializers.IntegerField()
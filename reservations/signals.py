@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .availability import invalidate
+from .interval_index import interval_index
+from .models import Reservation
+from rooms.models import Room
+
+
+@receiver(post_save, sender=Reservation)
+def index_saved_reservation(sender, instance, **kwargs):
+    """
+    Add a created or moved reservation to the interval index once it is committed.
+    """
+    if settings.AVAILABILITY_BACKEND == 'index' and interval_index.built:
+        transaction.on_commit(lambda: interval_index.add(instance))
+
+
+@receiver(post_delete, sender=Reservation)
+def unindex_deleted_reservation(sender, instance, **kwargs):
+    """
+    Remove a deleted reservation from the interval index once the deletion is committed.
+    """
+    if settings.AVAILABILITY_BACKEND == 'index' and interval_index.built:
+        reservation_id = instance.pk
+        transaction.on_commit(lambda: interval_index.discard(reservation_id))
+
+
+@receiver(pre_save, sender=Reservation)
+def remember_previous_room(sender, instance, **kwargs):
+    """
+    Remember the room a reservation is moved away from, so both standards get invalidated.
+
+    The room is known from when the reservation was loaded or last saved; it
+    is only queried when the room column was deferred.
+    """
+    if not instance._state.adding:
+        previous_room_id = getattr(instance, '_loaded_room_id', None)
+        if previous_room_id is None:
+            previous_room_id = Reservation.objects.filter(pk=instance.pk).values_list('room', flat=True).first()
+        instance._previous_room_id = previous_room_id
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_reservation_availability(sender, instance, **kwargs):
+    """
+    Invalidate the cached availability of the room standards a reservation belongs to.
+    """
+    room_ids = {instance.room_id, getattr(instance, '_previous_room_id', None)}
+    invalidate(*Room.objects.filter(pk__in=room_ids).values_list('room_standard', flat=True))
+
+
+@receiver(pre_save, sender=Room)
+def remember_previous_room_standard(sender, instance, **kwargs):
+    """
+    Remember the standard a room is moved away from, so both standards get invalidated.
+    """
+    if not instance._state.adding:
+        instance._previous_room_standard_id = Room.objects.filter(pk=instance.pk).values_list('room_standard', flat=True).first()
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room_availability(sender, instance, **kwargs):
+    """
+    Invalidate the cached availability of the room standards a room belongs to.
+    """
+    invalidate(instance.room_standard_id, getattr(instance, '_previous_room_standard_id', None))
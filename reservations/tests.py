@@ -1,13 +1,52 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from clients.models import Client
-from reservations.models import Reservation
+from reservations.models import Reservation, RoomOccupancy, is_overlap_violation
 from rooms.models import Room
 from employees.models import Employee
 from rooms.models import RoomStandard
 from django.contrib.auth.models import Group
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.db.migrations.executor import MigrationExecutor
+from django.core.management import CommandError, call_command
+from datetime import date, datetime, timedelta
+from unittest import mock
+from django.conf import settings
+from django.utils import timezone
+from io import StringIO
+from reservations.availability import availability_cache, get_available_rooms, get_inventory, sweep_holds
+from reservations.interval_index import interval_index
+from reservations.windows import find_stay_windows
+from rooms.catalog import get_price_catalog
+from reservations.bulk import BATCH_CONFLICT, check_reservations, create_reservations, lock_rooms
+from reservations.export import export_csv
+from reservations.importer import REJECTED_BY_DATABASE, ClientImporter
+from reservations.serializers import BulkReservationSerializer, ReservationSerializer
+from reservations.booking import RoomAlreadyBooked, book_room, hold_room
+from reservations.views import ReservationListView
+from utils.idempotency import IN_FLIGHT
+from utils.paginators import StandardResultsSetPagination
+from utils.serializers import ValuesSerializer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from utils.parsers import FastJSONParser
+from utils.renderers import FastJSONRenderer, msgpack
+from unittest import skipUnless
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+import io
+import uuid
+from django.core.cache import cache
+import json
+import os
+import tempfile
+import threading
 import warnings
 
 warnings.filterwarnings('ignore', message="DateTimeField Reservation.start_date received a naive datetime")
@@ -64,6 +103,25 @@ class ReservationListViewTests(APITestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_create_overlapping_reservation_conflict(self):
+        data = {'client': self.client_uuid, 'room': self.room_uuid, 'start_date': '2024-03-01 12:00:00', 'end_date': '2024-03-07 11:00:00'}
+        headers = {'Authorization': f'Token {self.token}'}
+        self.client.post(self.url, data, headers=headers, format='json')
+
+        data.update({'start_date': '2024-03-06 12:00:00', 'end_date': '2024-03-09 11:00:00'})
+        response = self.client.post(self.url, data, headers=headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        data.update({'start_date': '2024-03-07 11:00:00', 'end_date': '2024-03-09 11:00:00'})
+        response = self.client.post(self.url, data, headers=headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_create_reservation_ending_before_start(self):
+        data = {'client': self.client_uuid, 'room': self.room_uuid, 'start_date': '2024-03-07 12:00:00', 'end_date': '2024-03-01 11:00:00'}
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.post(self.url, data, headers=headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 class ReservationDetailViewTests(APITestCase):
     def setUp(self):
         group = Group.objects.create(name='IT')
@@ -118,6 +176,13 @@ class ReservationDetailViewTests(APITestCase):
         response = self.client.patch(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_update_reservation_overlapping_conflict(self):
+        Reservation.objects.create(client=self.client_object, room=self.room, start_date='2024-03-10 12:00:00', end_date='2024-03-12 11:00:00')
+        data = {'end_date': '2024-03-11 11:00:00'}
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.patch(self.url, data, headers=headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
     def test_delete_reservation_authenticated(self):
         headers = {'Authorization': f'Token {self.token}'}
         response = self.client.delete(self.url, headers=headers)
@@ -194,3 +259,1103 @@ class AvailableRoomsViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(any(room['uuid'] == str(self.room_uuid) for room in available_rooms))
 
+    def test_repeated_search_is_served_from_cache(self):
+        data = {'start_date': '2024-04-06', 'end_date': '2024-04-09', 'room_standard': self.room_standard_uuid}
+        headers = {'Authorization': f'Token {self.token}'}
+        url = reverse('available-rooms')
+
+        first = self.client.post(url, data=data, headers=headers, format='json')
+        hits = availability_cache.hits
+        second = self.client.post(url, data=data, headers=headers, format='json')
+
+        self.assertEqual(availability_cache.hits, hits + 1)
+        self.assertEqual(first.data, second.data)
+
+    def test_cached_search_is_invalidated_by_reservation(self):
+        data = {'start_date': '2024-04-06', 'end_date': '2024-04-09', 'room_standard': self.room_standard_uuid}
+        headers = {'Authorization': f'Token {self.token}'}
+        url = reverse('available-rooms')
+        self.client.post(url, data=data, headers=headers, format='json')
+
+        reservation_data = {'client': self.client_uuid, 'room': self.room_uuid, 'start_date': '2024-04-07 12:00:00', 'end_date': '2024-04-08 11:00:00'}
+        self.client.post(reverse('reservation-list'), data=reservation_data, headers=headers, format='json')
+
+        response = self.client.post(url, data=data, headers=headers, format='json')
+        self.assertFalse(any(room['uuid'] == str(self.room_uuid) for room in response.data['available_rooms']))
+
+    def test_cached_search_is_invalidated_by_room_change(self):
+        data = {'start_date': '2024-04-06', 'end_date': '2024-04-09', 'room_standard': self.room_standard_uuid}
+        headers = {'Authorization': f'Token {self.token}'}
+        url = reverse('available-rooms')
+        self.client.post(url, data=data, headers=headers, format='json')
+
+        room = Room.objects.get(uuid=self.room_uuid)
+        room.is_available = False
+        room.save()
+
+        response = self.client.post(url, data=data, headers=headers, format='json')
+        self.assertEqual(response.data['available_rooms'], [])
+
+class AvailabilityEngineTests(TestCase):
+    def setUp(self):
+        self.standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        other_standard = RoomStandard.objects.create(name='Single', price_per_night='80.00')
+        self.free_room = Room.objects.create(room_number='201', location='Test Location', room_standard=self.standard)
+        self.booked_room = Room.objects.create(room_number='202', location='Test Location', room_standard=self.standard)
+        self.other_room = Room.objects.create(room_number='301', location='Test Location', room_standard=other_standard)
+        Room.objects.create(room_number='203', location='Test Location', room_standard=self.standard, is_available=False)
+        client = Client.objects.create(name='Test Client', email='engine@example.com')
+        Reservation.objects.create(client=client, room=self.booked_room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+        Reservation.objects.create(client=client, room=self.other_room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+
+    def test_only_free_rooms_of_standard_are_returned(self):
+        rooms = get_available_rooms('2024-04-02', '2024-04-03', self.standard.uuid)
+        self.assertEqual(list(rooms), [self.free_room])
+
+    def test_search_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(get_available_rooms('2024-04-02', '2024-04-03', self.standard.uuid))
+
+@override_settings(AVAILABILITY_BACKEND='index')
+class IntervalIndexTests(TestCase):
+    def setUp(self):
+        self.standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=self.standard)
+        self.other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=self.standard)
+        self.client_object = Client.objects.create(name='Test Client', email='index@example.com')
+        self.reservation = Reservation.objects.create(client=self.client_object, room=self.room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+        interval_index.rebuild()
+
+    def test_backends_agree(self):
+        for start_date, end_date in [('2024-03-30', '2024-04-01'), ('2024-03-30', '2024-04-02'), ('2024-04-02', '2024-04-03'), ('2024-04-05', '2024-04-09'), ('2024-04-06', '2024-04-09')]:
+            with override_settings(AVAILABILITY_BACKEND='sql'):
+                expected = list(get_available_rooms(start_date, end_date, self.standard.uuid))
+            with override_settings(AVAILABILITY_BACKEND='calendar'):
+                self.assertEqual(list(get_available_rooms(start_date, end_date, self.standard.uuid)), expected)
+            self.assertEqual(get_available_rooms(start_date, end_date, self.standard.uuid), expected)
+
+    def test_index_follows_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Reservation.objects.create(client=self.client_object, room=self.other_room, start_date='2024-04-02 12:00:00', end_date='2024-04-03 11:00:00')
+            self.reservation.room = self.other_room
+            self.reservation.start_date = '2024-05-01 12:00:00'
+            self.reservation.end_date = '2024-05-03 11:00:00'
+            self.reservation.save()
+        self.assertTrue(interval_index.is_free(self.room.pk, '2024-04-02', '2024-04-03'))
+        self.assertFalse(interval_index.is_free(self.other_room.pk, '2024-04-02', '2024-04-03'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation.delete()
+        self.assertEqual(interval_index.verify(), {'missing': [], 'unexpected': [], 'stale': []})
+
+    def test_changes_during_a_rebuild_are_kept(self):
+        moved = Reservation(uuid=uuid.uuid4(), client=self.client_object, room=self.other_room, start_date='2024-04-02 12:00:00', end_date='2024-04-03 11:00:00')
+        values_list = Reservation.objects.values_list
+
+        def read_while_changed(*args, **kwargs):
+            # Commit callbacks running while the rebuild reads the database.
+            interval_index.add(moved)
+            interval_index.discard(self.reservation.pk)
+            return values_list(*args, **kwargs)
+
+        with mock.patch.object(Reservation.objects, 'values_list', side_effect=read_while_changed):
+            interval_index.rebuild()
+        self.assertTrue(interval_index.is_free(self.room.pk, '2024-04-02', '2024-04-03'))
+        self.assertFalse(interval_index.is_free(self.other_room.pk, '2024-04-02', '2024-04-03'))
+
+    def test_moving_a_loaded_reservation_does_not_query_its_room(self):
+        reservation = Reservation.objects.get(pk=self.reservation.pk)
+        reservation.room = self.other_room
+        with CaptureQueriesContext(connection) as queries:
+            reservation.save()
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT "reservations_reservation"."room_id"')])
+        self.assertEqual(reservation._previous_room_id, self.room.pk)
+
+class RoomOccupancyTests(TestCase):
+    def setUp(self):
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        self.other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=standard)
+        client = Client.objects.create(name='Test Client', email='occupancy@example.com')
+        self.reservation = Reservation.objects.create(client=client, room=self.room, start_date='2024-04-01 12:00:00', end_date='2024-04-03 11:00:00')
+
+    def occupancy(self):
+        return list(RoomOccupancy.objects.order_by('date').values_list('room', 'date'))
+
+    def test_calendar_follows_reservation(self):
+        self.assertEqual(self.occupancy(), [(self.room.pk, date(2024, 4, d)) for d in (1, 2, 3)])
+
+        self.reservation.room = self.other_room
+        self.reservation.end_date = '2024-04-02 00:00:00'
+        self.reservation.save()
+        self.assertEqual(self.occupancy(), [(self.other_room.pk, date(2024, 4, 1))])
+
+        self.reservation.delete()
+        self.assertEqual(self.occupancy(), [])
+
+    def test_rebuild_command(self):
+        expected = self.occupancy()
+        RoomOccupancy.objects.all().delete()
+        call_command('rebuild_occupancy', chunk_size=1, stdout=StringIO())
+        self.assertEqual(self.occupancy(), expected)
+
+class OccupancyMatrixViewTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        Room.objects.create(room_number='202', location='Test Location', room_standard=standard)
+        client = Client.objects.create(name='Test Client', email='matrix@example.com')
+        Reservation.objects.create(client=client, room=room, start_date='2024-04-01 12:00:00', end_date='2024-04-03 11:00:00')
+        Reservation.objects.create(client=client, room=room, start_date='2024-04-09 12:00:00', end_date='2024-04-20 11:00:00')
+
+    def get_matrix(self, encoding):
+        data = {'start_date': '2024-03-30', 'end_date': '2024-04-11', 'encoding': encoding}
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(reverse('occupancy-matrix'), data, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nights'], 12)
+        return [room['occupancy'] for room in response.data['rooms']]
+
+    def test_string_encoding(self):
+        self.assertEqual(self.get_matrix('string'), ['001110000011', '000000000000'])
+
+    def test_rle_encoding(self):
+        self.assertEqual(self.get_matrix('rle'), [[[0, 2], [1, 3], [0, 5], [1, 2]], [[0, 12]]])
+
+    def test_bits_encoding(self):
+        self.assertEqual(self.get_matrix('bits'), ['HAw=', 'AAA='])
+
+class InventoryViewTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        suite = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        single = RoomStandard.objects.create(name='Single', price_per_night='80.00')
+        RoomStandard.objects.create(name='Penthouse', price_per_night='900.00')
+        booked_room = Room.objects.create(room_number='201', location='Test Location', room_standard=suite)
+        Room.objects.create(room_number='202', location='Test Location', room_standard=suite)
+        Room.objects.create(room_number='203', location='Test Location', room_standard=suite, is_available=False)
+        Room.objects.create(room_number='101', location='Test Location', room_standard=single)
+        client = Client.objects.create(name='Test Client', email='inventory@example.com')
+        Reservation.objects.create(client=client, room=booked_room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+
+    def test_counts_per_standard(self):
+        data = {'start_date': '2024-04-02', 'end_date': '2024-04-03'}
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(reverse('inventory'), data, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = {standard['name']: (standard['price_per_night'], standard['available_rooms']) for standard in response.data['room_standards']}
+        self.assertEqual(counts, {'Penthouse': ('900.00', 0), 'Single': ('80.00', 1), 'Suite': ('300.00', 1)})
+
+    def test_counts_are_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(get_inventory('2024-04-02', '2024-04-03'))
+
+class StayWindowsViewTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        self.standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        room = Room.objects.create(room_number='201', location='Test Location', room_standard=self.standard)
+        other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=self.standard)
+        Room.objects.create(room_number='203', location='Test Location', room_standard=self.standard, is_available=False)
+        client = Client.objects.create(name='Test Client', email='windows@example.com')
+        Reservation.objects.create(client=client, room=room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+        Reservation.objects.create(client=client, room=other_room, start_date='2024-04-03 12:00:00', end_date='2024-04-04 11:00:00')
+
+    def get_windows(self, **params):
+        data = {'room_standard': self.standard.uuid, 'nights': 2, 'start_date': '2024-04-01', 'end_date': '2024-04-12', **params}
+        headers = {'Authorization': f'Token {self.token}'}
+        return self.client.get(reverse('stay-windows'), data, headers=headers)
+
+    def test_earliest_windows(self):
+        response = self.get_windows(limit=3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        windows = [(str(window['start_date']), [room['room_number'] for room in window['rooms']]) for window in response.data['windows']]
+        self.assertEqual(windows, [('2024-04-01', ['202']), ('2024-04-05', ['202']), ('2024-04-06', ['201', '202'])])
+
+    def test_windows_match_available_rooms_search(self):
+        for window in find_stay_windows(self.standard.uuid, 2, date(2024, 4, 1), date(2024, 4, 12), limit=100):
+            expected = list(get_available_rooms(window['start_date'], window['end_date'], self.standard.uuid).values_list('room_number', flat=True))
+            self.assertEqual([room['room_number'] for room in window['rooms']], expected)
+
+    def test_held_rooms_are_not_free(self):
+        hold_room(Room.objects.get(room_number='202'), '2024-04-01 12:00:00', '2024-04-03 11:00:00')
+        windows = find_stay_windows(self.standard.uuid, 2, date(2024, 4, 1), date(2024, 4, 12), limit=100)
+        self.assertEqual((windows[0]['start_date'], [room['room_number'] for room in windows[0]['rooms']]), (date(2024, 4, 5), ['202']))
+        for window in windows:
+            expected = list(get_available_rooms(window['start_date'], window['end_date'], self.standard.uuid).values_list('room_number', flat=True))
+            self.assertEqual([room['room_number'] for room in window['rooms']], expected)
+
+    def test_search_is_two_queries(self):
+        with self.assertNumQueries(2):
+            find_stay_windows(self.standard.uuid, 2, date(2024, 4, 1), date(2024, 4, 12), limit=5)
+
+    def test_stay_longer_than_horizon(self):
+        response = self.get_windows(nights=20)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['windows'], [])
+
+    def test_missing_nights(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        data = {'room_standard': self.standard.uuid, 'start_date': '2024-04-01', 'end_date': '2024-04-12'}
+        response = self.client.get(reverse('stay-windows'), data, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class QuotesViewTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        self.suite = RoomStandard.objects.create(name='Suite', price_per_night='300.10')
+        self.single = RoomStandard.objects.create(name='Single', price_per_night='80.33')
+
+    def post_quotes(self, quotes):
+        headers = {'Authorization': f'Token {self.token}'}
+        return self.client.post(reverse('quotes'), data={'quotes': quotes}, headers=headers, format='json')
+
+    def test_quotes(self):
+        response = self.post_quotes([
+            {'room_standard': str(self.suite.uuid), 'start_date': '2024-04-01', 'end_date': '2024-04-04'},
+            {'room_standard': str(self.single.uuid), 'start_date': '2024-04-01', 'end_date': '2024-04-08'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(quote['nights'], quote['total']) for quote in response.data['quotes']], [(3, '900.30'), (7, '562.31')])
+
+    def test_unknown_room_standard(self):
+        response = self.post_quotes([{'room_standard': '00000000-0000-0000-0000-000000000000', 'start_date': '2024-04-01', 'end_date': '2024-04-04'}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['quotes'][0]['error'], 'Room standard not found.')
+        self.assertIsNone(response.data['quotes'][0]['total'])
+
+    def test_catalog_is_cached_and_invalidated(self):
+        quotes = [{'room_standard': str(self.suite.uuid), 'start_date': '2024-04-01', 'end_date': '2024-04-02'}]
+        self.post_quotes(quotes)
+        with self.assertNumQueries(0):
+            get_price_catalog()
+
+        self.suite.price_per_night = '310.00'
+        self.suite.save()
+        response = self.post_quotes(quotes)
+        self.assertEqual(response.data['quotes'][0]['total'], '310.00')
+
+    def test_invalid_stay(self):
+        response = self.post_quotes([{'room_standard': str(self.suite.uuid), 'start_date': '2024-04-04', 'end_date': '2024-04-01'}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class BulkReservationViewTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        self.other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=standard)
+        self.client_object = Client.objects.create(name='Test Client', email='bulk@example.com')
+        Reservation.objects.create(client=self.client_object, room=self.room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+
+    def row(self, room, start_date, end_date):
+        return {'client': str(self.client_object.uuid), 'room': str(room.uuid), 'start_date': start_date, 'end_date': end_date}
+
+    def post_rows(self, rows):
+        headers = {'Authorization': f'Token {self.token}'}
+        return self.client.post(reverse('reservation-bulk'), data={'reservations': rows}, headers=headers, format='json')
+
+    def test_create_batch(self):
+        response = self.post_rows([
+            self.row(self.room, '2024-04-05 12:00:00', '2024-04-07 11:00:00'),
+            self.row(self.other_room, '2024-04-01 12:00:00', '2024-04-03 11:00:00'),
+            self.row(self.other_room, '2024-04-03 12:00:00', '2024-04-04 11:00:00'),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(Reservation.objects.count(), 4)
+        self.assertEqual(RoomOccupancy.objects.filter(room=self.other_room).count(), 5)
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_create_batch_msgpack(self):
+        body = msgpack.packb({'reservations': [
+            self.row(self.other_room, '2024-04-01 12:00:00', '2024-04-03 11:00:00'),
+            self.row(self.other_room, '2024-04-03 12:00:00', '2024-04-04 11:00:00'),
+        ]})
+        headers = {'Authorization': f'Token {self.token}', 'Accept': 'application/msgpack'}
+        response = self.client.post(reverse('reservation-bulk'), data=body, content_type='application/msgpack', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        created = msgpack.unpackb(response.content)
+        self.assertEqual({row['uuid'] for row in created}, {str(reservation.uuid) for reservation in Reservation.objects.filter(room=self.other_room)})
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_invalid_msgpack_body(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.post(reverse('reservation-bulk'), data=b'\xc1', content_type='application/msgpack', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_conflicts_are_reported_per_row(self):
+        response = self.post_rows([
+            self.row(self.other_room, '2024-04-01 12:00:00', '2024-04-03 11:00:00'),
+            self.row(self.room, '2024-04-04 12:00:00', '2024-04-06 11:00:00'),
+            self.row(self.other_room, '2024-04-02 12:00:00', '2024-04-04 11:00:00'),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(sorted(response.data['reservations']), [1, 2])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_unknown_room(self):
+        row = self.row(self.room, '2024-05-01 12:00:00', '2024-05-02 11:00:00')
+        row['room'] = '00000000-0000-0000-0000-000000000000'
+        response = self.post_rows([row])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('room', response.data['reservations'][0])
+
+    def test_checks_are_set_based(self):
+        rows = [self.row(self.other_room, f'2024-05-{day:02d} 12:00:00', f'2024-05-{day + 1:02d} 11:00:00') for day in range(1, 21)]
+        serializer = BulkReservationSerializer(data={'reservations': rows})
+        self.assertTrue(serializer.is_valid())
+        with self.assertNumQueries(3):
+            self.assertEqual(check_reservations(serializer.validated_data['reservations']), {})
+
+class ConcurrentBookingTests(TransactionTestCase):
+    def setUp(self):
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        self.client_object = Client.objects.create(name='Test Client', email='concurrent@example.com')
+
+    def test_only_one_concurrent_booking_wins(self):
+        barrier = threading.Barrier(2)
+        outcomes = []
+
+        def book():
+            serializer = ReservationSerializer(data={'client': self.client_object.pk, 'room': self.room.pk, 'start_date': '2024-04-01 12:00:00', 'end_date': '2024-04-05 11:00:00'})
+            serializer.is_valid(raise_exception=True)
+            barrier.wait()
+            try:
+                book_room(serializer)
+                outcomes.append('booked')
+            except RoomAlreadyBooked:
+                outcomes.append('conflict')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(outcomes), ['booked', 'conflict'])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_concurrent_batches_are_checked_under_the_room_lock(self):
+        barrier = threading.Barrier(2)
+        outcomes = []
+
+        def create(start_date, end_date):
+            rows = [{'client': self.client_object.pk, 'room': self.room.pk, 'start_date': start_date, 'end_date': end_date}]
+            barrier.wait()
+            try:
+                with transaction.atomic():
+                    lock_rooms([self.room.pk])
+                    if check_reservations(rows):
+                        outcomes.append('conflict')
+                        return
+                    create_reservations(rows)
+                    outcomes.append('created')
+            except IntegrityError:
+                outcomes.append('integrity error')
+            finally:
+                connection.close()
+
+        # The stays overlap across a month boundary, which partition-local constraints would miss.
+        threads = [
+            threading.Thread(target=create, args=('2024-01-30 12:00:00', '2024-02-02 10:00:00')),
+            threading.Thread(target=create, args=('2024-02-01 12:00:00', '2024-02-03 10:00:00')),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(outcomes), ['conflict', 'created'])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+class OverlapMigrationTests(TransactionTestCase):
+    before = [('reservations', '0002_roomoccupancy')]
+    after = [('reservations', '0003_reservation_period')]
+
+    def setUp(self):
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='202', location='Test Location', room_standard=standard)
+        self.client_object = Client.objects.create(name='Test Client', email='migration@example.com')
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_overlapping_stays_are_reported(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        OldReservation = executor.loader.project_state(self.before).apps.get_model('reservations', 'Reservation')
+        stays = [(datetime(2024, 4, 1, 12), datetime(2024, 4, 5, 11)), (datetime(2024, 4, 4, 12), datetime(2024, 4, 6, 11))]
+        for start, end in stays:
+            OldReservation.objects.create(client_id=self.client_object.pk, room_id=self.room.pk, start_date=timezone.make_aware(start), end_date=timezone.make_aware(end))
+
+        executor = MigrationExecutor(connection)
+        with self.assertRaisesMessage(IntegrityError, f'room {self.room.pk}: '):
+            executor.migrate(self.after)
+
+        OldReservation.objects.filter(start_date=timezone.make_aware(stays[1][0])).delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+class IdempotentReservationTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.token = response.data.get('token', '')
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        client = Client.objects.create(name='Test Client', email='idempotency@example.com')
+        self.data = {'client': str(client.uuid), 'room': str(room.uuid), 'start_date': '2024-04-01 12:00:00', 'end_date': '2024-04-05 11:00:00'}
+
+    def post(self, data, key):
+        headers = {'Authorization': f'Token {self.token}', 'Idempotency-Key': key}
+        return self.client.post(reverse('reservation-list'), data=data, headers=headers, format='json')
+
+    def test_retry_replays_first_response(self):
+        first = self.post(self.data, 'reservation-retry')
+        retry = self.post(self.data, 'reservation-retry')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data['uuid'], first.data['uuid'])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_key_reused_for_different_request(self):
+        self.post(self.data, 'reservation-reused')
+        response = self.post({**self.data, 'end_date': '2024-04-06 11:00:00'}, 'reservation-reused')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_retry_of_request_in_flight(self):
+        cache.set(f'idempotency:{self.employee.pk}:{reverse("reservation-list")}:reservation-in-flight', IN_FLIGHT)
+        response = self.post(self.data, 'reservation-in-flight')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Reservation.objects.count(), 0)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_failing_cache_add_times_out(self):
+        with mock.patch.object(cache, 'add', return_value=False), mock.patch.object(cache, 'get', return_value=None):
+            response = self.post(self.data, 'reservation-cache-down')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Reservation.objects.count(), 0)
+
+class HoldTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.headers = {'Authorization': f'Token {response.data.get("token", "")}'}
+
+        self.standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=self.standard)
+        self.other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=self.standard)
+        self.client_object = Client.objects.create(name='Test Client', email='holds@example.com')
+        self.stay = {'start_date': '2024-04-01 12:00:00', 'end_date': '2024-04-05 11:00:00'}
+
+    def hold(self, room):
+        return self.client.post(reverse('hold-list'), data={'room': str(room.uuid), **self.stay}, headers=self.headers, format='json')
+
+    def available_rooms(self):
+        data = {'start_date': '2024-04-02', 'end_date': '2024-04-03', 'room_standard': self.standard.uuid}
+        response = self.client.post(reverse('available-rooms'), data=data, headers=self.headers, format='json')
+        return [room['room_number'] for room in response.data['available_rooms']]
+
+    def test_held_room_is_not_available(self):
+        self.assertEqual(self.available_rooms(), ['201', '202'])
+        response = self.hold(self.room)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.available_rooms(), ['202'])
+        self.assertEqual(Reservation.objects.count(), 0)
+
+    def test_held_room_cannot_be_held_or_booked(self):
+        self.hold(self.room)
+        self.assertEqual(self.hold(self.room).status_code, status.HTTP_409_CONFLICT)
+        reservation_data = {'client': str(self.client_object.uuid), 'room': str(self.room.uuid), **self.stay}
+        response = self.client.post(reverse('reservation-list'), data=reservation_data, headers=self.headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_confirm_hold(self):
+        hold_uuid = self.hold(self.room).data['uuid']
+        url = reverse('hold-confirm', kwargs={'uuid': hold_uuid})
+        response = self.client.post(url, data={'client': str(self.client_object.uuid)}, headers=self.headers, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['room'], self.room.uuid)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+        response = self.client.get(reverse('hold-detail', kwargs={'uuid': hold_uuid}), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_release_hold(self):
+        hold_uuid = self.hold(self.room).data['uuid']
+        response = self.client.delete(reverse('hold-detail', kwargs={'uuid': hold_uuid}), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.available_rooms(), ['201', '202'])
+
+    def test_expired_holds_are_ignored_and_swept(self):
+        self.hold(self.room)
+        later = timezone.now() + timedelta(seconds=settings.HOLD_TTL + 1)
+        with mock.patch('reservations.holds.timezone.now', return_value=later):
+            self.assertEqual(list(get_available_rooms('2024-04-02', '2024-04-03', self.standard.uuid)), [self.room, self.other_room])
+            self.assertEqual(sweep_holds(), {self.standard.uuid})
+            self.assertEqual(sweep_holds(), set())
+
+class ReservationFilterTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.headers = {'Authorization': f'Token {response.data.get("token", "")}'}
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='201', location='Test Location', room_standard=standard)
+        other_room = Room.objects.create(room_number='202', location='Test Location', room_standard=standard)
+        self.client_object = Client.objects.create(name='Test Client', email='filters@example.com')
+        other_client = Client.objects.create(name='Other Client', email='other-filters@example.com')
+        self.first = Reservation.objects.create(client=self.client_object, room=self.room, start_date='2024-04-01 12:00:00', end_date='2024-04-05 11:00:00')
+        self.second = Reservation.objects.create(client=other_client, room=self.room, start_date='2024-04-10 12:00:00', end_date='2024-04-12 11:00:00')
+        self.third = Reservation.objects.create(client=self.client_object, room=other_room, start_date='2024-04-04 12:00:00', end_date='2024-04-10 11:00:00')
+
+    def list_reservations(self, **filters):
+        response = self.client.get(reverse('reservation-list'), filters, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [reservation['uuid'] for reservation in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.list_reservations(room=self.room.uuid), [str(self.first.uuid), str(self.second.uuid)])
+        self.assertEqual(self.list_reservations(client=self.client_object.uuid), [str(self.first.uuid), str(self.third.uuid)])
+        self.assertEqual(self.list_reservations(start_date='2024-04-05', end_date='2024-04-10'), [str(self.first.uuid), str(self.third.uuid)])
+        self.assertEqual(self.list_reservations(start_date='2024-04-11'), [str(self.second.uuid)])
+        self.assertEqual(self.list_reservations(arriving='2024-04-04'), [str(self.third.uuid)])
+        self.assertEqual(self.list_reservations(departing='2024-04-10', room=self.room.uuid), [])
+
+    def test_invalid_window(self):
+        response = self.client.get(reverse('reservation-list'), {'start_date': '2024-04-05', 'end_date': '2024-04-01'}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filters_are_index_served(self):
+        # Enough rows for the planner statistics to favour the composite indexes.
+        standard = self.room.room_standard
+        rooms = Room.objects.bulk_create(Room(room_number=str(300 + number), location='Test Location', room_standard=standard) for number in range(100))
+        clients = Client.objects.bulk_create(Client(name=f'Client {number}', email=f'client{number}@example.com') for number in range(100))
+        first_day = timezone.make_aware(datetime(2025, 1, 1, 12))
+        Reservation.objects.bulk_create(
+            Reservation(client=clients[number % 100], room=rooms[number % 100], start_date=first_day + timedelta(days=number // 100), end_date=first_day + timedelta(days=number // 100, hours=20))
+            for number in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Reservation._meta.db_table}')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        view = ReservationListView()
+        cases = [
+            ({'room': rooms[0].uuid}, 'reservations_room_start'),
+            ({'client': clients[0].uuid}, 'reservations_client_start'),
+            ({'start_date': date(2024, 4, 5), 'end_date': date(2024, 4, 10)}, 'reservations_no_overlapping_stays'),
+            ({'arriving': date(2024, 4, 4)}, 'reservations_start_uuid'),
+            ({'departing': date(2024, 4, 10)}, 'reservations_end_date'),
+        ]
+        for filters, index in cases:
+            plan = view.filter_reservations(Reservation.objects.all(), filters).order_by('start_date')[:10].explain()
+            self.assertIn(index, plan, filters)
+
+class PagedReservationsTestCase(APITestCase):
+    """
+    Fixture of 25 reservations spread over five rooms, with five reservations per start date.
+    """
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.headers = {'Authorization': f'Token {response.data.get("token", "")}'}
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        rooms = Room.objects.bulk_create(Room(room_number=str(200 + number), location='Test Location', room_standard=standard) for number in range(5))
+        client = Client.objects.create(name='Test Client', email='keyset@example.com')
+        first_day = timezone.make_aware(datetime(2024, 4, 1, 12))
+        # Five reservations share every start date, so pages split rows with equal sort keys.
+        Reservation.objects.bulk_create(
+            Reservation(client=client, room=rooms[number % 5], start_date=first_day + timedelta(days=number // 5), end_date=first_day + timedelta(days=number // 5, hours=20))
+            for number in range(25)
+        )
+
+
+class KeysetPaginationTests(PagedReservationsTestCase):
+    def test_cursor_walks_every_row_once(self):
+        url = f"{reverse('reservation-list')}?pagination=cursor&page_size=10"
+        seen = []
+        while url:
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(reservation['uuid'] for reservation in response.data['results'])
+            url = response.data['next']
+        expected = [str(uuid) for uuid in Reservation.objects.order_by('start_date', 'uuid').values_list('uuid', flat=True)]
+        self.assertEqual(seen, expected)
+
+    def test_cursor_combines_with_filters(self):
+        room = Room.objects.get(room_number='201')
+        response = self.client.get(reverse('reservation-list'), {'pagination': 'cursor', 'page_size': 3, 'room': room.uuid}, headers=self.headers)
+        self.assertEqual(len(response.data['results']), 3)
+        response = self.client.get(response.data['next'], headers=self.headers)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('reservation-list'), {'pagination': 'cursor', 'cursor': 'not-a-cursor'}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_pages_take_the_size_of_the_view_pagination(self):
+        with mock.patch.object(ReservationListView, 'pagination_class', StandardResultsSetPagination):
+            response = self.client.get(reverse('reservation-list'), {'pagination': 'cursor'}, headers=self.headers)
+        self.assertEqual(len(response.data['results']), 25)
+
+
+class CountModeTests(PagedReservationsTestCase):
+    def get_page(self, **params):
+        response = self.client.get(reverse('reservation-list'), {'page_size': 10, **params}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_exact_count_is_the_default(self):
+        data = self.get_page()
+        self.assertEqual((data['count'], data['total_pages']), (25, 3))
+        self.assertNotIn('count_mode', data)
+
+    def test_no_count(self):
+        data = self.get_page(count='none')
+        self.assertEqual((data['count'], data['total_pages'], data['count_mode']), (None, None, 'none'))
+        self.assertEqual(len(data['results']), 10)
+        self.assertIsNotNone(data['next'])
+
+    def test_last_page_reports_exact_count(self):
+        data = self.get_page(count='none', page=3)
+        self.assertEqual((data['count'], data['total_pages']), (25, 3))
+        self.assertIsNone(data['next'])
+        self.assertEqual(len(data['results']), 5)
+
+    def test_capped_count(self):
+        with mock.patch('utils.paginators.BaseResultsSetPagination.count_cap', 20):
+            data = self.get_page(count='capped')
+        self.assertEqual((data['count'], data['total_pages']), ('20+', None))
+        with mock.patch('utils.paginators.BaseResultsSetPagination.count_cap', 30):
+            data = self.get_page(count='capped')
+        self.assertEqual((data['count'], data['total_pages']), (25, 3))
+
+    def test_estimated_count(self):
+        data = self.get_page(count='estimate')
+        self.assertIsInstance(data['count'], int)
+        self.assertGreaterEqual(data['count'], 11)
+
+    def test_page_past_the_end(self):
+        response = self.client.get(reverse('reservation-list'), {'page_size': 10, 'count': 'none', 'page': 4}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PartitionReservationsTests(TestCase):
+    def setUp(self):
+        standard = RoomStandard.objects.create(name='Standard', price_per_night='100.00')
+        self.room = Room.objects.create(room_number='101', location='Test Location', room_standard=standard)
+        self.client_obj = Client.objects.create(name='Test Client', email='partition@example.com')
+        self.now = timezone.make_aware(datetime(2024, 6, 15, 12))
+        for month in (1, 3, 6, 7):
+            self.reserve(datetime(2024, month, 10, 12), datetime(2024, month, 12, 10))
+
+    def reserve(self, start, end):
+        return Reservation.objects.create(client=self.client_obj, room=self.room, start_date=timezone.make_aware(start), end_date=timezone.make_aware(end))
+
+    def partition(self, *args):
+        with mock.patch('django.utils.timezone.now', return_value=self.now):
+            call_command('partition_reservations', *args, stdout=StringIO())
+
+    def partitions(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'reservations_reservation'::regclass ORDER BY 1")
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_convert_copies_rows_into_monthly_partitions(self):
+        self.partition('--convert', '--months-ahead', '2')
+        self.assertEqual(Reservation.objects.count(), 4)
+        self.assertEqual(self.partitions(), [
+            'reservations_reservation_default',
+            *(f'reservations_reservation_y2024m{month:02d}' for month in range(1, 9)),
+        ])
+        self.assertEqual(get_available_rooms(date(2024, 3, 11), date(2024, 3, 12), self.room.room_standard_id).count(), 0)
+
+    def test_availability_prunes_later_partitions(self):
+        self.partition('--convert', '--months-ahead', '2')
+        plan = get_available_rooms(date(2024, 1, 11), date(2024, 1, 12), self.room.room_standard_id).explain()
+        self.assertIn('reservations_reservation_y2024m01', plan)
+        self.assertNotIn('reservations_reservation_y2024m07', plan)
+
+    def test_overlap_is_rejected_within_a_partition(self):
+        self.partition('--convert')
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            self.reserve(datetime(2024, 6, 11, 12), datetime(2024, 6, 13, 10))
+        self.assertTrue(is_overlap_violation(raised.exception))
+
+    def test_overlap_is_rejected_across_partitions(self):
+        self.partition('--convert')
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            self.reserve(datetime(2024, 6, 28, 12), datetime(2024, 7, 11, 10))
+        self.assertTrue(is_overlap_violation(raised.exception))
+        reservation = self.reserve(datetime(2024, 6, 28, 12), datetime(2024, 7, 1, 10))
+        reservation.end_date = timezone.make_aware(datetime(2024, 7, 10, 13))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            reservation.save()
+
+    def test_new_partition_takes_rows_from_the_default_partition(self):
+        self.partition('--convert', '--months-ahead', '1')
+        reservation = self.reserve(datetime(2024, 9, 1, 12), datetime(2024, 9, 3, 10))
+        self.partition('--months-ahead', '3')
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT uuid FROM reservations_reservation_y2024m09')
+            self.assertEqual(cursor.fetchall(), [(reservation.uuid,)])
+            cursor.execute('SELECT count(*) FROM reservations_reservation_default')
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_new_partition_keeps_an_empty_default_partition_attached(self):
+        self.partition('--convert', '--months-ahead', '1')
+        with CaptureQueriesContext(connection) as queries:
+            self.partition('--months-ahead', '3')
+        self.assertIn('reservations_reservation_y2024m09', self.partitions())
+        self.assertFalse(any('DETACH PARTITION' in query['sql'] for query in queries))
+
+    def test_archive_keeps_partitions_with_stays_in_progress(self):
+        room = Room.objects.create(room_number='102', location='Test Location', room_standard=self.room.room_standard)
+        Reservation.objects.create(client=self.client_obj, room=room, start_date=timezone.make_aware(datetime(2024, 1, 20, 12)), end_date=timezone.make_aware(datetime(2024, 7, 1, 10)))
+        self.partition('--convert', '--archive-older-than', '3')
+        self.assertIn('reservations_reservation_y2024m01', self.partitions())
+        self.assertEqual(Reservation.objects.count(), 5)
+
+    def test_archive_detaches_old_partitions(self):
+        self.partition('--convert', '--archive-older-than', '3')
+        self.assertNotIn('reservations_reservation_y2024m01', self.partitions())
+        self.assertIn('reservations_reservation_y2024m03', self.partitions())
+        self.assertEqual(Reservation.objects.count(), 3)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM reservations_reservation_archive_y2024m01')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_requires_conversion(self):
+        with self.assertRaises(CommandError):
+            self.partition()
+
+
+class ReservationExportTests(APITestCase):
+    def setUp(self):
+        self.employee = Employee.objects.create_user(username='test_employee', password='test_password')
+        group = Group.objects.create(name='IT')
+        self.employee.groups.add(group)
+
+        data = {'username': 'test_employee', 'password': 'test_password'}
+        response = self.client.post(reverse('login'), data=data, format='json')
+        self.headers = {'Authorization': f'Token {response.data.get("token", "")}'}
+
+        standard = RoomStandard.objects.create(name='Suite', price_per_night='300.00')
+        self.room = Room.objects.create(room_number='301', location='Test Location', room_standard=standard)
+        self.client_obj = Client.objects.create(name='Export, Client', email='export@example.com')
+        first_day = timezone.make_aware(datetime(2024, 4, 1, 12))
+        self.reservations = [
+            Reservation.objects.create(client=self.client_obj, room=self.room, start_date=first_day + timedelta(days=3 * number), end_date=first_day + timedelta(days=3 * number + 2))
+            for number in range(5)
+        ]
+
+    def export(self, **params):
+        response = self.client.get(reverse('reservation-export'), params, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_format_from_accept_header(self):
+        response = self.client.get(reverse('reservation-export'), headers={**self.headers, 'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 5)
+        response = self.client.get(reverse('reservation-export'), {'output': 'ndjson'}, headers={**self.headers, 'Accept': 'text/csv'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        response = self.client.get(reverse('reservation-export'), {'room': 'not-a-uuid'}, headers={**self.headers, 'Accept': 'text/csv'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('room', json.loads(response.content))
+
+    def test_export_unauthenticated(self):
+        response = self.client.get(reverse('reservation-export'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_csv_export(self):
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = content.splitlines()
+        self.assertEqual(lines[0], 'uuid,start_date,end_date,room,room_number,room_standard,client,client_name,client_email')
+        self.assertEqual(len(lines), 6)
+        expected = ReservationSerializer(self.reservations[0]).data
+        self.assertEqual(lines[1], f'{expected["uuid"]},{expected["start_date"]},{expected["end_date"]},{self.room.uuid},301,Suite,{self.client_obj.uuid},"Export, Client",export@example.com')
+
+    def test_ndjson_export_with_date_window(self):
+        response, content = self.export(output='ndjson', start_date='2024-04-04', end_date='2024-04-10')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['uuid'] for row in rows], [str(reservation.uuid) for reservation in self.reservations[1:3]])
+        self.assertEqual(rows[0]['client_name'], 'Export, Client')
+
+    def test_invalid_output(self):
+        response = self.client.get(reverse('reservation-export'), {'output': 'xml'}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_is_written_in_chunks(self):
+        chunks = list(export_csv(Reservation.objects.order_by('start_date'), chunk_size=2))
+        self.assertEqual([chunk.count('\n') for chunk in chunks], [1, 2, 2, 1])
+
+
+class ImportDataTests(TestCase):
+    def setUp(self):
+        self.standard = RoomStandard.objects.create(name='Standard', price_per_night='100.00')
+        self.room = Room.objects.create(room_number='101', location='Test Location', room_standard=self.standard)
+        self.client_obj = Client.objects.create(name='Existing Client', email='existing@example.com')
+
+    def import_data(self, model, suffix, content, *args):
+        with tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_data', model, file.name, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_clients_from_csv(self):
+        content = 'name,email\nAnna,anna@example.com\nDuplicate,existing@example.com\nBob,not-an-email\nCarl,carl@example.com\nCarl Again,carl@example.com\n'
+        stdout, stderr = self.import_data('clients', '.csv', content, '--batch-size', '2')
+        self.assertIn('Imported 2 clients and rejected 3', stdout)
+        self.assertEqual(sorted(Client.objects.values_list('email', flat=True)), ['anna@example.com', 'carl@example.com', 'existing@example.com'])
+        self.assertEqual([line.split(':')[0] for line in stderr.splitlines()], ['Row 2', 'Row 3', 'Row 5'])
+
+    def test_email_of_a_row_rejected_by_the_database_stays_free(self):
+        importer = ClientImporter()
+        rows = [{'uuid': str(self.client_obj.uuid), 'name': 'Clash', 'email': 'clash@example.com'}]
+        self.assertEqual(importer.import_batch(rows), (0, {0: {'non_field_errors': [REJECTED_BY_DATABASE]}}))
+        self.assertEqual(importer.import_batch([{'name': 'Clash', 'email': 'clash@example.com'}]), (1, {}))
+        self.assertTrue(Client.objects.filter(email='clash@example.com').exists())
+
+    def test_import_rooms_resolves_standard_by_name(self):
+        content = '{"room_number": "102", "location": "First floor", "room_standard": "Standard"}\n{"room_number": "103", "location": "First floor", "room_standard": "Missing"}\n'
+        stdout, _ = self.import_data('rooms', '.ndjson', content)
+        self.assertIn('Imported 1 rooms and rejected 1', stdout)
+        room = Room.objects.get(room_number='102')
+        self.assertEqual((room.room_standard, room.is_available), (self.standard, True))
+
+    def test_import_reservations(self):
+        rows = [
+            {'client': 'existing@example.com', 'room': '101', 'start_date': '2024-05-01T12:00:00', 'end_date': '2024-05-03T10:00:00'},
+            {'client': str(self.client_obj.uuid), 'room': str(self.room.uuid), 'start_date': '2024-05-02T12:00:00', 'end_date': '2024-05-04T10:00:00'},
+            {'client': 'missing@example.com', 'room': '101', 'start_date': '2024-06-01T12:00:00', 'end_date': '2024-06-03T10:00:00'},
+            {'client': 'existing@example.com', 'room': '101', 'start_date': '2024-06-05T12:00:00', 'end_date': '2024-06-04T10:00:00'},
+        ]
+        stdout, stderr = self.import_data('reservations', '.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+        self.assertIn('Imported 1 reservations and rejected 3', stdout)
+        reservation = Reservation.objects.get()
+        self.assertEqual(reservation.start_date, timezone.make_aware(datetime(2024, 5, 1, 12)))
+        self.assertEqual(RoomOccupancy.objects.filter(reservation=reservation).count(), 3)
+        self.assertIn('Row 2', stderr)
+        self.assertIn(BATCH_CONFLICT, stderr)
+
+    def test_unknown_format(self):
+        with self.assertRaises(CommandError):
+            self.import_data('clients', '.txt', '')
+
+
+class ExpandReservationTests(PagedReservationsTestCase):
+    def test_expand_costs_constant_queries(self):
+        url = reverse('reservation-list')
+        params = {'expand': 'room,client,room.room_standard', 'page_size': 5}
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(url, params, headers=self.headers)
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(url, {**params, 'page_size': 25}, headers=self.headers)
+        self.assertEqual(len(large_page), len(small_page))
+        reservation = response.data['results'][0]
+        self.assertEqual(reservation['client']['name'], 'Test Client')
+        self.assertEqual(reservation['room']['room_standard']['name'], 'Suite')
+
+    def test_expand_detail(self):
+        reservation = Reservation.objects.first()
+        response = self.client.get(reverse('reservation-detail', args=[reservation.uuid]), {'expand': 'client'}, headers=self.headers)
+        self.assertEqual(response.data['client']['email'], 'keyset@example.com')
+        self.assertEqual(response.data['room'], reservation.room_id)
+
+    def test_expanded_etag_follows_related_objects(self):
+        reservation = Reservation.objects.first()
+        url = reverse('reservation-detail', args=[reservation.uuid])
+        etag = self.client.get(url, {'expand': 'room'}, headers=self.headers)['ETag']
+        plain_etag = self.client.get(url, headers=self.headers)['ETag']
+        self.assertNotEqual(etag, plain_etag)
+        response = self.client.get(url, {'expand': 'room'}, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        room = reservation.room
+        room.location = 'Moved'
+        room.save()
+        response = self.client.get(url, {'expand': 'room'}, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['room']['location'], 'Moved')
+        response = self.client.get(url, headers={**self.headers, 'If-None-Match': plain_etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_collection_etag_follows_late_commits(self):
+        url = reverse('reservation-list')
+        etag = self.client.get(url, headers={**self.headers, 'If-None-Match': '""'})['ETag']
+        # A save stamped before the latest updated_at but committed after it.
+        Reservation.objects.filter(pk=Reservation.objects.order_by('updated_at').first().pk).update(version=F('version') + 1)
+        response = self.client.get(url, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_collection_etag_skips_cursor_pages(self):
+        url = reverse('reservation-list')
+        headers = {**self.headers, 'If-None-Match': '""'}
+        for params in [{'pagination': 'cursor'}, {'count': 'none'}, {}]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params, headers=headers if params else self.headers)
+            self.assertNotIn('ETag', response)
+            self.assertFalse([query for query in queries if 'SUM(' in query['sql']])
+
+    def test_update_if_match(self):
+        reservation = Reservation.objects.first()
+        url = reverse('reservation-detail', args=[reservation.uuid])
+        etag = self.client.get(url, headers=self.headers)['ETag']
+        data = {'end_date': reservation.end_date - timedelta(hours=1)}
+        response = self.client.patch(url, data, headers={**self.headers, 'If-Match': etag}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"2-'))
+        new_etag = response['ETag']
+        response = self.client.patch(url, data, headers={**self.headers, 'If-Match': etag}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.patch(url, data, headers={**self.headers, 'If-Match': new_etag}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_sparse_fields_with_cursor_pagination(self):
+        url = reverse('reservation-list')
+        params = {'fields': 'uuid,room', 'expand': 'room', 'pagination': 'cursor', 'page_size': 10}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, headers=self.headers)
+        self.assertEqual(set(response.data['results'][0]), {'uuid', 'room'})
+        self.assertEqual(response.data['results'][0]['room']['location'], 'Test Location')
+        with CaptureQueriesContext(connection) as next_queries:
+            response = self.client.get(response.data['next'], headers=self.headers)
+        self.assertEqual(len(next_queries), len(queries))
+        self.assertEqual(len(response.data['results']), 10)
+
+
+class ValuesSerializerTests(PagedReservationsTestCase):
+    def test_same_json_as_model_serializer(self):
+        reservations = Reservation.objects.order_by('start_date', 'uuid')
+        for fields in (None, ['uuid', 'end_date', 'room']):
+            values_serializer = ValuesSerializer.for_serializer(ReservationSerializer, fields)
+            expected = ReservationSerializer(reservations, many=True, fields=fields).data
+            self.assertEqual(
+                JSONRenderer().render(values_serializer.serialize(values_serializer.values(reservations))),
+                JSONRenderer().render(expected),
+            )
+
+    def test_list_view_uses_values_rows(self):
+        url = reverse('reservation-list')
+        params = {'pagination': 'cursor', 'page_size': 10}
+        with mock.patch.object(ValuesSerializer, 'for_serializer', return_value=None):
+            expected = [self.client.get(url, params, headers=self.headers)]
+            expected.append(self.client.get(expected[0].data['next'], headers=self.headers))
+        response = self.client.get(url, params, headers=self.headers)
+        self.assertEqual(response.content, expected[0].content)
+        response = self.client.get(response.data['next'], headers=self.headers)
+        self.assertEqual(response.content, expected[1].content)
+
+    def test_plans_are_shared_by_equivalent_field_lists(self):
+        plan = ValuesSerializer.for_serializer(ReservationSerializer, ['uuid', 'room']).plan
+        self.assertIs(ValuesSerializer.for_serializer(ReservationSerializer, ['room', 'uuid', 'room']).plan, plan)
+        response = self.client.get(reverse('reservation-list'), {'fields': 'room,uuid,uuid'}, headers=self.headers)
+        self.assertEqual(list(response.data['results'][0]), ['uuid', 'room'])
+
+    def test_expand_falls_back_to_model_serializer(self):
+        self.assertIsNone(ValuesSerializer.for_serializer(ReservationSerializer, None, ['room']))
+
+
+class FastJSONTests(TestCase):
+    payload = {
+        'uuid': uuid.uuid4(),
+        'price': Decimal('123.45'),
+        'utc': datetime(2024, 4, 1, 12, 30, tzinfo=ZoneInfo('UTC')),
+        'warsaw': datetime(2024, 4, 1, 12, 30, 15, 250, tzinfo=ZoneInfo('Europe/Warsaw')),
+        'day': date(2024, 4, 1),
+        'text': 'Zażółć\u2028gęślą\u2029jaźń "quoted"',
+        'rows': [(1, 2.5, None, True), {'nested': []}],
+    }
+
+    def test_same_output_as_drf(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_falls_back_to_stdlib(self):
+        data = {'big': 2 ** 70, 1: 'integer key'}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        indented = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(self.payload, indented), JSONRenderer().render(self.payload, indented))
+        with mock.patch('utils.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_parse(self):
+        body = FastJSONRenderer().render(self.payload)
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(b'[18446744073709551616]')), [2 ** 64])
+        errors = []
+        for parser in (FastJSONParser(), JSONParser()):
+            with self.assertRaises(ParseError) as context:
+                parser.parse(io.BytesIO(b'{"room": NaN}'))
+            errors.append(str(context.exception.detail))
+        self.assertEqual(errors[0], errors[1])
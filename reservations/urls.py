@@ -1,8 +1,18 @@
 from django.urls import path
-from .views import ReservationListView, ReservationDetailView, AvailableRoomsView
+from .views import ReservationListView, ReservationExportView, BulkReservationView, HoldListView, HoldDetailView, HoldConfirmView, ReservationDetailView, AvailableRoomsView, AvailabilityIndexView, OccupancyMatrixView, InventoryView, StayWindowsView, QuotesView
 
 urlpatterns = [
     path('', ReservationListView.as_view(), name='reservation-list'),
     path('/<uuid:uuid>', ReservationDetailView.as_view(), name='reservation-detail'),
-    path('/available', AvailableRoomsView.as_view(), name='available-rooms')
+    path('/export', ReservationExportView.as_view(), name='reservation-export'),
+    path('/bulk', BulkReservationView.as_view(), name='reservation-bulk'),
+    path('/holds', HoldListView.as_view(), name='hold-list'),
+    path('/holds/<uuid:uuid>', HoldDetailView.as_view(), name='hold-detail'),
+    path('/holds/<uuid:uuid>/confirm', HoldConfirmView.as_view(), name='hold-confirm'),
+    path('/available', AvailableRoomsView.as_view(), name='available-rooms'),
+    path('/inventory', InventoryView.as_view(), name='inventory'),
+    path('/occupancy-matrix', OccupancyMatrixView.as_view(), name='occupancy-matrix'),
+    path('/stay-windows', StayWindowsView.as_view(), name='stay-windows'),
+    path('/quotes', QuotesView.as_view(), name='quotes'),
+    path('/availability-index', AvailabilityIndexView.as_view(), name='availability-index'),
 ]
@@ -1,16 +1,53 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Reservation
-from .serializers import ReservationSerializer, AvailableRoomsSerializer
+from rest_framework.settings import api_settings
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from .models import Reservation, ROOM_ALREADY_BOOKED, day_bounds, is_overlap_violation, to_datetime
+from .serializers import ReservationSerializer, ReservationFilterSerializer, ReservationExportSerializer, BulkReservationSerializer, HoldRequestSerializer, HoldSerializer, HoldConfirmSerializer, AvailableRoomsSerializer, OccupancyMatrixSerializer, DateRangeSerializer, RoomStandardInventorySerializer, StayWindowSearchSerializer, QuoteRequestSerializer, QuoteSerializer
 from utils.permissions import HasGroupPermission
-from rooms.models import Room
+from utils.idempotency import idempotent
+from utils.conditional import collection_etag, lock_if_match, not_modified, object_etag, precondition_failed
 from rooms.serializers import RoomSerializer
-from utils.paginators import SmallResultsSetPagination
+from rooms.catalog import get_price_catalog, quote_stay
+from . import availability
+from .matrix import occupancy_matrix, encode_occupancy
+from .interval_index import interval_index
+from .windows import find_stay_windows
+from .bulk import check_reservations, create_reservations, lock_rooms
+from .export import CSVRenderer, NDJSONRenderer, export_csv, export_ndjson
+from .booking import RoomAlreadyBooked, book_room, confirm_hold, hold_room, release_hold, with_retries
+from .holds import hold_store
+from utils.paginators import SmallResultsSetPagination, get_paginator
+from utils.serializers import expand_queryset, parse_expand, parse_fields, prune_queryset, ValuesSerializer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
-class ReservationListView(APIView):
+class ReservationFilterMixin:
+    """
+    Filtering of reservation querysets shared by the list and export views.
+    """
+    def filter_reservations(self, reservations, filters):
+        """
+        Apply the validated list filters to a reservation queryset.
+        """
+        if 'room' in filters:
+            reservations = reservations.filter(room=filters['room'])
+        if 'client' in filters:
+            reservations = reservations.filter(client=filters['client'])
+        if 'start_date' in filters or 'end_date' in filters:
+            window_start = to_datetime(filters['start_date']) if 'start_date' in filters else None
+            window_end = to_datetime(filters['end_date']) if 'end_date' in filters else None
+            reservations = reservations.filter(period__overlap=DateTimeTZRange(window_start, window_end))
+        if 'arriving' in filters:
+            reservations = reservations.filter(start_date__range=day_bounds(filters['arriving']))
+        if 'departing' in filters:
+            reservations = reservations.filter(end_date__range=day_bounds(filters['departing']))
+        return reservations
+
+class ReservationListView(ReservationFilterMixin, APIView):
     """
     A view to list all reservations or create a new reservation.
     """
@@ -23,23 +60,60 @@ class ReservationListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+            OpenApiParameter(name="room", type=OpenApiTypes.UUID, description='Only reservations of this room.', required=False),
+            OpenApiParameter(name="client", type=OpenApiTypes.UUID, description='Only reservations of this client.', required=False),
+            OpenApiParameter(name="start_date", type=OpenApiTypes.DATE, description='Only reservations overlapping the window starting on this day.', required=False),
+            OpenApiParameter(name="end_date", type=OpenApiTypes.DATE, description='Only reservations overlapping the window ending before this day.', required=False),
+            OpenApiParameter(name="arriving", type=OpenApiTypes.DATE, description='Only reservations starting on this day.', required=False),
+            OpenApiParameter(name="departing", type=OpenApiTypes.DATE, description='Only reservations ending on this day.', required=False),
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "room,client,room.room_standard".', required=False),
         ],
     )
     def get(self, request):
         """
-        Get a list of paginated reservations.
+        Get a list of paginated reservations, optionally filtered.
+
+        Every filter is served by an index: room and client by the composite
+        (room, start_date) and (client, start_date) indexes, the date window by
+        the GiST index of the no-overlapping-stays constraint, and arriving /
+        departing by the (start_date, uuid) and end_date indexes.
 
         Example:
-        http://localhost:8000/reservations?page=2&page_size=20
+        http://localhost:8000/reservations?room=<uuid>&start_date=2024-04-01&end_date=2024-04-08&page=2&page_size=20
         """
-        reservations = Reservation.objects.all().order_by('start_date')
+        filter_serializer = ReservationFilterSerializer(data=request.query_params)
+        if not filter_serializer.is_valid():
+            return Response(filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        reservations = self.filter_reservations(expand_queryset(Reservation.objects.all(), expand), filter_serializer.validated_data).order_by('start_date')
+        reservations = prune_queryset(reservations, fields, expand)
+        paginator = get_paginator(request, self.pagination_class)
+        etag = collection_etag(request, reservations, paginator, self, expand)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
 
-        paginator = self.pagination_class()
-        paginated_reservations = paginator.paginate_queryset(reservations, request)
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields, expand)
+        if values_serializer:
+            reservations = values_serializer.values(reservations)
+
+        paginated_reservations = paginator.paginate_queryset(reservations, request, view=self)
         
-        serializer = self.serializer_class(paginated_reservations, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        if values_serializer:
+            data = values_serializer.serialize(paginated_reservations)
+        else:
+            data = self.serializer_class(paginated_reservations, many=True, expand=expand, fields=fields).data
+        response = paginator.get_paginated_response(data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
 
+    @idempotent
     def post(self, request):
         """
         Create a new reservation.
@@ -52,10 +126,61 @@ class ReservationListView(APIView):
         """
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            try:
+                book_room(serializer)
+            except RoomAlreadyBooked:
+                return Response({'error': ROOM_ALREADY_BOOKED}, status=status.HTTP_409_CONFLICT)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class ReservationExportView(ReservationFilterMixin, APIView):
+    """
+    A view to stream every reservation as CSV or NDJSON.
+    """
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer, NDJSONRenderer]
+    content_types = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="output", type=OpenApiTypes.STR, enum=['csv', 'ndjson'], description='Export format; taken from the Accept header (text/csv or application/x-ndjson) when absent, CSV by default.', required=False),
+            OpenApiParameter(name="room", type=OpenApiTypes.UUID, description='Only reservations of this room.', required=False),
+            OpenApiParameter(name="client", type=OpenApiTypes.UUID, description='Only reservations of this client.', required=False),
+            OpenApiParameter(name="start_date", type=OpenApiTypes.DATE, description='Only reservations overlapping the window starting on this day.', required=False),
+            OpenApiParameter(name="end_date", type=OpenApiTypes.DATE, description='Only reservations overlapping the window ending before this day.', required=False),
+            OpenApiParameter(name="arriving", type=OpenApiTypes.DATE, description='Only reservations starting on this day.', required=False),
+            OpenApiParameter(name="departing", type=OpenApiTypes.DATE, description='Only reservations ending on this day.', required=False),
+        ],
+        responses={(200, 'text/csv'): OpenApiTypes.STR, (200, 'application/x-ndjson'): OpenApiTypes.STR},
+    )
+    def get(self, request):
+        """
+        Stream the reservations matching the list filters, ordered by start date.
+
+        The rows are read through a server-side cursor with room, room standard
+        and client joined in, and written out chunk by chunk, so the export
+        runs in constant memory whatever its size. The "output" parameter picks
+        the format, as "format" is reserved for content negotiation; without it
+        the format follows the Accept header (text/csv or application/x-ndjson).
+
+        Example:
+        http://localhost:8000/reservations/export?output=ndjson&start_date=2024-01-01&end_date=2025-01-01
+        """
+        export_serializer = ReservationExportSerializer(data=request.query_params)
+        if not export_serializer.is_valid():
+            return Response(export_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        filters = export_serializer.validated_data
+        reservations = self.filter_reservations(Reservation.objects.all(), filters).order_by('start_date', 'uuid')
+
+        output = filters['output']
+        if 'output' not in request.query_params and request.accepted_renderer.format in self.content_types:
+            output = request.accepted_renderer.format
+        export = export_csv if output == 'csv' else export_ndjson
+        response = StreamingHttpResponse(export(reservations), content_type=self.content_types[output])
+        response['Content-Disposition'] = f'attachment; filename="reservations.{output}"'
+        return response
+
 class ReservationDetailView(APIView):
     """
     A view to retrieve, update or delete a reservation instance.
@@ -64,20 +189,28 @@ class ReservationDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
 
-    def get_object(self, uuid):
+    def get_object(self, uuid, expand=(), fields=None):
         """
         Retrieve a reservation object by its UUID.
 
         parameters:
          - uuid: The UUID of the reservation to retrieve (string).
+         - expand: Dotted paths of the related objects to load with it (list of strings).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: Reservation object if found, None otherwise.
         """
         try:
-            return Reservation.objects.get(uuid=uuid)
+            return prune_queryset(expand_queryset(Reservation.objects.all(), expand), fields, expand).get(uuid=uuid)
         except Reservation.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "room,client,room.room_standard".', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of a reservation by UUID.
@@ -85,15 +218,22 @@ class ReservationDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the reservation to retrieve (string).
         """
-        reservation = self.get_object(uuid)
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        reservation = self.get_object(uuid, expand, fields=fields)
         if reservation:
-            serializer = self.serializer_class(reservation)
-            return Response(serializer.data)
+            etag = object_etag(request, reservation, expand)
+            not_modified_response = not_modified(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+            serializer = self.serializer_class(reservation, expand=expand, fields=fields)
+            return Response(serializer.data, headers={'ETag': etag})
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def patch(self, request, uuid):
         """
         Update a reservation instance partially.
+        With an If-Match header holding its ETag, the update fails with 412 if it changed since it was fetched.
 
         Possible parameters in the request:
         - client: The UUID of the client (string).
@@ -103,13 +243,31 @@ class ReservationDetailView(APIView):
         """
         reservation = self.get_object(uuid)
         if reservation:
-            serializer = self.serializer_class(reservation, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            if 'If-Match' in request.headers:
+                # The locks of the precondition check are held in one transaction, which is retried as a whole.
+                return with_retries(self.update_if_match, request, reservation)
+            return self.update(request, reservation)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
+    def update_if_match(self, request, reservation):
+        with transaction.atomic():
+            # The room is locked before the reservation, in the order book_room takes them.
+            lock_rooms([reservation.room_id])
+            reservation = lock_if_match(request, reservation)
+            if reservation is None:
+                return precondition_failed()
+            return self.update(request, reservation)
+
+    def update(self, request, reservation):
+        serializer = self.serializer_class(reservation, data=request.data, partial=True)
+        if serializer.is_valid():
+            try:
+                book_room(serializer)
+            except RoomAlreadyBooked:
+                return Response({'error': ROOM_ALREADY_BOOKED}, status=status.HTTP_409_CONFLICT)
+            return Response(serializer.data, headers={'ETag': object_etag(request, reservation)})
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     def delete(self, request, uuid):
         """
         Delete a reservation by UUID.
@@ -123,6 +281,140 @@ class ReservationDetailView(APIView):
             return Response(status=status.HTTP_204_NO_CONTENT)
         return Response(status=status.HTTP_404_NOT_FOUND)
     
+class BulkReservationView(APIView):
+    """
+    A view to create many reservations in one request.
+    """
+    serializer_class = BulkReservationSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(responses=ReservationSerializer(many=True))
+    @idempotent
+    def post(self, request):
+        """
+        Create a batch of reservations, all or nothing.
+
+        Required parameters in the request:
+        - reservations: List of reservations (at most 1000), each with:
+          - client: The UUID of the client for the reservation (string).
+          - room: The UUID of the room for the reservation (string).
+          - start_date: The start date and time of the reservation (datetime, format: YYYY-MM-DDThh:mm:ss).
+          - end_date: The end date and time of the reservation (datetime, format: YYYY-MM-DDThh:mm:ss).
+
+        If any row is invalid or overlaps an existing reservation or another
+        row of the batch, nothing is created and the errors are returned per
+        row position.
+        """
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = serializer.validated_data['reservations']
+        try:
+            with transaction.atomic():
+                lock_rooms(row['room'] for row in rows)
+                errors = check_reservations(rows)
+                if errors:
+                    return Response({'reservations': errors}, status=status.HTTP_400_BAD_REQUEST)
+                reservations = create_reservations(rows)
+        except IntegrityError as error:
+            if not is_overlap_violation(error):
+                raise
+            return Response({'error': ROOM_ALREADY_BOOKED}, status=status.HTTP_409_CONFLICT)
+        return Response(ReservationSerializer(reservations, many=True).data, status=status.HTTP_201_CREATED)
+
+class HoldListView(APIView):
+    """
+    A view to place a tentative hold on a room.
+    """
+    serializer_class = HoldRequestSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(responses=HoldSerializer)
+    def post(self, request):
+        """
+        Hold a room for a few minutes without creating a reservation.
+
+        Required parameters in the request:
+        - room: The UUID of the room to hold (string).
+        - start_date: The start date and time of the stay (datetime, format: YYYY-MM-DDThh:mm:ss).
+        - end_date: The end date and time of the stay (datetime, format: YYYY-MM-DDThh:mm:ss).
+
+        The held room is treated as occupied until the hold expires, is released or is confirmed.
+        """
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            hold = hold_room(**serializer.validated_data)
+        except RoomAlreadyBooked:
+            return Response({'error': ROOM_ALREADY_BOOKED}, status=status.HTTP_409_CONFLICT)
+        return Response(HoldSerializer(hold).data, status=status.HTTP_201_CREATED)
+
+class HoldDetailView(APIView):
+    """
+    A view to retrieve or release a hold.
+    """
+    serializer_class = HoldSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    def get(self, request, uuid):
+        """
+        Get an active hold.
+        """
+        hold = hold_store.get(uuid)
+        if hold:
+            return Response(self.serializer_class(hold).data)
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    def delete(self, request, uuid):
+        """
+        Release a hold before it expires.
+        """
+        if release_hold(uuid):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+class HoldConfirmView(APIView):
+    """
+    A view to turn a hold into a reservation.
+    """
+    serializer_class = HoldConfirmSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(responses=ReservationSerializer)
+    def post(self, request, uuid):
+        """
+        Create the reservation of a held room and release the hold.
+
+        Required parameters in the request:
+        - client: The UUID of the client for the reservation (string).
+        """
+        hold = hold_store.get(uuid)
+        if not hold:
+            return Response({'error': 'The hold does not exist or has expired.'}, status=status.HTTP_404_NOT_FOUND)
+
+        confirm_serializer = self.serializer_class(data=request.data)
+        if not confirm_serializer.is_valid():
+            return Response(confirm_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = ReservationSerializer(data={
+            'client': confirm_serializer.validated_data['client'].pk,
+            'room': hold['room'],
+            'start_date': hold['start_date'],
+            'end_date': hold['end_date'],
+        })
+        serializer.is_valid(raise_exception=True)
+        try:
+            confirm_hold(serializer, hold)
+        except RoomAlreadyBooked:
+            return Response({'error': ROOM_ALREADY_BOOKED}, status=status.HTTP_409_CONFLICT)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 class AvailableRoomsView(APIView):
     """
     A view to retrieve available rooms for a given date range.
@@ -152,12 +444,193 @@ class AvailableRoomsView(APIView):
         return Response({'available_rooms': available_rooms}, status=status.HTTP_200_OK)
 
     def get_available_rooms(self, start_date, end_date, room_standard):
-        conflicting_reservations = Reservation.objects.filter(start_date__lte=end_date, end_date__gte=start_date)
+        """
+        Serialize the rooms of a standard that are free for the given date range.
+
+        Results are cached per room standard; reservation and room writes bump
+        the version of the affected standards, so stale results are never served.
+        """
+        def serialize_available_rooms():
+            available_rooms = availability.get_available_rooms(start_date, end_date, room_standard)
+            room_serializer = RoomSerializer(available_rooms, many=True)
+            return room_serializer.data
+
+        return availability.availability_cache.get_or_set(room_standard, f'{start_date}:{end_date}', serialize_available_rooms)
+
+class InventoryView(APIView):
+    """
+    A view to retrieve the number of free rooms of every room standard for a given date range.
+    """
+    serializer_class = DateRangeSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="start_date", type=OpenApiTypes.DATE, description='Start date of the stay.', required=True),
+            OpenApiParameter(name="end_date", type=OpenApiTypes.DATE, description='End date of the stay.', required=True),
+        ],
+    )
+    def get(self, request):
+        """
+        Get the available room counts per room standard.
+
+        Example:
+        http://localhost:8000/reservations/inventory?start_date=2024-04-01&end_date=2024-04-05
+        """
+        date_range_serializer = self.serializer_class(data=request.query_params)
+        if not date_range_serializer.is_valid():
+            return Response(date_range_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        inventory = availability.get_inventory(
+            date_range_serializer.validated_data['start_date'],
+            date_range_serializer.validated_data['end_date'],
+        )
+        serializer = RoomStandardInventorySerializer(inventory, many=True)
+        return Response({'room_standards': serializer.data}, status=status.HTTP_200_OK)
+
+class OccupancyMatrixView(APIView):
+    """
+    A view to retrieve the occupancy of every room for each night of a date window.
+    """
+    serializer_class = OccupancyMatrixSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="start_date", type=OpenApiTypes.DATE, description='First night of the window.', required=True),
+            OpenApiParameter(name="end_date", type=OpenApiTypes.DATE, description='Day after the last night of the window.', required=True),
+            OpenApiParameter(name="room_standard", type=OpenApiTypes.UUID, description='Limit the matrix to rooms of this standard.', required=False),
+            OpenApiParameter(name="encoding", type=OpenApiTypes.STR, enum=['string', 'bits', 'rle'], description='Encoding of the occupancy rows.', required=False),
+        ],
+    )
+    def get(self, request):
+        """
+        Get the rooms x nights occupancy matrix.
+
+        Every room row is encoded as:
+        - string: one "0"/"1" character per night (default),
+        - bits: base64 of the bit-packed nights, least significant bit first,
+        - rle: list of [state, number of nights] runs.
+
+        Example:
+        http://localhost:8000/reservations/occupancy-matrix?start_date=2024-04-01&end_date=2024-05-01&encoding=rle
+        """
+        matrix_serializer = self.serializer_class(data=request.query_params)
+        if not matrix_serializer.is_valid():
+            return Response(matrix_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        all_rooms = Room.objects.all().filter(room_standard = room_standard, is_available=True)
-        occupied_rooms = [reservation.room for reservation in conflicting_reservations]
-        available_rooms = [room for room in all_rooms if room not in occupied_rooms]
-        room_serializer = RoomSerializer(available_rooms, many=True)
-        serialized_rooms = room_serializer.data
+        start_date = matrix_serializer.validated_data['start_date']
+        end_date = matrix_serializer.validated_data['end_date']
+        encoding = matrix_serializer.validated_data['encoding']
 
-        return serialized_rooms
+        rooms, nights = occupancy_matrix(start_date, end_date, matrix_serializer.validated_data.get('room_standard'))
+        for room in rooms:
+            room['occupancy'] = encode_occupancy(room['occupancy'], nights, encoding)
+        return Response({
+            'start_date': start_date,
+            'end_date': end_date,
+            'nights': nights,
+            'encoding': encoding,
+            'rooms': rooms,
+        }, status=status.HTTP_200_OK)
+
+class StayWindowsView(APIView):
+    """
+    A view to find the earliest windows in which a room of a standard is free for a stay of a given length.
+    """
+    serializer_class = StayWindowSearchSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="room_standard", type=OpenApiTypes.UUID, description='UUID of the room standard.', required=True),
+            OpenApiParameter(name="nights", type=OpenApiTypes.INT, description='Length of the stay in nights.', required=True),
+            OpenApiParameter(name="start_date", type=OpenApiTypes.DATE, description='First night of the searched horizon.', required=True),
+            OpenApiParameter(name="end_date", type=OpenApiTypes.DATE, description='Day after the last night of the searched horizon.', required=True),
+            OpenApiParameter(name="limit", type=OpenApiTypes.INT, description='Number of start dates to return (default 1).', required=False),
+        ],
+    )
+    def get(self, request):
+        """
+        Get the earliest start dates within the horizon on which a stay of the given length fits,
+        together with the rooms that are free for each of them.
+
+        Example:
+        http://localhost:8000/reservations/stay-windows?room_standard=<uuid>&nights=3&start_date=2024-04-01&end_date=2024-06-01&limit=5
+        """
+        search_serializer = self.serializer_class(data=request.query_params)
+        if not search_serializer.is_valid():
+            return Response(search_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = search_serializer.validated_data
+        windows = find_stay_windows(data['room_standard'], data['nights'], data['start_date'], data['end_date'], data['limit'])
+        return Response({'nights': data['nights'], 'windows': windows}, status=status.HTTP_200_OK)
+
+class QuotesView(APIView):
+    """
+    A view to price many stays in one request.
+    """
+    serializer_class = QuoteRequestSerializer
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    @extend_schema(responses=QuoteSerializer(many=True))
+    def post(self, request):
+        """
+        Quote the total price of every requested stay.
+
+        Required parameters in the request:
+        - quotes: List of stays, each with:
+          - room_standard: The UUID of the room standard (UUID).
+          - start_date: The check-in date (date).
+          - end_date: The check-out date (date).
+
+        The totals are the nightly price of the standard times the number of
+        nights, computed with exact decimal arithmetic. Stays of an unknown
+        standard are returned with an error and no price.
+        """
+        quote_serializer = self.serializer_class(data=request.data)
+        if not quote_serializer.is_valid():
+            return Response(quote_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        catalog = get_price_catalog()
+        quotes = []
+        for item in quote_serializer.validated_data['quotes']:
+            nights = (item['end_date'] - item['start_date']).days
+            price_per_night = catalog.get(item['room_standard'])
+            quote = {**item, 'nights': nights, 'price_per_night': price_per_night, 'total': None}
+            if price_per_night is None:
+                quote['error'] = 'Room standard not found.'
+            else:
+                quote['total'] = quote_stay(price_per_night, nights)
+            quotes.append(quote)
+        return Response({'quotes': QuoteSerializer(quotes, many=True).data}, status=status.HTTP_200_OK)
+
+class AvailabilityIndexView(APIView):
+    """
+    A view to check or rebuild the in-process interval index used by the "index" availability backend.
+    """
+    permission_classes = [HasGroupPermission]
+    required_groups = ['IT']
+
+    def get(self, request):
+        """
+        Compare the interval index of this process with the database.
+
+        Returns the UUIDs of reservations missing from the index, indexed but
+        deleted from the database, and indexed with stale room or dates.
+        """
+        interval_index.ensure_built()
+        report = interval_index.verify()
+        report['consistent'] = not any(report.values())
+        return Response(report, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        """
+        Rebuild the interval index of this process from the database.
+        """
+        indexed = interval_index.rebuild()
+        return Response({'indexed_reservations': indexed}, status=status.HTTP_200_OK)
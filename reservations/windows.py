@@ -0,0 +1,111 @@
+import heapq
+from datetime import timedelta
+from .availability import conflicting_reservations
+from .holds import hold_store
+from .models import to_datetime
+from django.utils import timezone
+from rooms.models import Room
+
+
+def free_start_days(occupied_spans, start_date, end_date, nights):
+    """
+    Find the days a stay of the given length can start on, given the occupied day spans of a room.
+
+    parameters:
+     - occupied_spans: (first_day, last_day) spans of the room's reservations, sorted by first day.
+     - start_date: The first night of the horizon (date).
+     - end_date: The day after the last night of the horizon (date).
+     - nights: The length of the stay (int).
+
+    return: List of (first_start_day, last_start_day) tuples, in order.
+    """
+    ranges = []
+    free_from = start_date
+    for first_day, last_day in occupied_spans + [(end_date, end_date)]:
+        last_start = min(first_day, end_date) - timedelta(days=nights)
+        if free_from <= last_start:
+            ranges.append((free_from, last_start))
+        free_from = max(free_from, last_day + timedelta(days=1))
+    return ranges
+
+
+def find_stay_windows(room_standard, nights, start_date, end_date, limit=1):
+    """
+    Find the earliest start days within a horizon on which a room of a standard is free for a stay.
+
+    The reservations of the standard's rooms within the horizon are fetched
+    with a single query ordered by room and start, so every room is scanned
+    once to turn the gaps between its stays and its active holds into ranges
+    of feasible start days.
+    The ranges of all rooms are then merged with a heap to produce the earliest
+    start days in order, without probing the horizon day by day. A room is free
+    on a window exactly when the available rooms search for that window would
+    return it.
+
+    parameters:
+     - room_standard: The UUID of the room standard (UUID or string).
+     - nights: The length of the stay (int).
+     - start_date: The first night of the horizon (date).
+     - end_date: The day after the last night of the horizon (date).
+     - limit: The number of start days to return (int).
+
+    return: List of dictionaries with start_date, end_date and the free rooms
+    (uuid and room_number, ordered by room number) of each window.
+    """
+    rooms = {
+        uuid: {'uuid': uuid, 'room_number': room_number}
+        for uuid, room_number in
+        Room.objects.filter(room_standard=room_standard, is_available=True).order_by('room_number').values_list('uuid', 'room_number')
+    }
+    occupied = {room_id: [] for room_id in rooms}
+    reservations = (
+        conflicting_reservations(start_date, end_date)
+        .filter(room__in=rooms.keys())
+        .order_by('room', 'start_date')
+        .values_list('room_id', 'start_date', 'end_date')
+    )
+    # The database returns aware datetimes, so the day spans are computed
+    # inline rather than through occupied_day_span and its conversions.
+    tz = timezone.get_default_timezone()
+    one_microsecond = timedelta(microseconds=1)
+    for room_id, start, end in reservations:
+        occupied[room_id].append((start.astimezone(tz).date(), (end - one_microsecond).astimezone(tz).date()))
+    horizon_start, horizon_end = to_datetime(start_date), to_datetime(end_date)
+    held = [
+        hold for hold in hold_store.holds(room_standard).values()
+        if hold['room'] in occupied and hold['start_date'] < horizon_end and hold['end_date'] > horizon_start
+    ]
+    for hold in held:
+        occupied[hold['room']].append((hold['start_date'].astimezone(tz).date(), (hold['end_date'] - one_microsecond).astimezone(tz).date()))
+    if held:
+        for spans in occupied.values():
+            spans.sort()
+
+    ranges = sorted(
+        (first_start, last_start, rooms[room_id]['room_number'], room_id)
+        for room_id, spans in occupied.items()
+        for first_start, last_start in free_start_days(spans, start_date, end_date, nights)
+    )
+
+    windows = []
+    active = []
+    position = 0
+    day = start_date
+    while len(windows) < limit:
+        while active and active[0][0] < day:
+            heapq.heappop(active)
+        if not active:
+            if position == len(ranges):
+                break
+            day = max(day, ranges[position][0])
+        while position < len(ranges) and ranges[position][0] <= day:
+            first_start, last_start, room_number, room_id = ranges[position]
+            heapq.heappush(active, (last_start, room_number, room_id))
+            position += 1
+        windows.append({
+            'start_date': day,
+            'end_date': day + timedelta(days=nights),
+            'rooms': [rooms[room_id] for _, _, room_id in sorted(active, key=lambda entry: entry[1])],
+        })
+        day += timedelta(days=1)
+    return windows
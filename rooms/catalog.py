@@ -0,0 +1,34 @@
+from decimal import Decimal
+from django.conf import settings
+from .models import RoomStandard
+from utils.cache import VersionedCache
+
+catalog_cache = VersionedCache('room_standards', maxsize=1, timeout=settings.ROOM_CATALOG_CACHE_TIMEOUT)
+
+CENT = Decimal('0.01')
+
+
+def get_price_catalog():
+    """
+    Return the nightly price of every room standard.
+
+    The whole catalog is loaded with a single query and cached between
+    requests; room standard writes invalidate it.
+
+    return: Dictionary mapping room standard UUIDs to prices (Decimal).
+    """
+    return catalog_cache.get_or_set('catalog', 'prices', lambda: dict(RoomStandard.objects.values_list('uuid', 'price_per_night')))
+
+
+def invalidate_catalog():
+    """
+    Invalidate the cached price catalog.
+    """
+    catalog_cache.invalidate('catalog')
+
+
+def quote_stay(price_per_night, nights):
+    """
+    Compute the total price of a stay with exact decimal arithmetic, rounded to cents.
+    """
+    return (price_per_night * nights).quantize(CENT)
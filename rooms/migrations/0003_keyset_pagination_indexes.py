@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-17 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0002_alter_amenity_options_alter_room_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["room_number", "uuid"], name="rooms_number_uuid"
+            ),
+        ),
+    ]
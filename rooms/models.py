@@ -1,7 +1,10 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from utils.models import VersionedModel
 
-class Amenity(models.Model):
+class Amenity(VersionedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
 
@@ -11,8 +14,16 @@ class Amenity(models.Model):
 
     def __str__(self):
         return self.name
+
+    def delete(self, *args, **kwargs):
+        """
+        Delete the amenity and bump the version of the room standards listing it.
+        """
+        with transaction.atomic():
+            self.room_standards.update(version=F('version') + 1, updated_at=Now())
+            return super().delete(*args, **kwargs)
     
-class RoomStandard(models.Model):
+class RoomStandard(VersionedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -26,7 +37,7 @@ class RoomStandard(models.Model):
     def __str__(self):
         return self.name
     
-class Room(models.Model):
+class Room(VersionedModel):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     room_number = models.CharField(max_length=10)
     room_standard = models.ForeignKey(RoomStandard, on_delete=models.CASCADE)
@@ -36,6 +47,9 @@ class Room(models.Model):
     class Meta:
         verbose_name = "Room"
         verbose_name_plural = "Rooms"
+        indexes = [
+            models.Index(fields=['room_number', 'uuid'], name='rooms_number_uuid'),
+        ]
 
     def __str__(self):
         return f"Room {self.room_number} ({self.room_standard.name})"
@@ -1,17 +1,21 @@
 from rest_framework import serializers
 from .models import RoomStandard, Amenity, Room
+from utils.models import VERSION_FIELDS
+from utils.serializers import ExpandableSerializerMixin, SparseFieldsSerializerMixin
 
-class AmenitySerializer(serializers.ModelSerializer):
+class AmenitySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Amenity
-        fields = '__all__'
+        exclude = VERSION_FIELDS
 
-class RoomStandardSerializer(serializers.ModelSerializer):
+class RoomStandardSerializer(SparseFieldsSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = RoomStandard
-        fields = '__all__'
+        exclude = VERSION_FIELDS
+        expandable_fields = {'amenities': (AmenitySerializer, {'many': True})}
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(SparseFieldsSerializerMixin, ExpandableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Room
-        fields = '__all__'
+        exclude = VERSION_FIELDS
+        expandable_fields = {'room_standard': (RoomStandardSerializer, {})}
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .catalog import invalidate_catalog
+from .models import RoomStandard
+
+
+@receiver(post_save, sender=RoomStandard)
+@receiver(post_delete, sender=RoomStandard)
+def invalidate_price_catalog(sender, instance, **kwargs):
+    """
+    Invalidate the cached price catalog when a room standard is created, changed or deleted.
+    """
+    invalidate_catalog()
@@ -4,6 +4,8 @@ from rooms.models import Amenity, RoomStandard, Room
 from employees.models import Employee
 from django.contrib.auth.models import Group
 from django.urls import reverse
+from unittest import skipUnless
+from utils.renderers import msgpack
 
 
 class AmenityListViewTests(APITestCase):
@@ -107,6 +109,19 @@ class RoomStandardListViewTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_list_room_standards_sparse_fields(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(self.url, {'fields': 'uuid,name,price_per_night'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {'uuid': str(self.room_standard.uuid), 'name': 'Test Room Standard', 'price_per_night': '100.00'})
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_list_room_standards_msgpack(self):
+        headers = {'Authorization': f'Token {self.token}', 'Accept': 'application/msgpack'}
+        response = self.client.get(self.url, {'fields': 'uuid,price_per_night'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(msgpack.unpackb(response.content)['results'], [{'uuid': str(self.room_standard.uuid), 'price_per_night': '100.00'}])
+
     def test_create_room_standard_authenticated(self):
         data_amenity = {'name': 'New Amenity'}
         headers = {'Authorization': f'Token {self.token}'}
@@ -140,6 +155,15 @@ class RoomStandardDetailViewTests(APITestCase):
 
         self.url = reverse('room-standard-detail', args=[self.room_standard.uuid])
 
+    def test_deleting_amenity_changes_etag(self):
+        self.room_standard.amenities.add(self.amenity)
+        headers = {'Authorization': f'Token {self.token}'}
+        etag = self.client.get(self.url, headers=headers)['ETag']
+        self.client.delete(reverse('amenity-detail', args=[self.amenity.uuid]), headers=headers)
+        response = self.client.get(self.url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['amenities'], [])
+
     def test_retrieve_room_standard_authenticated(self):
         headers = {'Authorization': f'Token {self.token}'}
         response = self.client.get(self.url, headers=headers)
@@ -210,6 +234,20 @@ class RoomListViewTests(APITestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_list_rooms_expanded(self):
+        self.room_standard.amenities.add(Amenity.objects.create(name='Balcony'))
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(self.url, {'expand': 'room_standard.amenities'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        room_standard = response.data['results'][0]['room_standard']
+        self.assertEqual(room_standard['name'], 'Test Room Standard')
+        self.assertEqual([amenity['name'] for amenity in room_standard['amenities']], ['Balcony'])
+
+    def test_list_rooms_invalid_expand(self):
+        headers = {'Authorization': f'Token {self.token}'}
+        response = self.client.get(self.url, {'expand': 'location'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 class RoomDetailViewTests(APITestCase):
     def setUp(self):
         self.group = Group.objects.create(name='IT')
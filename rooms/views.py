@@ -1,10 +1,14 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
 from .models import Amenity, RoomStandard, Room
 from .serializers import AmenitySerializer, RoomStandardSerializer, RoomSerializer
 from utils.permissions import HasGroupPermission
-from utils.paginators import SmallResultsSetPagination
+from utils.idempotency import idempotent
+from utils.conditional import collection_etag, lock_if_match, not_modified, object_etag, precondition_failed
+from utils.paginators import SmallResultsSetPagination, get_paginator
+from utils.serializers import expand_queryset, parse_expand, parse_fields, prune_queryset, ValuesSerializer
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
@@ -21,6 +25,10 @@ class AmenityListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
         ],
     )
     def get(self, request):
@@ -30,13 +38,28 @@ class AmenityListView(APIView):
         Example:
         http://localhost:8000/amenities?page=2&page_size=20
         """
-        amenities = Amenity.objects.all().order_by('name')
-
-        paginator = self.pagination_class()
-        paginated_amenities = paginator.paginate_queryset(amenities, request)
-
-        serializer = self.serializer_class(paginated_amenities, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        fields = parse_fields(request, self.serializer_class)
+        amenities = prune_queryset(Amenity.objects.all().order_by('name'), fields)
+        paginator = get_paginator(request, self.pagination_class)
+        etag = collection_etag(request, amenities, paginator, self)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields)
+        if values_serializer:
+            amenities = values_serializer.values(amenities)
+
+        paginated_amenities = paginator.paginate_queryset(amenities, request, view=self)
+
+        if values_serializer:
+            data = values_serializer.serialize(paginated_amenities)
+        else:
+            data = self.serializer_class(paginated_amenities, many=True, fields=fields).data
+        response = paginator.get_paginated_response(data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
 
     def post(self, request):
         """
@@ -59,20 +82,26 @@ class AmenityDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
     
-    def get_object(self, uuid):
+    def get_object(self, uuid, fields=None):
         """
         Retrieve an amenity object by its UUID.
 
         parameters:
          - uuid: The UUID of the amenity to retrieve (string).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: Amenity object if found, None otherwise.
         """
         try:
-            return Amenity.objects.get(uuid=uuid)
+            return prune_queryset(Amenity.objects.all(), fields).get(uuid=uuid)
         except Amenity.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of an amenity by UUID.
@@ -80,26 +109,36 @@ class AmenityDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the amenity to retrieve (string).
         """
-        amenity = self.get_object(uuid)
+        fields = parse_fields(request, self.serializer_class)
+        amenity = self.get_object(uuid, fields=fields)
         if amenity:
-            serializer = self.serializer_class(amenity)
-            return Response(serializer.data)
+            etag = object_etag(request, amenity)
+            not_modified_response = not_modified(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+            serializer = self.serializer_class(amenity, fields=fields)
+            return Response(serializer.data, headers={'ETag': etag})
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def patch(self, request, uuid):
         """
         Update an amenity instance partially.
+        With an If-Match header holding its ETag, the update fails with 412 if it changed since it was fetched.
 
         Possible parameters in the request:
         - name: The name of the amenity (string).
         """
         amenity = self.get_object(uuid)
         if amenity:
-            serializer = self.serializer_class(amenity, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                amenity = lock_if_match(request, amenity)
+                if amenity is None:
+                    return precondition_failed()
+                serializer = self.serializer_class(amenity, data=request.data, partial=True)
+                if serializer.is_valid():
+                    serializer.save()
+                    return Response(serializer.data, headers={'ETag': object_etag(request, amenity)})
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def delete(self, request, uuid):
@@ -128,6 +167,11 @@ class RoomStandardListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "amenities".', required=False),
         ],
     )
     def get(self, request):
@@ -137,13 +181,29 @@ class RoomStandardListView(APIView):
         Example:
         http://localhost:8000/room-standards?page=2&page_size=20
         """
-        room_standards = RoomStandard.objects.all().order_by('name')
-
-        paginator = self.pagination_class()
-        paginated_room_standards = paginator.paginate_queryset(room_standards, request)
-
-        serializer = self.serializer_class(paginated_room_standards, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        room_standards = prune_queryset(expand_queryset(RoomStandard.objects.prefetch_related('amenities'), expand).order_by('name'), fields, expand)
+        paginator = get_paginator(request, self.pagination_class)
+        etag = collection_etag(request, room_standards, paginator, self, expand)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields, expand)
+        if values_serializer:
+            room_standards = values_serializer.values(room_standards)
+
+        paginated_room_standards = paginator.paginate_queryset(room_standards, request, view=self)
+
+        if values_serializer:
+            data = values_serializer.serialize(paginated_room_standards)
+        else:
+            data = self.serializer_class(paginated_room_standards, many=True, expand=expand, fields=fields).data
+        response = paginator.get_paginated_response(data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
 
     def post(self, request):
         """
@@ -169,20 +229,28 @@ class RoomStandardDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
     
-    def get_object(self, uuid):
+    def get_object(self, uuid, expand=(), fields=None):
         """
         Retrieve a room standard object by its UUID.
 
         parameters:
          - uuid: The UUID of the room standard to retrieve (string).
+         - expand: Dotted paths of the related objects to load with it (list of strings).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: RoomStandard object if found, None otherwise.
         """
         try:
-            return RoomStandard.objects.get(uuid=uuid)
+            return prune_queryset(expand_queryset(RoomStandard.objects.all(), expand), fields, expand).get(uuid=uuid)
         except RoomStandard.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "amenities".', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of a room standard by UUID.
@@ -190,15 +258,22 @@ class RoomStandardDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the room standard to retrieve (string).
         """
-        room_standard = self.get_object(uuid)
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        room_standard = self.get_object(uuid, expand, fields=fields)
         if room_standard:
-            serializer = self.serializer_class(room_standard)
-            return Response(serializer.data)
+            etag = object_etag(request, room_standard, expand)
+            not_modified_response = not_modified(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+            serializer = self.serializer_class(room_standard, expand=expand, fields=fields)
+            return Response(serializer.data, headers={'ETag': etag})
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def patch(self, request, uuid):
         """
         Update a room standard instance partially.
+        With an If-Match header holding its ETag, the update fails with 412 if it changed since it was fetched.
 
         Possible parameters in the request:
         - name: The name of the room standard (string).
@@ -208,11 +283,15 @@ class RoomStandardDetailView(APIView):
         """
         room_standard = self.get_object(uuid)
         if room_standard:
-            serializer = self.serializer_class(room_standard, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                room_standard = lock_if_match(request, room_standard)
+                if room_standard is None:
+                    return precondition_failed()
+                serializer = self.serializer_class(room_standard, data=request.data, partial=True)
+                if serializer.is_valid():
+                    serializer.save()
+                    return Response(serializer.data, headers={'ETag': object_etag(request, room_standard)})
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def delete(self, request, uuid):
@@ -241,6 +320,11 @@ class RoomListView(APIView):
         parameters=[
             OpenApiParameter(name="page_size", type=OpenApiTypes.INT, description='Page Size for pagination.', required=False),
             OpenApiParameter(name="page", type=OpenApiTypes.INT, description='Page number for pagination.', required=False),
+            OpenApiParameter(name="pagination", type=OpenApiTypes.STR, enum=['page', 'cursor'], description='Pagination style; "cursor" pages with keyset cursors instead of page numbers.', required=False),
+            OpenApiParameter(name="cursor", type=OpenApiTypes.STR, description='Cursor of the page to fetch, taken from the "next" link of the previous page.', required=False),
+            OpenApiParameter(name="count", type=OpenApiTypes.STR, enum=['exact', 'none', 'capped', 'estimate'], description='How the total count of page-number pagination is computed.', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "room_standard,room_standard.amenities".', required=False),
         ],
     )
     def get(self, request):
@@ -250,14 +334,31 @@ class RoomListView(APIView):
         Example:
         http://localhost:8000/rooms?page=2&page_size=20
         """
-        rooms = Room.objects.all().order_by('room_number')
-
-        paginator = self.pagination_class()
-        paginated_rooms = paginator.paginate_queryset(rooms, request)
-
-        serializer = self.serializer_class(paginated_rooms, many=True)
-        return paginator.get_paginated_response(serializer.data)
-
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        rooms = prune_queryset(expand_queryset(Room.objects.all(), expand).order_by('room_number'), fields, expand)
+        paginator = get_paginator(request, self.pagination_class)
+        etag = collection_etag(request, rooms, paginator, self, expand)
+        not_modified_response = not_modified(request, etag)
+        if not_modified_response is not None:
+            return not_modified_response
+
+        values_serializer = ValuesSerializer.for_serializer(self.serializer_class, fields, expand)
+        if values_serializer:
+            rooms = values_serializer.values(rooms)
+
+        paginated_rooms = paginator.paginate_queryset(rooms, request, view=self)
+
+        if values_serializer:
+            data = values_serializer.serialize(paginated_rooms)
+        else:
+            data = self.serializer_class(paginated_rooms, many=True, expand=expand, fields=fields).data
+        response = paginator.get_paginated_response(data)
+        if etag is not None:
+            response['ETag'] = etag
+        return response
+
+    @idempotent
     def post(self, request):
         """
         Create a new room.
@@ -282,20 +383,28 @@ class RoomDetailView(APIView):
     permission_classes = [HasGroupPermission]
     required_groups = ['IT']
     
-    def get_object(self, uuid):
+    def get_object(self, uuid, expand=(), fields=None):
         """
         Retrieve a room object by its UUID.
 
         parameters:
          - uuid: The UUID of the room to retrieve (string).
+         - expand: Dotted paths of the related objects to load with it (list of strings).
+         - fields: Names of the requested fields, whose columns are the only ones loaded (list of strings).
 
         return: Room object if found, None otherwise.
         """
         try:
-            return Room.objects.get(uuid=uuid)
+            return prune_queryset(expand_queryset(Room.objects.all(), expand), fields, expand).get(uuid=uuid)
         except Room.DoesNotExist:
             return None
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="expand", type=OpenApiTypes.STR, description='Comma-separated related objects to embed instead of their UUIDs, e.g. "room_standard,room_standard.amenities".', required=False),
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, description='Comma-separated fields to return; only their columns are loaded.', required=False),
+        ],
+    )
     def get(self, request, uuid):
         """
         Retrieve details of a room by UUID.
@@ -303,15 +412,22 @@ class RoomDetailView(APIView):
         Required parameter in the URL:
         - uuid: The UUID of the room to retrieve (string).
         """
-        room = self.get_object(uuid)
+        expand = parse_expand(request, self.serializer_class)
+        fields = parse_fields(request, self.serializer_class)
+        room = self.get_object(uuid, expand, fields=fields)
         if room:
-            serializer = self.serializer_class(room)
-            return Response(serializer.data)
+            etag = object_etag(request, room, expand)
+            not_modified_response = not_modified(request, etag)
+            if not_modified_response is not None:
+                return not_modified_response
+            serializer = self.serializer_class(room, expand=expand, fields=fields)
+            return Response(serializer.data, headers={'ETag': etag})
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def patch(self, request, uuid):
         """
         Update a room instance partially.
+        With an If-Match header holding its ETag, the update fails with 412 if it changed since it was fetched.
 
         Possible parameters in the request:
         - room_number: The room number (string).
@@ -321,11 +437,15 @@ class RoomDetailView(APIView):
         """
         room = self.get_object(uuid)
         if room:
-            serializer = self.serializer_class(room, data=request.data, partial=True)
-            if serializer.is_valid():
-                serializer.save()
-                return Response(serializer.data)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            with transaction.atomic():
+                room = lock_if_match(request, room)
+                if room is None:
+                    return precondition_failed()
+                serializer = self.serializer_class(room, data=request.data, partial=True)
+                if serializer.is_valid():
+                    serializer.save()
+                    return Response(serializer.data, headers={'ETag': object_etag(request, room)})
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         return Response(status=status.HTTP_404_NOT_FOUND)
 
     def delete(self, request, uuid):
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import cache
+from django.db import transaction
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache evicting the least recently used entry.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class VersionedCache:
+    """
+    Two-tier cache whose entries are invalidated by bumping a per-group version.
+
+    Every key belongs to a group (e.g. a room standard) and is stored together
+    with the current version of that group, so bumping the version makes all
+    older entries unreachable instead of deleting them. Versions live in the
+    Django cache so that every process sees the bumps; the entries live in a
+    per-process LRU tier in front of the Django cache.
+    """
+    MISSING = object()
+
+    def __init__(self, namespace, maxsize=1024, timeout=300):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.local = LRUCache(maxsize)
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _version_key(self, group):
+        return f'{self.namespace}:version:{group}'
+
+    def version(self, group):
+        """
+        Return the current version of a group.
+
+        A missing version is initialized from the clock rather than from 1,
+        so a version evicted from the Django cache never comes back to a value
+        that older entries were stored under.
+        """
+        key = self._version_key(group)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    def bump(self, *groups):
+        """
+        Invalidate every entry of the given groups.
+        """
+        for group in groups:
+            key = self._version_key(group)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), timeout=None)
+
+    def invalidate(self, *groups):
+        """
+        Invalidate the given groups now and once the current transaction commits.
+
+        Bumping right away stops entries cached before the write from being
+        served; bumping again on commit drops entries computed from data read
+        while the write was still uncommitted.
+        """
+        groups = [group for group in groups if group]
+        self.bump(*groups)
+        transaction.on_commit(lambda: self.bump(*groups))
+
+    def get_or_set(self, group, key, compute):
+        """
+        Return the cached value for (group, key), computing and storing it on a miss.
+        """
+        versioned_key = f'{self.namespace}:{group}:{self.version(group)}:{key}'
+        value = self.local.get(versioned_key, self.MISSING)
+        if value is not self.MISSING:
+            self._count('hits')
+            return value
+
+        value = cache.get(versioned_key, self.MISSING)
+        if value is not self.MISSING:
+            self._count('shared_hits')
+        else:
+            self._count('misses')
+            value = compute()
+            cache.set(versioned_key, value, timeout=self.timeout)
+        self.local.set(versioned_key, value)
+        return value
+
+    def _count(self, counter):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        """
+        Return the hit/miss counters of this process.
+        """
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+            'local_entries': len(self.local),
+            'local_evictions': self.local.evictions,
+        }
@@ -0,0 +1,105 @@
+import hashlib
+from django.db.models import Count, Max, Sum
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from utils.models import VersionedModel
+from utils.paginators import BaseResultsSetPagination
+
+PRECONDITION_FAILED = 'The object was modified since it was fetched; fetch it again and retry.'
+
+
+def _digest(request, stamps):
+    # ?fields=, ?expand=, the page and the negotiated format all change the representation.
+    variant = (request.META.get('QUERY_STRING', ''), getattr(request, 'accepted_media_type', None))
+    return hashlib.md5(repr((variant, stamps)).encode()).hexdigest()[:16]
+
+
+def object_etag(request, instance, expand=()):
+    """
+    Build the ETag of a detail representation from the version stamps of the object and of its expanded objects.
+
+    The tag starts with the version of the object, which If-Match compares
+    regardless of the query string and format the tag was fetched with.
+    """
+    stamps = []
+    for path in expand:
+        objects = [instance]
+        for name in path.split('.'):
+            related = [getattr(obj, name) for obj in objects]
+            objects = [item for value in related for item in (value.all() if hasattr(value, 'all') else [value])]
+            stamps.extend((path, obj.pk, obj.version, obj.updated_at) for obj in objects if isinstance(obj, VersionedModel))
+    return quote_etag(f'{instance.version}-{_digest(request, (instance.pk, instance.updated_at, stamps))}')
+
+
+def collection_etag(request, queryset, paginator, view, expand=()):
+    """
+    Build the ETag of a list representation from one aggregate query.
+
+    The number of rows tracks creations and deletions, and the sum of the
+    versions grows with every committed update. The latest update time is
+    included as well, but alone it can miss an update: updated_at is stamped
+    before the commit, so a row committed after a later-stamped one does not
+    move it. The same stamps of the expanded relations are included too.
+
+    The aggregate scans the whole queryset, so it only runs for requests that
+    carry If-None-Match (the first one can send any tag, e.g. ""), and only
+    for page-number pagination counting exactly, which scans the queryset
+    anyway. Cursor pages and the other count modes exist to avoid that scan.
+
+    return: The ETag, or None when the request does not get one.
+    """
+    if request.headers.get('If-None-Match') is None:
+        return None
+    if not isinstance(paginator, BaseResultsSetPagination) or paginator.get_count_mode(request, view) != 'exact':
+        return None
+    aggregates = {'count': Count('pk', distinct=bool(expand)), 'versions': Sum('version'), 'updated_at': Max('updated_at')}
+    for index, path in enumerate(expand):
+        lookup = path.replace('.', '__')
+        aggregates[f'expand_{index}_versions'] = Sum(f'{lookup}__version')
+        aggregates[f'expand_{index}_updated_at'] = Max(f'{lookup}__updated_at')
+    stamps = queryset.order_by().aggregate(**aggregates)
+    return quote_etag(_digest(request, sorted(stamps.items())))
+
+
+def etag_matches(etag, header):
+    """
+    Check whether an ETag is listed in an If-None-Match header (weak comparison).
+    """
+    tags = parse_etags(header)
+    return '*' in tags or etag in [tag.removeprefix('W/') for tag in tags]
+
+
+def not_modified(request, etag):
+    """
+    Answer a conditional GET with 304 Not Modified when the client's copy is current.
+
+    return: Response with the 304 status, or None when the representation must be sent.
+    """
+    header = request.headers.get('If-None-Match')
+    if etag is not None and header is not None and etag_matches(etag, header):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+def lock_if_match(request, instance):
+    """
+    Lock the row of an object and check the If-Match header of a request against its version.
+
+    Must run inside a transaction, which keeps the row locked until the
+    update is saved, so no other change can slip in between the check and
+    the update. Without an If-Match header the object is returned unchanged.
+
+    return: The locked object, reloaded from the database, or None when the precondition fails.
+    """
+    header = request.headers.get('If-Match')
+    if header is None:
+        return instance
+    instance = type(instance).objects.select_for_update().get(pk=instance.pk)
+    tags = parse_etags(header)
+    versions = [tag.strip('"').split('-')[0] for tag in tags if not tag.startswith('W/')]
+    return instance if '*' in tags or str(instance.version) in versions else None
+
+
+def precondition_failed():
+    return Response({'error': PRECONDITION_FAILED}, status=status.HTTP_412_PRECONDITION_FAILED)
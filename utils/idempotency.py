@@ -0,0 +1,78 @@
+import hashlib
+import json
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+IN_FLIGHT = 'in_flight'
+POLL_INTERVAL = 0.05
+
+
+def fingerprint(request):
+    """
+    Hash the parsed body of a request, so a key reused for a different request can be detected.
+    """
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def idempotent(method):
+    """
+    Make a view method replay its first response for retries carrying the same Idempotency-Key header.
+
+    The first request with a key claims it in the cache with an in-flight
+    marker (cache.add, so only one request can claim it), runs the view and
+    stores the response for IDEMPOTENCY_KEY_TTL seconds. Retries with the same
+    key get the stored response back without running the view again; retries
+    arriving while the first request is still running wait for its response
+    for up to IDEMPOTENCY_WAIT_TIMEOUT seconds. Keys are scoped to the user and
+    the path, and server errors are not stored, so they can be retried.
+    Requests without the header are not affected.
+
+    The in-flight marker expires after IDEMPOTENCY_LOCK_TIMEOUT seconds so a
+    crashed request does not hold its key forever. A view running longer than
+    that loses its claim, and a retry arriving afterwards runs the view again;
+    the timeout must stay above the slowest idempotent request.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return method(self, request, *args, **kwargs)
+
+        cache_key = f'idempotency:{request.user.pk}:{request.path}:{key}'
+        request_fingerprint = fingerprint(request)
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while not cache.add(cache_key, IN_FLIGHT, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            # The key may also have expired since add() failed, or add() may fail without raising
+            # on a cache backend error; both cases wait and retry like an in-flight request.
+            stored = cache.get(cache_key)
+            if stored is not None and stored != IN_FLIGHT:
+                return replay(stored, request_fingerprint)
+            if time.monotonic() >= deadline:
+                return Response({'error': 'A request with this Idempotency-Key is still in progress.'}, status=status.HTTP_409_CONFLICT)
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            response = method(self, request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        if response.status_code >= 500:
+            cache.delete(cache_key)
+        else:
+            stored = {'fingerprint': request_fingerprint, 'status': response.status_code, 'data': response.data}
+            cache.set(cache_key, stored, timeout=settings.IDEMPOTENCY_KEY_TTL)
+        return response
+    return wrapper
+
+
+def replay(stored, request_fingerprint):
+    if stored['fingerprint'] != request_fingerprint:
+        return Response({'error': 'The Idempotency-Key was already used for a different request.'}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    return Response(stored['data'], status=stored['status'], headers={REPLAYED_HEADER: 'true'})
@@ -0,0 +1,33 @@
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Now
+
+VERSION_FIELDS = ['version', 'updated_at']
+
+
+class VersionedModel(models.Model):
+    """
+    Abstract model stamping every row with the time and the number of its last change.
+
+    The version is incremented in the UPDATE statement itself, so concurrent
+    saves of the same row always get distinct versions. Both columns have a
+    database default for the rows written without the ORM (e.g. COPY imports).
+    """
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
+    version = models.PositiveIntegerField(default=1, db_default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], *VERSION_FIELDS}
+        version, self.version = self.version, F('version') + 1
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = version
+            raise
+        self.refresh_from_db(fields=['version'])
@@ -1,28 +1,214 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import contextlib
+import json
+import math
+from types import SimpleNamespace
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-class LargeResultsSetPagination(PageNumberPagination):
-    page_size = 1000
+COUNT_MODES = ['exact', 'none', 'capped', 'estimate']
+
+class UncountedPage(list):
+    """
+    Page of rows fetched without counting the whole queryset.
+    """
+    def __init__(self, rows, number, has_next):
+        super().__init__(rows)
+        self.number = number
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+class BaseResultsSetPagination(PageNumberPagination):
+    """
+    Page-number pagination whose total count can be exact, skipped, capped or estimated.
+
+    The count mode is taken from the ?count= query parameter, then from the
+    view's count_mode attribute, and defaults to "exact":
+    - exact: COUNT(*) of the whole queryset, as before.
+    - none: no count; the page fetches one extra row to know if there is a next page.
+    - capped: COUNT(*) stops at count_cap rows and reports e.g. "10000+".
+    - estimate: the row estimate of the Postgres planner for the queryset.
+    Whenever a page is not full, the exact count follows from its offset and
+    is reported instead.
+    """
     page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    count_mode = 'exact'
+    count_cap = 10000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request, view)
+        if self.count_mode == 'exact':
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            number = _positive_int(page_number, strict=True)
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message='That page number is not an integer'))
+
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message='That page contains no results'))
+        self.page = UncountedPage(rows[:page_size], number, has_next=len(rows) > page_size)
+        if self.page.has_next():
+            self.count = self.get_count(queryset)
+            if isinstance(self.count, int):
+                # A stale planner estimate may fall below the rows already seen.
+                self.count = max(self.count, offset + len(rows))
+        else:
+            self.count = offset + len(self.page)
+        self.total_pages = math.ceil(self.count / page_size) if isinstance(self.count, int) else None
+        return list(self.page)
+
+    def get_count_mode(self, request, view):
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode in COUNT_MODES:
+            return count_mode
+        return getattr(view, 'count_mode', self.count_mode)
+
+    def get_count(self, queryset):
+        """
+        Count the queryset according to the non-exact count mode.
+
+        return: The count (int), a capped count (string such as "10000+") or None.
+        """
+        if self.count_mode == 'capped':
+            count = queryset[:self.count_cap + 1].count()
+            return count if count <= self.count_cap else f'{self.count_cap}+'
+        if self.count_mode == 'estimate':
+            return json.loads(queryset.explain(format='json'))[0]['Plan']['Plan Rows']
+        return None
+
+    def get_paginated_response(self, data):
+        if self.count_mode == 'exact':
+            count, total_pages = self.page.paginator.count, self.page.paginator.num_pages
+        else:
+            count, total_pages = self.count, self.total_pages
+        response_data = {
+            'count': count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+            'total_pages': total_pages,
+        }
+        if self.count_mode != 'exact':
+            response_data['count_mode'] = self.count_mode
+        return Response(response_data)
+
+class LargeResultsSetPagination(BaseResultsSetPagination):
+    page_size = 1000
     max_page_size = 10000
-    def get_paginated_response(self, *args, **kwargs):
-        response = super(LargeResultsSetPagination, self).get_paginated_response(*args, **kwargs)
-        response.data['total_pages'] = self.page.paginator.num_pages
-        return response
 
-class StandardResultsSetPagination(PageNumberPagination):
+class StandardResultsSetPagination(BaseResultsSetPagination):
     page_size = 100
-    page_size_query_param = 'page_size'
     max_page_size = 1000
-    def get_paginated_response(self, *args, **kwargs):
-        response = super(StandardResultsSetPagination, self).get_paginated_response(*args, **kwargs)
-        response.data['total_pages'] = self.page.paginator.num_pages
-        return response
 
-class SmallResultsSetPagination(PageNumberPagination):
+class SmallResultsSetPagination(BaseResultsSetPagination):
+    page_size = 10
+    max_page_size = 100
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination seeking past the last row of the previous page.
+
+    The queryset's ordering field is combined with uuid as a tiebreaker, and
+    the cursor holds both values of the last row served. The next page is a
+    range condition on that pair, so with an index leading with the ordering
+    field every page costs the same as the first one, and no COUNT(*) is run.
+    """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
-    def get_paginated_response(self, *args, **kwargs):
-        response = super(SmallResultsSetPagination, self).get_paginated_response(*args, **kwargs)
-        response.data['total_pages'] = self.page.paginator.num_pages
-        return response
+    cursor_query_param = 'cursor'
+    tiebreaker = 'uuid'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = queryset.query.order_by[0]
+        self.descending = ordering.startswith('-')
+        self.field = queryset.model._meta.get_field(ordering.lstrip('-'))
+        direction = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{direction}{self.field.name}', f'{direction}{self.tiebreaker}')
+
+        cursor = self.decode_cursor(request, queryset.model)
+        if cursor:
+            value, tiebreaker = cursor
+            after = 'lt' if self.descending else 'gt'
+            # The leading inclusive bound is what lets the index scan start at the cursor.
+            queryset = queryset.filter(**{f'{self.field.name}__{after}e': value}).filter(
+                Q(**{f'{self.field.name}__{after}': value}) | Q(**{f'{self.tiebreaker}__{after}': tiebreaker})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            with contextlib.suppress(KeyError, ValueError):
+                return _positive_int(request.query_params[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+        return self.page_size
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, tiebreaker = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            return self.field.to_python(value), model._meta.get_field(self.tiebreaker).to_python(tiebreaker)
+        except (TypeError, ValueError, ValidationError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        if isinstance(row, dict):
+            # Rows of values() querysets hold the same columns as model instances.
+            row = SimpleNamespace(**row)
+        values = [self.field.value_to_string(row), str(getattr(row, self.tiebreaker))]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+
+def get_paginator(request, pagination_class):
+    """
+    Return the paginator a list request asked for: keyset pagination for
+    ?pagination=cursor, otherwise the view's page-number pagination class.
+
+    Keyset pages take their default and maximum size from the view's
+    pagination class, so both styles serve pages of the same size.
+    """
+    if request.query_params.get('pagination') == 'cursor':
+        paginator = KeysetPagination()
+        paginator.page_size = pagination_class.page_size or paginator.page_size
+        paginator.max_page_size = pagination_class.max_page_size or paginator.max_page_size
+        return paginator
+    return pagination_class()
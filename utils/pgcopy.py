@@ -0,0 +1,55 @@
+import io
+from django.db import connection
+
+
+def copy_value(value):
+    """
+    Format a value for the text format of PostgreSQL COPY.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    text = value.isoformat() if hasattr(value, 'isoformat') else str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def copy_rows(model, columns, rows, returning=None):
+    """
+    Load rows into a model table through COPY and a staging table.
+
+    The rows are streamed with COPY into a temporary table holding the given
+    columns of the model's table without its constraints, and moved into the
+    table with a single INSERT ... SELECT, which skips (ON CONFLICT DO NOTHING)
+    the rows violating a unique or exclusion constraint instead of aborting
+    the whole load. Errors raised by triggers (such as the overlap trigger of
+    a partitioned reservations table) still abort it, so callers check rows
+    beforehand. Model save() methods and signals are bypassed.
+
+    parameters:
+     - model: The model class whose table is loaded.
+     - columns: The database column names of the row values.
+     - rows: Iterable of value tuples in the order of columns.
+     - returning: Column to return for the inserted rows (optional).
+
+    return: Set of the returned column values of the inserted rows, or the number of inserted rows.
+    """
+    table = model._meta.db_table
+    staging = f'{table}_staging'
+    column_list = ', '.join(columns)
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {staging}')
+        cursor.execute(f'CREATE TEMPORARY TABLE {staging} AS SELECT {column_list} FROM {table} WITH NO DATA')
+        cursor.copy_expert(f'COPY {staging} ({column_list}) FROM STDIN', buffer)
+        insert = f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} ON CONFLICT DO NOTHING'
+        if returning is None:
+            cursor.execute(insert)
+            return cursor.rowcount
+        cursor.execute(f'{insert} RETURNING {returning}')
+        return {row[0] for row in cursor.fetchall()}
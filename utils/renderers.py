@@ -0,0 +1,68 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it.
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; MessagePack is only negotiated when it is installed.
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def orjson_default(obj):
+    # Called by orjson for the types it does not serialize itself (Decimal,
+    # lazy strings, querysets, ...) and for datetimes, which are passed
+    # through so UTC is written as 'Z' exactly like DRF does.
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with orjson when it is installed, with the same output as DRF's JSONRenderer.
+
+    orjson writes compact UTF-8 JSON, so it is used for the default (compact,
+    unicode, not indented) output; indented output for the browsable API,
+    non-default JSON settings and data orjson rejects (e.g. integers above
+    64 bits or non-string keys) are rendered by the stdlib json module.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=orjson_default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # DRF escapes the line and paragraph separators so the output is valid JavaScript.
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer encoding the response data as MessagePack.
+
+    The wire types are the same as in the JSON output. Serializers already
+    turn decimals into strings such as "100.00" (DRF's default
+    COERCE_DECIMAL_TO_STRING), and UUIDs and datetimes into strings. Values
+    still without a MessagePack type, such as raw UUIDs of related fields,
+    are converted by DRF's JSON encoder. Only a raw Decimal, outside a
+    serializer, becomes a float.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True, datetime=False)
@@ -0,0 +1,257 @@
+from collections import defaultdict
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from utils.models import VERSION_FIELDS, VersionedModel
+
+
+class ExpandableSerializerMixin:
+    """
+    Serializer mixin embedding related objects instead of their UUIDs on request.
+
+    Meta.expandable_fields maps a relation field to the serializer class of the
+    related objects and its keyword arguments (e.g. many=True). The expand
+    argument lists dotted paths of the fields to embed, such as
+    ["room", "room.room_standard"]; the paths below an expanded field are
+    passed on to its serializer.
+    """
+    def __init__(self, *args, expand=(), **kwargs):
+        self.expand = expand
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        nested = defaultdict(list)
+        for path in self.expand:
+            name, _, rest = path.partition('.')
+            nested[name].extend([rest] if rest else [])
+        for name, paths in nested.items():
+            serializer_class, options = self.Meta.expandable_fields[name]
+            if paths:
+                options = {**options, 'expand': paths}
+            fields[name] = serializer_class(read_only=True, **options)
+        return fields
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Serializer mixin limiting the output to the requested fields.
+
+    The fields argument lists the names of the fields to keep; None keeps all
+    of them.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        self.requested_fields = fields
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.requested_fields is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in self.requested_fields}
+
+
+def parse_fields(request, serializer_class):
+    """
+    Read and validate the comma-separated ?fields= names of a request.
+
+    return: List of field names of the serializer, or None when all fields are requested.
+    """
+    if 'fields' not in request.query_params:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in request.query_params['fields'].split(',') if name.strip()))
+    unknown = [name for name in names if name not in serializer_class().fields]
+    if unknown:
+        raise ValidationError({'fields': [f'Unknown fields: {", ".join(unknown)}.']})
+    return names
+
+
+def prune_queryset(queryset, fields, expand=()):
+    """
+    Load only the columns of the requested fields.
+
+    The primary key, the ordering columns (read by keyset pagination), the
+    version stamps (read for the ETag) and the foreign keys of the expanded
+    relations are always loaded, so pruning never costs an extra query per row.
+
+    return: The queryset with only() applied, or unchanged when all fields are requested.
+    """
+    if fields is None:
+        return queryset
+    names = {queryset.model._meta.pk.name}
+    names.update(name.lstrip('-') for name in queryset.query.order_by)
+    if issubclass(queryset.model, VersionedModel):
+        names.update(VERSION_FIELDS)
+    for name in [*fields, *(path.split('.')[0] for path in expand)]:
+        try:
+            field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete and not field.many_to_many:
+            names.add(name)
+    return queryset.only(*names)
+
+
+def parse_expand(request, serializer_class):
+    """
+    Read and validate the comma-separated ?expand= paths of a request.
+
+    return: List of dotted paths the serializer can expand.
+    """
+    paths = [path.strip() for path in request.query_params.get('expand', '').split(',') if path.strip()]
+    for path in paths:
+        current = serializer_class
+        for name in path.split('.'):
+            expandable = getattr(getattr(current, 'Meta', None), 'expandable_fields', {})
+            if name not in expandable:
+                raise ValidationError({'expand': [f'"{path}" cannot be expanded.']})
+            current = expandable[name][0]
+    return paths
+
+
+def expand_queryset(queryset, paths):
+    """
+    Load the related objects of the expanded paths together with the queryset.
+
+    Paths made of foreign keys are joined with select_related; paths crossing
+    a many-to-many or reverse relation are loaded with prefetch_related, as
+    are the many-to-many fields of the embedded objects, so serializing a page
+    costs a constant number of queries.
+
+    return: The queryset with select_related/prefetch_related applied.
+    """
+    for path in paths:
+        model, many, lookups = queryset.model, False, []
+        for name in path.split('.'):
+            field = model._meta.get_field(name)
+            many = many or field.many_to_many or field.one_to_many
+            lookups.append(name)
+            model = field.related_model
+        lookup = '__'.join(lookups)
+        queryset = queryset.prefetch_related(lookup) if many else queryset.select_related(lookup)
+        # The embedded serializer lists the many-to-many UUIDs of every object it serializes.
+        queryset = queryset.prefetch_related(*(f'{lookup}__{field.name}' for field in model._meta.many_to_many))
+    return queryset
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _converter_factory(field):
+    """
+    Pick the function building the converter of a serializer field, or None if the field is not a plain column.
+
+    Every converter returns what field.to_representation returns for the
+    raw column value; the datetime converter is built per page because it
+    depends on the active time zone.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return lambda: lambda value: value
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+        return lambda: str
+    if isinstance(field, serializers.CharField):
+        return lambda: str
+    if type(field) is serializers.BooleanField:
+        return lambda: bool
+    if type(field) is serializers.IntegerField:
+        return lambda: int
+    if isinstance(field, serializers.DecimalField):
+        return lambda: field.to_representation
+    if isinstance(field, serializers.DateTimeField):
+        return lambda: _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return lambda: _date_converter(field)
+    return None
+
+
+class ValuesSerializer:
+    """
+    Read-only list serialization of values() rows, with the same output as the ModelSerializer.
+
+    Model instances and the per-field ModelSerializer machinery dominate the
+    time of large list pages. When every requested field of a serializer maps
+    to a plain column, a plan of (field name, column, converter) is compiled
+    once per serializer and field list, the page is fetched with values() and
+    each row is converted by the precompiled functions.
+    """
+    _plans = {}
+
+    def __init__(self, plan):
+        self.plan = plan
+
+    @classmethod
+    def for_serializer(cls, serializer_class, fields=None, expand=()):
+        """
+        Return the values serializer matching a serializer and the requested fields.
+
+        return: ValuesSerializer, or None when a field needs the ModelSerializer
+        (nested, many-to-many or computed fields).
+        """
+        if expand:
+            return None
+        # The output follows the serializer's field order, so the plans are keyed by the set of names,
+        # which bounds the cache by the subsets of the serializer's fields.
+        key = (serializer_class, None if fields is None else frozenset(fields))
+        if key not in cls._plans:
+            cls._plans[key] = cls.compile(serializer_class, fields)
+        plan = cls._plans[key]
+        return None if plan is None else cls(plan)
+
+    @staticmethod
+    def compile(serializer_class, fields):
+        serializer = serializer_class(fields=fields)
+        model = serializer.Meta.model
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            factory = _converter_factory(field)
+            if factory is None or not model_field.concrete or model_field.many_to_many:
+                return None
+            plan.append((name, field.source, factory))
+        return plan
+
+    def values(self, queryset):
+        """
+        Turn a queryset into a values() queryset of the plan's columns.
+
+        The primary key and the ordering columns are always selected, since
+        keyset pagination reads them from the last row of the page.
+        """
+        columns = [column for _, column, _ in self.plan]
+        extra = [queryset.model._meta.pk.name, *(name.lstrip('-') for name in queryset.query.order_by)]
+        columns.extend(name for name in extra if name not in columns)
+        return queryset.prefetch_related(None).values(*columns)
+
+    def serialize(self, rows):
+        """
+        Convert values() rows to the serializer's output.
+
+        return: List of dictionaries.
+        """
+        converters = [(name, column, factory()) for name, column, factory in self.plan]
+        return [
+            {name: None if (value := row[column]) is None else convert(value) for name, column, convert in converters}
+            for row in rows
+        ]